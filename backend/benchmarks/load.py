@@ -0,0 +1,383 @@
+"""
+Latency/throughput benchmark for every API route, run in-process.
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.load [--scale 10 --scale 1000 ...] [--requests 200]
+                              [--concurrency 16] [--route /api/projects ...]
+                              [--cold] [--output results.json]
+
+Boots server:app against mongomock-motor (no MongoDB needed). For each
+scale it seeds that many projects, blog posts and contact messages, then
+drives each route with concurrent clients over ASGI. The JSON output has,
+per route: throughput, latency percentiles, status counts and traced
+memory per request (a separate serial pass under tracemalloc). Compare
+results across commits with the same arguments.
+
+mongomock has no real indexes, so lookups by id or slug scan the
+collection: at large scales those routes measure the stand-in as much as
+the app. Use the numbers for relative comparisons, not capacity planning.
+"""
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from itertools import count
+
+# The contact route is rate limited per IP and every benchmark request comes
+# from the same client; the spool must not touch the real one.
+os.environ.setdefault("CONTACT_RATE_LIMIT_IP", "1000000/1")
+os.environ.setdefault("CONTACT_RATE_LIMIT_EMAIL", "1000000/1")
+os.environ.setdefault("CONTACT_DUPLICATE_WINDOW_SECONDS", "0")
+os.environ.setdefault("CONTACT_SPOOL_PATH", os.path.join(tempfile.mkdtemp(), "contact_spool.jsonl"))
+
+import httpx
+from bson import ObjectId
+from fastapi.routing import APIRoute
+from mongomock_motor import AsyncMongoMockClient
+
+import database
+from services.rendering import render_post
+
+SCALES = (10, 1000, 100000)
+# Collections seeded at the requested scale; the rest get a handful of documents.
+SMALL_COLLECTION_SIZE = 10
+SEED_BATCH_SIZE = 5000
+
+POST_CONTENT = "\n\n".join(
+    f"## Section {i}\n\nWriting about python, mongo and *fast* APIs with `code` samples." for i in range(8)
+)
+
+# Admin path prefix -> collection
+ADMIN_RESOURCES = {
+    "/api/admin/projects": "projects",
+    "/api/admin/experience": "experiences",
+    "/api/admin/skills": "skills",
+    "/api/admin/posts": "blog_posts",
+    "/api/admin/education": "education",
+    "/api/admin/certifications": "certifications",
+    "/api/admin/testimonials": "testimonials",
+    "/api/admin/messages": "contact_messages",
+}
+
+CREATE_PAYLOADS = {
+    "projects": {
+        "title": "Benchmark Project", "description": "A project used for load testing.", "short_description": "Load test",
+        "image": "/img/project.png", "live_url": "https://example.com", "github_url": "https://github.com/example/project",
+        "technologies": ["Python", "FastAPI", "MongoDB"], "features": ["Fast", "Tested"], "category": "Web",
+        "status": "completed", "start_date": "2024-01-01", "end_date": "2024-03-01",
+    },
+    "experiences": {
+        "title": "Engineer", "company": "Acme", "location": "Remote", "type": "full-time", "start_date": "2023-01-01",
+        "description": "Built things.", "achievements": ["Shipped"], "skills": ["Python"],
+    },
+    "skills": {"category": "Programming Languages", "name": "Python", "level": 90, "years_experience": 3},
+    "blog_posts": {
+        "title": "Benchmark Post", "slug": "benchmark-post", "excerpt": "An excerpt.", "content": POST_CONTENT,
+        "image": "/img/post.png", "tags": ["python", "mongo"], "status": "published",
+    },
+    "education": {
+        "degree": "B.Tech", "field": "Computer Science", "institution": "University", "location": "City",
+        "start_date": "2021-08-01", "end_date": "2025-05-01", "description": "Coursework.", "achievements": ["Dean's list"],
+    },
+    "certifications": {
+        "title": "Cloud Practitioner", "issuer": "AWS", "date": "2024-02-01", "credential_id": "ABC-123",
+        "description": "Cloud fundamentals.", "skills": ["AWS"],
+    },
+    "testimonials": {"name": "Jane", "position": "Lead", "company": "Acme", "image": "/img/jane.png", "text": "Great work.", "rating": 5},
+    "contact_messages": {"name": "Sam", "email": "sam@example.com", "subject": "Hello", "message": "Hi there!", "status": "new"},
+}
+
+UPDATE_PAYLOADS = {
+    "projects": {"short_description": "Updated"},
+    "experiences": {"location": "Hybrid"},
+    "skills": {"level": 80},
+    "blog_posts": {"excerpt": "Updated excerpt."},
+    "education": {"gpa": "3.9"},
+    "certifications": {"credential_id": "XYZ-789"},
+    "testimonials": {"rating": 4},
+    "contact_messages": {"status": "read"},
+}
+
+_unique = count()
+
+
+# ---------- Seeding ----------
+def _document(collection, index, now):
+    doc = copy.deepcopy(CREATE_PAYLOADS[collection])
+    for key in ("start_date", "end_date", "date"):
+        if key in doc:
+            doc[key] = datetime.fromisoformat(doc[key])
+    if collection == "blog_posts":
+        doc.update(slug=f"post-{index}", title=f"Post {index}", published_at=now, featured=index < 5)
+    elif "title" in doc:
+        doc["title"] = f"{doc['title']} {index}"
+    doc.update(_id=ObjectId(), created_at=now, updated_at=now, version=1)
+    return doc
+
+
+async def seed(db, scale):
+    from services.data_seeder import seed_database
+
+    await seed_database(force=True)
+    now = datetime.utcnow()
+    rendered = render_post(POST_CONTENT)
+    sizes = {name: SMALL_COLLECTION_SIZE for name in ("education", "certifications", "testimonials")}
+    sizes.update(projects=scale, blog_posts=scale, contact_messages=scale)
+    for collection, size in sizes.items():
+        for start in range(0, size, SEED_BATCH_SIZE):
+            docs = [_document(collection, i, now) for i in range(start, min(size, start + SEED_BATCH_SIZE))]
+            if collection == "blog_posts":
+                for doc in docs:
+                    doc.update(rendered)
+            await db[collection].insert_many(docs)
+
+
+async def boot(scale):
+    """Point the app at a fresh in-memory database, seed it and run the startup steps."""
+    database.database.client = AsyncMongoMockClient()
+    database.database.database = database.database.client["benchmark"]
+    database.database.read_database = database.database.database
+
+    import server
+    from dependencies import init_collection_handles
+    from services.cache import query_cache
+    from services.contact_queue import contact_queue
+    from services.search import rebuild_search_index
+    from services.views import view_counter
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    init_collection_handles(server.app, database.database)
+    await seed(database.database.database, scale)
+    await rebuild_search_index(server.app.state.collections)
+    await contact_queue.start(server.app.state.collections["contact_messages"])
+    await view_counter.start(server.app.state.collections["view_counts"])
+    query_cache.clear()
+    return server.app
+
+
+# ---------- Scenarios ----------
+class Scenario:
+    """One route: builds a request (outside the timed section) for each call."""
+
+    def __init__(self, method, template, collection=None):
+        self.method = method
+        self.template = template
+        self.collection = collection
+        self.name = f"{method} {template}"
+
+    async def build(self, ctx):
+        path, body = self.template, None
+        if "{project_id}" in path:
+            path = path.replace("{project_id}", random.choice(ctx.ids["projects"]))
+        if "{slug}" in path:
+            path = path.replace("{slug}", f"post-{random.randrange(ctx.scale)}")
+        if "{name}" in path:
+            path = path.replace("{name}", "testimonials")
+        for param in ("{item_id}", "{message_id}"):
+            if param in path:
+                if self.method == "DELETE":
+                    # Deletes consume a document created just for them.
+                    doc = _document(self.collection, next(_unique), datetime.utcnow())
+                    await ctx.db[self.collection].insert_one(doc)
+                    item_id = str(doc["_id"])
+                else:
+                    item_id = random.choice(ctx.ids[self.collection])
+                path = path.replace(param, item_id)
+
+        if self.template == "/api/search":
+            path += "?q=python fast"
+        elif self.template == "/api/contact":
+            n = next(_unique)
+            body = {"name": "Bench", "email": f"bench{n}@example.com", "subject": "Load", "message": f"Message {n}"}
+        elif self.template == "/api/views":
+            body = {"page": random.choice(("/", "/about", "/projects", "/blog"))}
+        elif self.template == "/api/admin/personal":
+            body = {"title": "Software Engineer"}
+        elif self.template == "/api/admin/settings" and self.method == "PUT":
+            body = {"siteTitle": "Benchmark"}
+        elif self.template.endswith("/batch"):
+            body = {"operations": [{"op": "update", "id": random.choice(ctx.ids[self.collection]), "data": UPDATE_PAYLOADS[self.collection]} for _ in range(10)]}
+        elif self.method == "POST":
+            body = copy.deepcopy(CREATE_PAYLOADS[self.collection])
+            if self.collection == "blog_posts":
+                body["slug"] = f"benchmark-{next(_unique)}"
+        elif self.method == "PUT":
+            body = UPDATE_PAYLOADS[self.collection]
+        return path, body
+
+
+def scenarios(app):
+    result = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not route.path.startswith("/api"):
+            continue
+        collection = next((name for prefix, name in ADMIN_RESOURCES.items() if route.path.startswith(prefix)), None)
+        for method in sorted(route.methods):
+            result.append(Scenario(method, route.path, collection))
+    return result
+
+
+class Context:
+    def __init__(self, db, scale, ids):
+        self.db = db
+        self.scale = scale
+        self.ids = ids
+
+
+async def collect_ids(db):
+    ids = {}
+    for name in set(ADMIN_RESOURCES.values()):
+        ids[name] = [str(doc["_id"]) async for doc in db[name].find({}, {"_id": 1}).limit(1000)]
+    return ids
+
+
+# ---------- Measurement ----------
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client, ctx, scenario, requests, concurrency, cold):
+    from services.cache import query_cache
+
+    latencies, statuses = [], {}
+    remaining = count()
+
+    async def worker():
+        while next(remaining) < requests:
+            path, body = await scenario.build(ctx)
+            if cold:
+                query_cache.clear()
+            start = time.perf_counter()
+            response = await client.request(scenario.method, path, json=body)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "mean": ms(statistics.fmean(latencies)),
+            "p50": ms(percentile(latencies, 50)),
+            "p90": ms(percentile(latencies, 90)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1]),
+        },
+        "status": {str(code): n for code, n in sorted(statuses.items())},
+    }
+
+
+async def measure_allocations(client, ctx, scenario, samples, cold):
+    """Traced allocation peak and retained bytes per request, one request at a time."""
+    from services.cache import query_cache
+
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            path, body = await scenario.build(ctx)
+            if cold:
+                query_cache.clear()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            response = await client.request(scenario.method, path, json=body)
+            await response.aread()
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(after - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_mean": round(statistics.fmean(peaks)),
+        "retained_bytes_mean": round(statistics.fmean(retained)),
+    }
+
+
+async def run_scale(scale, args):
+    app = await boot(scale)
+    db = database.database.database
+    ctx = Context(db, scale, await collect_ids(db))
+    selected = [s for s in scenarios(app) if not args.route or s.template in args.route]
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for scenario in selected:
+            # Warm-up fills caches and lazily built adapters before timing.
+            for _ in range(min(5, args.requests)):
+                path, body = await scenario.build(ctx)
+                await client.request(scenario.method, path, json=body)
+            result = await run_scenario(client, ctx, scenario, args.requests, args.concurrency, args.cold)
+            result["allocations"] = await measure_allocations(client, ctx, scenario, args.alloc_samples, args.cold)
+            results[scenario.name] = result
+            print(f"  {scale:>6} {scenario.name:<48} {result['throughput_rps']:>9} rps  p50 {result['latency_ms']['p50']:>8} ms  p99 {result['latency_ms']['p99']:>8} ms", file=sys.stderr)
+
+    from services.contact_queue import contact_queue
+    from services.views import view_counter
+    await contact_queue.stop()
+    await view_counter.stop()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, action="append", help=f"documents per scaled collection (default: {', '.join(map(str, SCALES))})")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per route")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--alloc-samples", type=int, default=20, help="requests per route traced with tracemalloc")
+    parser.add_argument("--route", action="append", help="only benchmark these route templates (repeatable)")
+    parser.add_argument("--cold", action="store_true", help="clear the query cache before every request")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for request parameters")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    warnings.filterwarnings("ignore")
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "scales": {},
+    }
+    for scale in args.scale or SCALES:
+        print(f"⏱️  Benchmarking at scale {scale}...", file=sys.stderr)
+        report["scales"][str(scale)] = await run_scale(scale, args)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
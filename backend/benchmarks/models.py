@@ -0,0 +1,119 @@
+"""
+Validation and serialization throughput per read model, v1-style vs current.
+
+    python -m benchmarks.models [--count N] [--runs N]
+
+For each model, validates a list of Mongo-shaped documents through a cached
+TypeAdapter, then dumps it to JSON bytes and to Python dicts (the work the
+list endpoints and admin writes do per request), in documents/second.
+Models with a pre-migration baseline in benchmarks/models_v1.py are
+measured in both versions, with their runs interleaved so machine noise
+hits both alike, and printed as "v1 -> v2". Pass --repeat N to rerun the
+whole table and see how much the cells move between runs.
+"""
+import sys
+import timeit
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from models.blog import BlogPost
+from models.certification import Certification
+from models.contact import ContactMessage
+from models.education import Education
+from models.experience import Experience
+from models.personal import PersonalInfo
+from models.project import Project
+from models.skill import Skill
+from models.testimonial import Testimonial
+from services.data_seeder import EXPERIENCE_DATA, PERSONAL_DATA, PROJECTS_DATA
+from services.rendering import render_post
+
+from benchmarks import models_v1
+
+NOW = datetime(2024, 6, 1, 12, 30)
+POST_CONTENT = "## Intro\n\nSome *markdown* with `code`.\n\n## More\n\nA [link](https://example.com)."
+
+SAMPLES = {
+    PersonalInfo: PERSONAL_DATA,
+    Project: PROJECTS_DATA[0],
+    Experience: EXPERIENCE_DATA[0],
+    Skill: {"category": "Programming Languages", "name": "Python", "level": 90, "years_experience": 3.0},
+    Education: {
+        "degree": "B.Tech", "field": "Computer Science", "institution": "University", "location": "City",
+        "start_date": datetime(2021, 8, 1), "end_date": datetime(2025, 5, 1), "description": "Coursework.",
+        "achievements": ["Dean's list"],
+    },
+    Certification: {
+        "title": "Cloud Practitioner", "issuer": "AWS", "date": datetime(2024, 2, 1), "credential_id": "ABC-123",
+        "description": "Cloud fundamentals.", "skills": ["AWS", "Cloud"],
+    },
+    BlogPost: {
+        "title": "Post", "slug": "post", "excerpt": "An excerpt.", "content": POST_CONTENT, "image": "/img.png",
+        "tags": ["python"], "published_at": NOW, "status": "published", **render_post(POST_CONTENT),
+    },
+    Testimonial: {"name": "Jane", "position": "Lead", "company": "Acme", "image": "/jane.png", "text": "Great work.", "rating": 5},
+    ContactMessage: {"name": "Sam", "email": "sam@example.com", "subject": "Hello", "message": "Hi there!"},
+}
+
+
+def documents(model, count):
+    sample = SAMPLES[model]
+    return [{**sample, "_id": str(ObjectId()), "created_at": NOW, "updated_at": NOW} for _ in range(count)]
+
+
+def operations(model, docs):
+    """(validate, dump_json, model_dump) callables for `model` over `docs`."""
+    adapter = TypeAdapter(List[model])
+    items = adapter.validate_python(docs)
+    return (
+        lambda: adapter.validate_python(docs),
+        lambda: adapter.dump_json(items, by_alias=True),
+        lambda: [item.model_dump() for item in items],
+    )
+
+
+def compare(baseline, current, count, runs):
+    """Best-of-`runs` documents/second of both callables, alternating which goes first."""
+    best = [float("inf"), float("inf")]
+    for run in range(runs):
+        order = (0, 1) if run % 2 == 0 else (1, 0)
+        for index in order:
+            fn = (baseline, current)[index]
+            best[index] = min(best[index], timeit.timeit(fn, number=1))
+    return count / best[0], count / best[1]
+
+
+def measure(fn, count, runs):
+    return count / min(timeit.timeit(fn, number=1) for _ in range(runs))
+
+
+def cell(rates):
+    if rates[0] is None:
+        return f"{rates[1] / 1000:.0f}k"
+    return f"{rates[0] / 1000:>5.0f}k -> {rates[1] / 1000:.0f}k"
+
+
+def main():
+    count = int(sys.argv[sys.argv.index("--count") + 1]) if "--count" in sys.argv else 1000
+    runs = int(sys.argv[sys.argv.index("--runs") + 1]) if "--runs" in sys.argv else 20
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 1
+    print(f"⏱️  {count} documents per run, best of {runs}, documents/second (v1 -> v2 where a baseline exists)")
+    for _ in range(repeat):
+        print(f"{'model':<16}{'validate':>18}{'dump_json':>18}{'model_dump':>18}")
+        for model in SAMPLES:
+            docs = documents(model, count)
+            current = operations(model, docs)
+            v1_model = getattr(models_v1, model.__name__, None)
+            if v1_model is None:
+                cells = [cell((None, measure(new, count, runs))) for new in current]
+            else:
+                baseline = operations(v1_model, docs)
+                cells = [cell(compare(old, new, count, runs)) for old, new in zip(baseline, current)]
+            print(f"{model.__name__:<16}" + "".join(f"{c:>18}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
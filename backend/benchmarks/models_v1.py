@@ -0,0 +1,82 @@
+"""
+Three read models as they were before the Pydantic v2 migration (v1-style
+`class Config` with json_encoders lambdas), kept only as the baseline
+column of benchmarks.models. They cover the shapes whose cost the
+migration changed: datetimes only (PersonalInfo), a date field
+(Certification), and date fields plus lists (Project). Not used by the
+app.
+"""
+import warnings
+from datetime import date, datetime
+from typing import List, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, Field
+
+# The v1 config keys are deprecated in v2; that is the point of the baseline.
+warnings.filterwarnings("ignore", module="pydantic")
+
+
+class PersonalInfo(BaseModel):
+    id: Optional[str] = Field(default=None, alias="_id")
+    name: str
+    title: str
+    location: str
+    email: str
+    phone: str
+    linkedin: str
+    github: Optional[str] = None
+    bio: str
+    avatar: str
+    resume: str
+    status: str = "available"  # available, busy, unavailable
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 0
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+
+class Project(BaseModel):
+    id: Optional[str] = Field(default=None, alias="_id")
+    title: str
+    description: str
+    short_description: str
+    image: str
+    images: List[str] = []
+    live_url: str
+    github_url: str
+    technologies: List[str] = []
+    features: List[str] = []
+    category: str
+    status: str = "completed"  # completed, in-progress, planned
+    start_date: date
+    end_date: date
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 0
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str, date: lambda v: v.isoformat()}
+
+
+class Certification(BaseModel):
+    id: Optional[str] = Field(default=None, alias="_id")
+    title: str
+    issuer: str
+    date: date
+    credential_id: Optional[str] = None
+    description: str
+    skills: List[str] = []
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 0
+
+    class Config:
+        allow_population_by_field_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str, date: lambda v: v.isoformat()}
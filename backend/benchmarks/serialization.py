@@ -0,0 +1,74 @@
+"""
+Compare list-response encoding paths on synthetic projects and blog posts.
+
+    python -m benchmarks.serialization [--runs N]
+
+"validated" is the previous path (stringify _id, validate as List[model],
+dump with pydantic); "trusted" shapes the raw documents to the model and
+encodes them with orjson.
+"""
+import copy
+import sys
+import timeit
+from datetime import datetime
+from typing import List
+
+from bson import ObjectId
+
+from models.blog import BlogPost
+from models.project import Project
+from services.data_seeder import PROJECTS_DATA
+from services.rendering import render_post
+from services.responses import encode_json, encode_trusted
+
+SIZES = (100, 1000)
+POST_CONTENT = "\n\n".join(
+    f"## Section {i}\n\nSome *markdown* text with `code` and a [link](https://example.com)." for i in range(12)
+)
+
+
+def make_projects(count):
+    now = datetime.utcnow()
+    return [
+        {**copy.deepcopy(PROJECTS_DATA[i % len(PROJECTS_DATA)]), "_id": ObjectId(), "created_at": now, "updated_at": now, "version": 1}
+        for i in range(count)
+    ]
+
+
+def make_posts(count):
+    now = datetime.utcnow()
+    artifact = render_post(POST_CONTENT)
+    return [
+        {
+            "_id": ObjectId(), "title": f"Post {i}", "slug": f"post-{i}", "excerpt": "An excerpt.",
+            "content": POST_CONTENT, "image": "/img/post.png", "tags": ["python", "mongo"],
+            "published_at": now, "status": "published", "created_at": now, "updated_at": now,
+            "version": 1, **artifact,
+        }
+        for i in range(count)
+    ]
+
+
+def validated(docs, model):
+    serialized = [dict(doc, _id=str(doc["_id"])) for doc in docs]
+    return encode_json(serialized, List[model]).body
+
+
+def trusted(docs, model):
+    return encode_trusted(docs, model).body
+
+
+def main():
+    runs = int(sys.argv[sys.argv.index("--runs") + 1]) if "--runs" in sys.argv else 50
+    print(f"⏱️  Encoding list responses ({runs} runs, best per-call time)")
+    for name, model, factory in (("projects", Project, make_projects), ("blog", BlogPost, make_posts)):
+        for size in SIZES:
+            docs = factory(size)
+            assert validated(docs, model) == trusted(docs, model)
+            old = min(timeit.repeat(lambda: validated(docs, model), number=1, repeat=runs))
+            new = min(timeit.repeat(lambda: trusted(docs, model), number=1, repeat=runs))
+            print(f"/api/{name:<8} {size:>5} docs  validated {old * 1000:8.2f} ms  trusted {new * 1000:8.2f} ms  {old / new:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import asyncio
+import sys
+from services.indexes import ensure_indexes, check_query_plans
+from database import connect_to_mongo, close_mongo_connection
+
+async def main():
+    print("🔎 Ensuring indexes and checking route query plans...")
+    await connect_to_mongo()
+    try:
+        undeclared = await ensure_indexes(drop_undeclared="--drop-undeclared" in sys.argv)
+        for collection, names in undeclared.items():
+            print(f"⚠️  {collection}: undeclared indexes {', '.join(names)}")
+        collscans = await check_query_plans()
+    finally:
+        await close_mongo_connection()
+
+    if collscans:
+        for label in collscans:
+            print(f"❌ {label} falls back to COLLSCAN")
+        return 1
+    print("✅ Every route query is served by an index!")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,32 +1,81 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
 from pymongo.server_api import ServerApi
 from typing import Optional
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from services.pool_metrics import PoolMetrics
+from services.metrics import CommandMetrics
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Driver options that can be tuned through the environment. Unset variables
+# keep the driver defaults.
+CLIENT_OPTIONS_FROM_ENV = {
+    "maxPoolSize": ("MONGO_MAX_POOL_SIZE", int),
+    "minPoolSize": ("MONGO_MIN_POOL_SIZE", int),
+    "maxIdleTimeMS": ("MONGO_MAX_IDLE_TIME_MS", int),
+    "maxConnecting": ("MONGO_MAX_CONNECTING", int),
+    "waitQueueTimeoutMS": ("MONGO_WAIT_QUEUE_TIMEOUT_MS", int),
+    "serverSelectionTimeoutMS": ("MONGO_SERVER_SELECTION_TIMEOUT_MS", int),
+    "connectTimeoutMS": ("MONGO_CONNECT_TIMEOUT_MS", int),
+    "socketTimeoutMS": ("MONGO_SOCKET_TIMEOUT_MS", int),
+    "compressors": ("MONGO_COMPRESSORS", str),  # e.g. "zstd,snappy,zlib"
+}
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database = None
+    # Handle for read-only traffic (routes/public.py), routed by
+    # MONGO_READ_PREFERENCE. It defaults to "primary": with secondaryPreferred a
+    # read right after an admin write may miss it until replication catches up.
+    read_database = None
+    pool_metrics = PoolMetrics(
+        slow_checkout_ms=float(os.environ.get('MONGO_SLOW_CHECKOUT_MS', '100'))
+    )
+    command_metrics = CommandMetrics(
+        slow_command_ms=float(os.environ.get('MONGO_SLOW_COMMAND_MS', '100'))
+    )
 
 database = Database()
 
+def client_options() -> dict:
+    options = {}
+    for option, (env_name, cast) in CLIENT_OPTIONS_FROM_ENV.items():
+        value = os.environ.get(env_name)
+        if value:
+            options[option] = cast(value)
+    return options
+
+def read_preference():
+    mode = os.environ.get('MONGO_READ_PREFERENCE', 'primary')
+    max_staleness = int(os.environ.get('MONGO_MAX_STALENESS_SECONDS', '-1'))
+    return make_read_preference(read_pref_mode_from_name(mode), None, max_staleness)
+
 async def get_database():
     return database.database
 
+async def get_read_database():
+    return database.read_database
+
 async def connect_to_mongo():
     mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
     db_name = os.environ.get('DB_NAME', 'portfolio')
-    
+
     # FIX: Added server_api=ServerApi('1') to ensure connection works on Render
     try:
-        database.client = AsyncIOMotorClient(mongo_url, server_api=ServerApi('1'))
+        database.client = AsyncIOMotorClient(
+            mongo_url,
+            server_api=ServerApi('1'),
+            event_listeners=[database.pool_metrics, database.command_metrics],
+            **client_options()
+        )
         database.database = database.client[db_name]
-        
+        database.read_database = database.client.get_database(db_name, read_preference=read_preference())
+
         # Verify connection immediately
         await database.client.admin.command('ping')
         print(f"Connected to MongoDB at {mongo_url}, DB: {db_name}")
@@ -43,4 +92,9 @@ async def close_mongo_connection():
 # Collection helpers
 async def get_collection(name: str):
     db = await get_database()
-    return db[name]
\ No newline at end of file
+    return db[name]
+
+async def get_read_collection(name: str):
+    """Collection handle for read-only routes, honouring MONGO_READ_PREFERENCE."""
+    db = await get_read_database()
+    return db[name]
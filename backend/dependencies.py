@@ -0,0 +1,50 @@
+from fastapi import Depends, FastAPI, Request
+from motor.motor_asyncio import AsyncIOMotorCollection
+from typing import Annotated
+
+# Collections the routers use; their handles are created once at startup.
+COLLECTIONS = (
+    "personal_info",
+    "projects",
+    "experiences",
+    "skills",
+    "skill_categories",
+    "education",
+    "certifications",
+    "blog_posts",
+    "testimonials",
+    "contact_messages",
+    "settings",
+    "view_counts",
+)
+
+class CollectionHandles(dict):
+    """
+    Collection name -> handle. Handles are built once from a database handle;
+    any other mapping of name -> collection-like object (e.g. an in-memory
+    fake) can stand in for it through `app.dependency_overrides`.
+    """
+
+    def __init__(self, db):
+        super().__init__((name, db[name]) for name in COLLECTIONS)
+        self._db = db
+
+    def __missing__(self, name: str) -> AsyncIOMotorCollection:
+        handle = self[name] = self._db[name]
+        return handle
+
+def init_collection_handles(app: FastAPI, database):
+    """Store primary and read-routed handles on app.state. Call after connect_to_mongo()."""
+    app.state.collections = CollectionHandles(database.database)
+    app.state.read_collections = CollectionHandles(database.read_database)
+
+async def get_collections(request: Request) -> CollectionHandles:
+    """Primary handles, for writes and admin reads."""
+    return request.app.state.collections
+
+async def get_read_collections(request: Request) -> CollectionHandles:
+    """Read-routed handles (MONGO_READ_PREFERENCE), for public reads."""
+    return request.app.state.read_collections
+
+Collections = Annotated[CollectionHandles, Depends(get_collections)]
+ReadCollections = Annotated[CollectionHandles, Depends(get_read_collections)]
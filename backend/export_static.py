@@ -0,0 +1,37 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from services.snapshot import SnapshotConflict, SnapshotExporter
+from database import connect_to_mongo, close_mongo_connection, database
+from dependencies import CollectionHandles
+
+DEFAULT_OUT = Path(os.environ.get("STATIC_EXPORT_DIR", Path(__file__).parent / "static_export"))
+
+def output_dir() -> Path:
+    # --out DIR overrides STATIC_EXPORT_DIR
+    if "--out" in sys.argv:
+        index = sys.argv.index("--out")
+        if index + 1 < len(sys.argv):
+            return Path(sys.argv[index + 1])
+    return DEFAULT_OUT
+
+async def main():
+    out = output_dir()
+    print(f"📦 Exporting public API snapshot to {out}...")
+    await connect_to_mongo()
+    try:
+        # --force rebuilds every file, ignoring the previous manifest
+        exporter = SnapshotExporter(CollectionHandles(database.database), out, force="--force" in sys.argv)
+        summary = await exporter.run()
+    except SnapshotConflict as e:
+        print(f"❌ Snapshot not exported: {e}")
+        sys.exit(1)
+    finally:
+        await close_mongo_connection()
+    for path in exporter.removed:
+        print(f"🗑️  removed {path}")
+    print(f"✅ Snapshot exported: {summary['written']} written, {summary['unchanged']} unchanged, {summary['removed']} removed!")
+
+if __name__ == "__main__":
+    asyncio.run(main())
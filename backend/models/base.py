@@ -0,0 +1,34 @@
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic_core import core_schema
+from typing import Annotated, Optional
+from bson import ObjectId
+
+class _ObjectIdStr:
+    """
+    Schema for Mongo _id in API models: a str, or an ObjectId converted to
+    its hex string. Strings validate and serialize natively; only ObjectIds
+    go through str(), so no Python code runs per document for string ids.
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.union_schema(
+            [
+                core_schema.str_schema(),
+                core_schema.no_info_after_validator_function(str, core_schema.is_instance_schema(ObjectId)),
+            ],
+            serialization=core_schema.to_string_ser_schema(),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {"type": "string"}
+
+# No per-field json_encoders: pydantic-core serializes it as a string.
+PyObjectId = Annotated[str, _ObjectIdStr]
+
+class MongoModel(BaseModel):
+    """Base for documents read from a collection; `id` is populated from `_id`."""
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: Optional[PyObjectId] = Field(default=None, alias="_id")
@@ -1,10 +1,17 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
-from bson import ObjectId
+from models.base import MongoModel
 
-class BlogPost(BaseModel):
-    id: Optional[str] = Field(default=None, alias="_id")
+# Slugs taken by other /api/blog/... routes; a post there could never be served.
+RESERVED_SLUGS = frozenset({"featured"})
+
+class TocEntry(BaseModel):
+    level: int
+    text: str
+    id: str
+
+class BlogPost(MongoModel):
     title: str
     slug: str
     excerpt: str
@@ -15,13 +22,30 @@ class BlogPost(BaseModel):
     read_time: str
     featured: bool = False
     status: str = "draft"  # draft, published, archived
+    # Pre-rendered artifact, computed from `content` on write
+    content_html: Optional[str] = None
+    toc: List[TocEntry] = []
+    word_count: Optional[int] = None
+    content_hash: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    version: int = 0
+
+class BlogPostSummary(MongoModel):
+    """A post in lists (/blog, /blog/featured, bootstrap): no body, only /blog/{slug} serves that."""
+    title: str
+    slug: str
+    excerpt: str
+    image: str
+    tags: List[str] = []
+    published_at: Optional[datetime] = None
+    read_time: str
+    featured: bool = False
+    status: str = "draft"
+    word_count: Optional[int] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 0
 
 class BlogPostCreate(BaseModel):
     title: str
@@ -30,7 +54,7 @@ class BlogPostCreate(BaseModel):
     content: str
     image: str
     tags: List[str] = []
-    read_time: str
+    read_time: Optional[str] = None  # computed from content when rendered
     featured: bool = False
     status: str = "draft"
 
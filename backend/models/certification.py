@@ -1,10 +1,9 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime, date
-from bson import ObjectId
+from models.base import MongoModel
 
-class Certification(BaseModel):
-    id: Optional[str] = Field(default=None, alias="_id")
+class Certification(MongoModel):
     title: str
     issuer: str
     date: date
@@ -13,11 +12,7 @@ class Certification(BaseModel):
     skills: List[str] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str, date: lambda v: v.isoformat()}
+    version: int = 0
 
 class CertificationCreate(BaseModel):
     title: str
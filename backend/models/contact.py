@@ -1,10 +1,9 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from bson import ObjectId
+from models.base import MongoModel
 
-class ContactMessage(BaseModel):
-    id: Optional[str] = Field(default=None, alias="_id")
+class ContactMessage(MongoModel):
     name: str
     email: str
     subject: str
@@ -12,11 +11,6 @@ class ContactMessage(BaseModel):
     status: str = "new"  # new, read, replied
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
 
 class ContactMessageCreate(BaseModel):
     name: str
@@ -1,10 +1,9 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime, date
-from bson import ObjectId
+from models.base import MongoModel
 
-class Education(BaseModel):
-    id: Optional[str] = Field(default=None, alias="_id")
+class Education(MongoModel):
     degree: str
     field: str
     institution: str
@@ -17,11 +16,7 @@ class Education(BaseModel):
     achievements: List[str] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str, date: lambda v: v.isoformat() if v else None}
+    version: int = 0
 
 class EducationCreate(BaseModel):
     degree: str
@@ -1,10 +1,9 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from bson import ObjectId
+from models.base import MongoModel
 
-class PersonalInfo(BaseModel):
-    id: Optional[str] = Field(default=None, alias="_id")
+class PersonalInfo(MongoModel):
     name: str
     title: str
     location: str
@@ -17,11 +16,7 @@ class PersonalInfo(BaseModel):
     resume: str
     status: str = "available"  # available, busy, unavailable
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    version: int = 0
 
 class PersonalInfoUpdate(BaseModel):
     name: Optional[str] = None
@@ -1,21 +1,16 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
-from bson import ObjectId
+from models.base import MongoModel
 
-class Skill(BaseModel):
-    id: Optional[str] = Field(default=None, alias="_id")
+class Skill(MongoModel):
     category: str  # Programming Languages, Web Technologies, etc.
     name: str
     level: int = Field(ge=0, le=100)  # 0-100
     years_experience: Optional[float] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    version: int = 0
 
 class SkillCreate(BaseModel):
     category: str
@@ -29,6 +24,11 @@ class SkillUpdate(BaseModel):
     level: Optional[int] = Field(default=None, ge=0, le=100)
     years_experience: Optional[float] = None
 
+class SkillLevel(BaseModel):
+    name: str
+    level: int
+    years_experience: Optional[float] = None
+
 class SkillsGrouped(BaseModel):
-    technical: dict  # Category -> List of skills
-    soft: list  # List of soft skill names
\ No newline at end of file
+    technical: Dict[str, List[SkillLevel]]  # Category -> skills, strongest first
+    soft: List[str]  # "Soft Skills" category names, strongest first
\ No newline at end of file
@@ -1,10 +1,9 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from bson import ObjectId
+from models.base import MongoModel
 
-class Testimonial(BaseModel):
-    id: Optional[str] = Field(default=None, alias="_id")
+class Testimonial(MongoModel):
     name: str
     position: str
     company: str
@@ -13,11 +12,7 @@ class Testimonial(BaseModel):
     rating: int = Field(ge=1, le=5)  # 1-5
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        allow_population_by_field_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    version: int = 0
 
 class TestimonialCreate(BaseModel):
     name: str
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+class PageView(BaseModel):
+    page: str = Field(max_length=200, pattern=r"^/[A-Za-z0-9_\-/]*$")  # frontend route path
+
+class ViewCount(BaseModel):
+    key: str  # project id, post slug or page path
+    views: int
+    uniques: int  # HyperLogLog estimate
@@ -0,0 +1,49 @@
+import asyncio
+import sys
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from pymongo import UpdateOne
+from services.rendering import needs_render, render_post
+from database import connect_to_mongo, close_mongo_connection, get_collection
+
+BATCH_SIZE = 100
+
+async def main():
+    # --all re-renders every post, not only ones whose artifact is stale
+    rerender_all = "--all" in sys.argv
+    print("📝 Re-rendering blog posts...")
+    await connect_to_mongo()
+    collection = await get_collection("blog_posts")
+    loop = asyncio.get_running_loop()
+    rendered = 0
+
+    with ProcessPoolExecutor() as pool:
+        cursor = collection.find({}, {"content": 1, "content_hash": 1}).batch_size(BATCH_SIZE)
+        batch = []
+        async for post in cursor:
+            if rerender_all or needs_render(post):
+                batch.append(post)
+            if len(batch) == BATCH_SIZE:
+                rendered += await render_batch(loop, pool, collection, batch)
+                batch = []
+        if batch:
+            rendered += await render_batch(loop, pool, collection, batch)
+
+    await close_mongo_connection()
+    print(f"✅ Re-rendered {rendered} posts!")
+
+async def render_batch(loop, pool, collection, posts):
+    artifacts = await asyncio.gather(*(
+        loop.run_in_executor(pool, render_post, post.get("content") or "") for post in posts
+    ))
+    # A new updated_at and version, so caches, change polling and the static
+    # export all see the re-rendered artifact.
+    now = datetime.utcnow()
+    await collection.bulk_write([
+        UpdateOne({"_id": post["_id"]}, {"$set": {**artifact, "updated_at": now}, "$inc": {"version": 1}})
+        for post, artifact in zip(posts, artifacts)
+    ], ordered=False)
+    return len(posts)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,249 +1,179 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
-from database import get_collection
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional
+from dependencies import Collections
 from models.personal import PersonalInfo, PersonalInfoUpdate
 from models.project import Project, ProjectCreate, ProjectUpdate
 from models.experience import Experience, ExperienceCreate, ExperienceUpdate
-from models.skill import Skill, SkillCreate, SkillUpdate
+from models.skill import Skill, SkillCreate, SkillUpdate, SkillsGrouped
 from models.education import Education, EducationCreate, EducationUpdate
 from models.certification import Certification, CertificationCreate, CertificationUpdate
-from models.blog import BlogPost, BlogPostCreate, BlogPostUpdate
+from models.blog import RESERVED_SLUGS, BlogPost, BlogPostCreate, BlogPostUpdate
 from models.testimonial import Testimonial, TestimonialCreate, TestimonialUpdate
 from models.contact import ContactMessage, ContactMessageUpdate
-from bson import ObjectId
+from services.cache import query_cache
+from services.pagination import encode_page, fetch_page, parse_fields
+from services.responses import json_response
+from services.search import index_post, index_project
+from services.rendering import render_post
+from services.export import stream_collection
+from services.batch import BatchRequest, run_batch
+from services.crud import CrudService, parse_if_match, version_etag
+from services.skills import apply_skill_changes, load_skill_groups, rebuild_skill_categories
+from routes.crud import crud_router, ensure_oid, serialize_doc
 from datetime import datetime
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 # ---------- Helpers ----------
-def serialize_doc(doc):
-    """Convert Mongo _id to str and mirror into id field."""
-    if doc and "_id" in doc:
-        if isinstance(doc["_id"], ObjectId):
-            doc["_id"] = str(doc["_id"])
-        if "id" not in doc:
-            doc["id"] = doc["_id"]
-    return doc
-
-def serialize_docs(docs):
-    return [serialize_doc(doc) for doc in docs]
-
-def ensure_oid(id_str: str) -> ObjectId:
-    if not ObjectId.is_valid(id_str):
-        raise HTTPException(status_code=400, detail="Invalid ID")
-    return ObjectId(id_str)
+def check_slug(slug):
+    if slug in RESERVED_SLUGS:
+        raise HTTPException(status_code=422, detail=f"The slug {slug!r} is reserved")
 
-# ---------- Personal Information ----------
-@router.put("/personal", response_model=PersonalInfo)
-async def update_personal_info(update_data: PersonalInfoUpdate):
-    collection = await get_collection("personal_info")
-    current = await collection.find_one()
-    if not current:
-        raise HTTPException(status_code=404, detail="Personal information not found")
-
-    update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
-    update_dict["updated_at"] = datetime.utcnow()
-
-    await collection.update_one({"_id": current["_id"]}, {"$set": update_dict})
-    updated = await collection.find_one({"_id": current["_id"]})
-    return serialize_doc(updated)
-
-# ---------- Projects ----------
-@router.get("/projects", response_model=List[Project])
-async def list_projects():
-    collection = await get_collection("projects")
-    docs = await collection.find().sort("updated_at", -1).to_list(1000)
-    return serialize_docs(docs)
-
-@router.post("/projects", response_model=Project)
-async def create_project(project: ProjectCreate):
-    collection = await get_collection("projects")
-    project_data = project.dict()
-    now = datetime.utcnow()
-    project_data["created_at"] = now
-    project_data["updated_at"] = now
-    result = await collection.insert_one(project_data)
-    created = await collection.find_one({"_id": result.inserted_id})
-    return serialize_doc(created)
-
-@router.put("/projects/{project_id}", response_model=Project)
-async def update_project(project_id: str, update_data: ProjectUpdate):
-    collection = await get_collection("projects")
-    oid = ensure_oid(project_id)
-    update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
-    update_dict["updated_at"] = datetime.utcnow()
-
-    result = await collection.update_one({"_id": oid}, {"$set": update_dict})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    updated = await collection.find_one({"_id": oid})
-    return serialize_doc(updated)
-
-@router.delete("/projects/{project_id}")
-async def delete_project(project_id: str):
-    collection = await get_collection("projects")
-    oid = ensure_oid(project_id)
-    result = await collection.delete_one({"_id": oid})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return {"message": "Project deleted successfully"}
-
-# ---------- Experience ----------
-@router.post("/experience", response_model=Experience)
-async def create_experience(experience: ExperienceCreate):
-    collection = await get_collection("experiences")
-    data = experience.dict()
-    now = datetime.utcnow()
-    data["created_at"] = now
-    data["updated_at"] = now
-    result = await collection.insert_one(data)
-    created = await collection.find_one({"_id": result.inserted_id})
-    return serialize_doc(created)
-
-@router.put("/experience/{experience_id}", response_model=Experience)
-async def update_experience(experience_id: str, update_data: ExperienceUpdate):
-    collection = await get_collection("experiences")
-    oid = ensure_oid(experience_id)
-    update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
-    update_dict["updated_at"] = datetime.utcnow()
-
-    result = await collection.update_one({"_id": oid}, {"$set": update_dict})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Experience not found")
-
-    updated = await collection.find_one({"_id": oid})
-    return serialize_doc(updated)
-
-@router.delete("/experience/{experience_id}")
-async def delete_experience(experience_id: str):
-    collection = await get_collection("experiences")
-    oid = ensure_oid(experience_id)
-    result = await collection.delete_one({"_id": oid})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Experience not found")
-    return {"message": "Experience deleted successfully"}
-
-# ---------- Skills ----------
-@router.post("/skills", response_model=Skill)
-async def create_skill(skill: SkillCreate):
-    collection = await get_collection("skills")
-    data = skill.dict()
-    now = datetime.utcnow()
-    data["created_at"] = now
-    data["updated_at"] = now
-    result = await collection.insert_one(data)
-    created = await collection.find_one({"_id": result.inserted_id})
-    return serialize_doc(created)
-
-@router.put("/skills/{skill_id}", response_model=Skill)
-async def update_skill(skill_id: str, update_data: SkillUpdate):
-    collection = await get_collection("skills")
-    oid = ensure_oid(skill_id)
-    update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
-    update_dict["updated_at"] = datetime.utcnow()
-
-    result = await collection.update_one({"_id": oid}, {"$set": update_dict})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Skill not found")
-
-    updated = await collection.find_one({"_id": oid})
-    return serialize_doc(updated)
-
-@router.delete("/skills/{skill_id}")
-async def delete_skill(skill_id: str):
-    collection = await get_collection("skills")
-    oid = ensure_oid(skill_id)
-    result = await collection.delete_one({"_id": oid})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Skill not found")
-    return {"message": "Skill deleted successfully"}
-
-# ---------- Blog Posts (NEW) ----------
-@router.get("/posts", response_model=List[BlogPost])
-async def list_posts():
-    collection = await get_collection("blog_posts")
-    docs = await collection.find().sort("created_at", -1).to_list(1000)
-    return serialize_docs(docs)
-
-@router.post("/posts", response_model=BlogPost)
-async def create_post(post: BlogPostCreate):
-    collection = await get_collection("blog_posts")
-    data = post.dict()
-    now = datetime.utcnow()
+def prepare_post_create(data):
+    """Derive the slug and pre-rendered content for a new post."""
     if not data.get("slug") and data.get("title"):
         data["slug"] = data["title"].lower().replace(" ", "-")
-    data["created_at"] = now
-    data["updated_at"] = now
-    result = await collection.insert_one(data)
-    created = await collection.find_one({"_id": result.inserted_id})
-    return serialize_doc(created)
-
-@router.put("/posts/{post_id}", response_model=BlogPost)
-async def update_post(post_id: str, update_data: BlogPostUpdate):
-    collection = await get_collection("blog_posts")
-    oid = ensure_oid(post_id)
-    update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+    check_slug(data.get("slug"))
+    data.update(render_post(data["content"]))
+
+def prepare_post_update(update_dict):
     if "title" in update_dict and "slug" not in update_dict:
         update_dict["slug"] = update_dict["title"].lower().replace(" ", "-")
-    update_dict["updated_at"] = datetime.utcnow()
-    result = await collection.update_one({"_id": oid}, {"$set": update_dict})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Post not found")
-    updated = await collection.find_one({"_id": oid})
-    return serialize_doc(updated)
-
-@router.delete("/posts/{post_id}")
-async def delete_post(post_id: str):
-    collection = await get_collection("blog_posts")
-    oid = ensure_oid(post_id)
-    result = await collection.delete_one({"_id": oid})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Post not found")
-    return {"message": "Post deleted successfully"}
+    check_slug(update_dict.get("slug"))
+    if "content" in update_dict:
+        update_dict.update(render_post(update_dict["content"]))
+
+async def update_skill_categories(collections, written, deleted):
+    """Fold skill writes into the materialized per-category view."""
+    await apply_skill_changes(collections["skills"], collections["skill_categories"], written, deleted)
+    query_cache.invalidate("skill_categories")
+
+# ---------- Personal Information ----------
+@router.put("/personal", response_model=PersonalInfo)
+async def update_personal_info(update_data: PersonalInfoUpdate, response: Response, collections: Collections, if_match: Optional[str] = Header(None)):
+    """Conditional on If-Match like the resource routes (routes/crud.py); returns the new ETag."""
+    service = CrudService(collections["personal_info"], "Personal information")
+    update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
+    updated = await service.update({}, update_dict, parse_if_match(if_match))
+    query_cache.invalidate("personal_info")
+    response.headers["ETag"] = version_etag(updated)
+    return updated
+
+# ---------- Skills (grouped) ----------
+# Registered before the skills resource so "grouped" is not taken for an id.
+@router.get("/skills/grouped", response_model=SkillsGrouped)
+async def get_skills_grouped(request: Request, collections: Collections):
+    return json_response(request, await load_skill_groups(collections["skill_categories"]))
+
+@router.post("/skills/grouped/rebuild")
+async def rebuild_skills_grouped(collections: Collections):
+    """Regroup every skill from scratch, e.g. after editing skills outside the API."""
+    categories = await rebuild_skill_categories(collections["skills"], collections["skill_categories"])
+    query_cache.invalidate("skill_categories")
+    return {"message": "Skill categories rebuilt", "categories": categories}
+
+# ---------- Resources ----------
+# list/get/create/update/delete/batch for each collection, see routes/crud.py
+for resource_router in (
+    crud_router("/projects", "projects", Project, ProjectCreate, ProjectUpdate, "Project",
+                sort_key="updated_at", search_kind="project", indexer=index_project),
+    crud_router("/experience", "experiences", Experience, ExperienceCreate, ExperienceUpdate, "Experience",
+                sort_key="start_date"),
+    crud_router("/skills", "skills", Skill, SkillCreate, SkillUpdate, "Skill",
+                after_write=update_skill_categories),
+    crud_router("/posts", "blog_posts", BlogPost, BlogPostCreate, BlogPostUpdate, "Post",
+                prepare_create=prepare_post_create, prepare_update=prepare_post_update,
+                search_kind="post", indexer=index_post,
+                conflict_detail="A post with this slug already exists"),
+    crud_router("/education", "education", Education, EducationCreate, EducationUpdate, "Education",
+                sort_key="start_date"),
+    crud_router("/certifications", "certifications", Certification, CertificationCreate, CertificationUpdate, "Certification",
+                sort_key="date"),
+    crud_router("/testimonials", "testimonials", Testimonial, TestimonialCreate, TestimonialUpdate, "Testimonial"),
+):
+    router.include_router(resource_router)
 
 # ---------- Settings (NEW) ----------
 @router.get("/settings")
-async def get_settings():
-    collection = await get_collection("settings")
+async def get_settings(response: Response, collections: Collections):
+    collection = collections["settings"]
     doc = await collection.find_one()
     if not doc:
-        now = datetime.utcnow()
-        seed = {"siteTitle": "Portfolio", "defaultDark": False,
-                "created_at": now, "updated_at": now}
-        res = await collection.insert_one(seed)
-        doc = await collection.find_one({"_id": res.inserted_id})
+        doc = await CrudService(collection, "Settings").create({"siteTitle": "Portfolio", "defaultDark": False})
+    response.headers["ETag"] = version_etag(doc)
     return serialize_doc(doc)
 
 @router.put("/settings")
-async def update_settings(data: Dict[str, Any]):
-    collection = await get_collection("settings")
-    current = await collection.find_one()
+async def update_settings(data: Dict[str, Any], response: Response, collections: Collections, if_match: Optional[str] = Header(None)):
+    """Conditional on If-Match like the resource routes (routes/crud.py); returns the new ETag."""
+    service = CrudService(collections["settings"], "Settings")
     payload = {k: v for k, v in data.items() if k in ("siteTitle", "defaultDark")}
-    payload["updated_at"] = datetime.utcnow()
-    if current:
-        await collection.update_one({"_id": current["_id"]}, {"$set": payload})
-        doc = await collection.find_one({"_id": current["_id"]})
-    else:
-        payload["created_at"] = datetime.utcnow()
-        res = await collection.insert_one(payload)
-        doc = await collection.find_one({"_id": res.inserted_id})
+    doc = await service.update({}, payload, parse_if_match(if_match), upsert=if_match is None)
+    response.headers["ETag"] = version_etag(doc)
     return serialize_doc(doc)
 
 # ---------- Messages ----------
 @router.get("/messages", response_model=List[ContactMessage])
-async def get_contact_messages():
-    collection = await get_collection("contact_messages")
-    messages = await collection.find().sort("created_at", -1).to_list(1000)
-    return serialize_docs(messages)
+async def get_contact_messages(
+    request: Request,
+    collections: Collections,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    collection = collections["contact_messages"]
+    projection = parse_fields(fields, ContactMessage, "created_at")
+    docs, next_cursor = await fetch_page(collection, {}, "created_at", limit, cursor, projection)
+    return json_response(request, encode_page(docs, next_cursor, ContactMessage, fields))
 
 @router.put("/messages/{message_id}")
-async def update_message_status(message_id: str, update_data: ContactMessageUpdate):
-    collection = await get_collection("contact_messages")
+async def update_message_status(message_id: str, update_data: ContactMessageUpdate, collections: Collections):
+    collection = collections["contact_messages"]
     oid = ensure_oid(message_id)
-    update_dict = update_data.dict()
+    update_dict = update_data.model_dump()
     update_dict["updated_at"] = datetime.utcnow()
     result = await collection.update_one({"_id": oid}, {"$set": update_dict})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Message not found")
     return {"message": "Message status updated successfully"}
+
+@router.post("/messages/batch")
+async def batch_messages(batch: BatchRequest, collections: Collections):
+    """Update or delete many messages with a single bulk_write."""
+    result = await run_batch(collections["contact_messages"], batch, None, ContactMessageUpdate)
+    query_cache.invalidate("contact_messages")
+    return result.to_dict()
+
+# ---------- Export ----------
+EXPORT_MODELS = {
+    "personal_info": PersonalInfo,
+    "projects": Project,
+    "experiences": Experience,
+    "skills": Skill,
+    "education": Education,
+    "certifications": Certification,
+    "blog_posts": BlogPost,
+    "testimonials": Testimonial,
+    "contact_messages": ContactMessage,
+}
+
+@router.get("/export/{name}")
+async def export_collection(
+    name: str,
+    collections: Collections,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
+):
+    """Stream a whole collection as NDJSON or CSV (optionally gzipped) without buffering it."""
+    model = EXPORT_MODELS.get(name)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Unknown collection")
+    columns = ["_id"] + [field for field, info in model.model_fields.items() if info.alias != "_id"]
+    filename = f"{name}.{format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else ("text/csv" if format == "csv" else "application/x-ndjson")
+    return StreamingResponse(
+        stream_collection(collections[name], format, columns, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
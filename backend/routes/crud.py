@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from dependencies import Collections
+from services.batch import BatchRequest, run_batch
+from services.cache import query_cache
+from services.crud import CrudService, parse_if_match, version_etag
+from services.pagination import encode_page, fetch_page, parse_fields
+from services.responses import json_response
+from services.search import search_index
+
+# ---------- Helpers ----------
+def serialize_doc(doc):
+    """Convert Mongo _id to str and mirror into id field."""
+    if doc and "_id" in doc:
+        if isinstance(doc["_id"], ObjectId):
+            doc["_id"] = str(doc["_id"])
+        if "id" not in doc:
+            doc["id"] = doc["_id"]
+    return doc
+
+def ensure_oid(id_str: str) -> ObjectId:
+    if not ObjectId.is_valid(id_str):
+        raise HTTPException(status_code=400, detail="Invalid ID")
+    return ObjectId(id_str)
+
+# ---------- Router factory ----------
+def crud_router(
+    path: str,
+    collection_name: str,
+    model: Type[BaseModel],
+    create_model: Type[BaseModel],
+    update_model: Type[BaseModel],
+    label: str,
+    sort_key: str = "created_at",
+    prepare_create: Optional[Callable[[Dict[str, Any]], None]] = None,
+    prepare_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+    search_kind: Optional[str] = None,
+    indexer: Optional[Callable[[Dict[str, Any]], None]] = None,
+    conflict_detail: Optional[str] = None,
+    after_write: Optional[Callable[[Any, List[Dict[str, Any]], List[ObjectId]], Awaitable[None]]] = None,
+) -> APIRouter:
+    """
+    Build the admin list/get/create/update/delete/batch routes for one
+    collection. Every resource goes through the same code path: request-scoped
+    collection handles, keyset pagination with field projection, single
+    round-trip writes with If-Match version checks, query cache invalidation
+    and, when `indexer` is given, search index upkeep.
+
+    `prepare_create`/`prepare_update` derive stored fields from the payload
+    (e.g. rendered post HTML); `conflict_detail` is the 409 message for a
+    unique index violation. `after_write(collections, written_docs,
+    deleted_ids)` keeps derived collections (e.g. materialized views) in step.
+    """
+    router = APIRouter(prefix=path)
+    conflict_detail = conflict_detail or f"{label} already exists"
+
+    def service(collections) -> CrudService:
+        return CrudService(collections[collection_name], label)
+
+    async def written(collections, doc):
+        query_cache.invalidate(collection_name)
+        if indexer:
+            indexer(doc)
+        if after_write:
+            await after_write(collections, [doc], [])
+
+    @router.get("", response_model=List[model])
+    async def list_items(
+        request: Request,
+        collections: Collections,
+        limit: int = Query(100, ge=1, le=500),
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+    ):
+        projection = parse_fields(fields, model, sort_key)
+        docs, next_cursor = await fetch_page(collections[collection_name], {}, sort_key, limit, cursor, projection)
+        return json_response(request, encode_page(docs, next_cursor, model, fields))
+
+    @router.post("/batch")
+    async def batch_items(batch: BatchRequest, collections: Collections):
+        """
+        Apply many create/update/delete operations with a single bulk_write.
+        Returns a result per operation, in request order.
+        """
+        collection = collections[collection_name]
+        result = await run_batch(collection, batch, create_model, update_model, prepare_create, prepare_update)
+        query_cache.invalidate(collection_name)
+        if indexer or after_write:
+            deleted = result.ids("deleted")
+            ids = result.ids("created", "updated")
+            docs = await collection.find({"_id": {"$in": ids}}).to_list(None) if ids else []
+            if indexer:
+                for oid in deleted:
+                    search_index.remove(search_kind, str(oid))
+                for doc in docs:
+                    indexer(doc)
+            if after_write:
+                await after_write(collections, docs, deleted)
+        return result.to_dict()
+
+    @router.get("/{item_id}", response_model=model)
+    async def get_item(item_id: str, response: Response, collections: Collections):
+        """
+        The item, with `ETag: "<version>"`. Send that ETag back as
+        If-Match on PUT/DELETE to apply the write only if the item is
+        unchanged (412 otherwise); `If-Match: *` only requires it to exist.
+        """
+        doc = await collections[collection_name].find_one({"_id": ensure_oid(item_id)})
+        if not doc:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        response.headers["ETag"] = version_etag(doc)
+        return doc
+
+    @router.post("", response_model=model)
+    async def create_item(item: create_model, response: Response, collections: Collections):
+        """Create the item; the response carries its ETag, as GET does."""
+        data = item.model_dump()
+        if prepare_create:
+            prepare_create(data)
+        try:
+            created = await service(collections).create(data)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail=conflict_detail)
+        await written(collections, created)
+        response.headers["ETag"] = version_etag(created)
+        return created
+
+    @router.put("/{item_id}", response_model=model)
+    async def update_item(item_id: str, update_data: update_model, response: Response, collections: Collections, if_match: Optional[str] = Header(None)):
+        """
+        Apply the set fields. With If-Match (an ETag from GET, POST or a
+        previous PUT, or `*`) the write is conditional, see get_item. The
+        response carries the new ETag for the next write.
+        """
+        update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
+        if prepare_update:
+            prepare_update(update_dict)
+        try:
+            updated = await service(collections).update_by_id(ensure_oid(item_id), update_dict, parse_if_match(if_match))
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail=conflict_detail)
+        await written(collections, updated)
+        response.headers["ETag"] = version_etag(updated)
+        return updated
+
+    @router.delete("/{item_id}")
+    async def delete_item(item_id: str, collections: Collections, if_match: Optional[str] = Header(None)):
+        oid = ensure_oid(item_id)
+        await service(collections).delete_by_id(oid, parse_if_match(if_match))
+        query_cache.invalidate(collection_name)
+        if indexer:
+            search_index.remove(search_kind, item_id)
+        if after_write:
+            await after_write(collections, [], [oid])
+        return {"message": f"{label} deleted successfully"}
+
+    return router
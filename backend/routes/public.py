@@ -1,148 +1,316 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import List, Optional
-from database import get_collection
+from dependencies import ReadCollections
 from models.personal import PersonalInfo
 from models.project import Project
 from models.experience import Experience
 from models.skill import Skill, SkillsGrouped
 from models.education import Education
 from models.certification import Certification
-from models.blog import BlogPost
+from models.blog import BlogPost, BlogPostSummary
 from models.testimonial import Testimonial
 from models.contact import ContactMessage, ContactMessageCreate
+from models.views import PageView, ViewCount
+from services.cache import query_cache
+from services.contact_queue import ContactQueueFull, contact_queue
+from services.search import search_index
+from services.views import page_route, view_counter, visitor_id
+from services.rendering import needs_render, render_post
+from services.skills import load_skill_groups
+from services.responses import EncodedResponse, encode_json, encode_trusted, json_response
+from services.pagination import encode_page, fetch_page, fields_key, model_projection, parse_fields
 from bson import ObjectId
 from datetime import datetime
+import asyncio
+from functools import partial
 
 router = APIRouter(prefix="/api", tags=["public"])
 
-# Helper function to convert ObjectId to string
-def serialize_doc(doc):
-    if doc and "_id" in doc:
-        doc["_id"] = str(doc["_id"])
-    return doc
+# ---------- Loaders ----------
+# Each loader runs the Mongo query and encodes the response body once; the
+# result is cached until an admin write invalidates the collection.
+async def load_personal_info(collection):
+    personal = await collection.find_one()
+    if not personal:
+        return None
+    return encode_json(personal, PersonalInfo)
+
+async def load_page(collection, model, sort_key, query, limit, cursor=None, fields=None):
+    """Load one keyset-paginated page, optionally projected to `fields`."""
+    projection = parse_fields(fields, model, sort_key)
+    docs, next_cursor = await fetch_page(collection, query, sort_key, limit, cursor, projection or model_projection(model))
+    return encode_page(docs, next_cursor, model, fields)
+
+def page_key(limit, cursor=None, fields=None):
+    return ("page", limit, cursor, fields_key(fields))
+
+async def load_projects(collection, limit=100, cursor=None, fields=None):
+    return await load_page(collection, Project, "created_at", {}, limit, cursor, fields)
+
+async def load_project(collection, project_id: str):
+    project = await collection.find_one({"_id": ObjectId(project_id)})
+    if not project:
+        return None
+    return encode_json(project, Project)
+
+async def load_featured_projects(collection):
+    projects = await collection.find({"status": "completed"}).sort("created_at", -1).limit(6).to_list(6)
+    return encode_trusted(projects, Project)
+
+async def load_experience(collection, limit=100, cursor=None, fields=None):
+    return await load_page(collection, Experience, "start_date", {}, limit, cursor, fields)
+
+async def load_skills(collection):
+    return await load_skill_groups(collection)
+
+async def load_education(collection, limit=100, cursor=None, fields=None):
+    return await load_page(collection, Education, "start_date", {}, limit, cursor, fields)
+
+async def load_certifications(collection, limit=100, cursor=None, fields=None):
+    return await load_page(collection, Certification, "date", {}, limit, cursor, fields)
+
+async def load_blog_posts(collection, limit=50, cursor=None, fields=None):
+    return await load_page(collection, BlogPostSummary, "published_at", {"status": "published"}, limit, cursor, fields)
+
+async def load_blog_post(collection, slug: str):
+    post = await collection.find_one({"slug": slug, "status": "published"})
+    if not post:
+        return None
+    if needs_render(post):
+        # Posts written before pre-rendering: render for this response only.
+        # Reads never write; rerender_posts.py stores the artifact.
+        post.update(render_post(post["content"]))
+    return encode_json(post, BlogPost)
+
+async def load_featured_blog_posts(collection):
+    query = {"featured": True, "status": "published"}
+    posts = await collection.find(query, model_projection(BlogPostSummary)).sort("published_at", -1).limit(10).to_list(10)
+    return encode_trusted(posts, BlogPostSummary)
+
+async def load_testimonials(collection, limit=100, cursor=None, fields=None):
+    return await load_page(collection, Testimonial, "created_at", {}, limit, cursor, fields)
+
+# Home page sections served by /bootstrap: name -> (collection, cache key, loader)
+BOOTSTRAP_SECTIONS = {
+    "personal": ("personal_info", "one", load_personal_info),
+    "projects": ("projects", "featured", load_featured_projects),
+    "skills": ("skill_categories", "grouped", load_skills),
+    "experience": ("experiences", page_key(100), load_experience),
+    "testimonials": ("testimonials", page_key(100), load_testimonials),
+    "blog": ("blog_posts", "featured", load_featured_blog_posts),
+}
+
+query_cache.depend("bootstrap", *{collection for collection, _, _ in BOOTSTRAP_SECTIONS.values()})
+
+def splice_sections(names, encoded):
+    """Join already encoded section bodies into one object instead of re-encoding them."""
+    body = b"{" + b",".join(
+        b'"' + name.encode() + b'":' + (section.body if section else b"null")
+        for name, section in zip(names, encoded)
+    ) + b"}"
+    return EncodedResponse(body)
+
+# Bootstrap
+@router.get("/bootstrap")
+async def get_bootstrap(request: Request, collections: ReadCollections, sections: Optional[str] = None):
+    """
+    Everything the home page needs in one round trip. `sections` is a comma
+    separated subset of BOOTSTRAP_SECTIONS; all sections are returned by default.
+    """
+    requested = [name.strip() for name in sections.split(",") if name.strip()] if sections else list(BOOTSTRAP_SECTIONS)
+    unknown = [name for name in requested if name not in BOOTSTRAP_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections: {', '.join(unknown)}")
+    # Canonical order, so at most one cache entry per subset of sections.
+    names = tuple(name for name in BOOTSTRAP_SECTIONS if name in requested)
 
-def serialize_docs(docs):
-    return [serialize_doc(doc) for doc in docs]
+    async def load_bootstrap():
+        loads = []
+        for name in names:
+            collection, key, load = BOOTSTRAP_SECTIONS[name]
+            loads.append(query_cache.get_or_load(collection, key, partial(load, collections[collection])))
+        return splice_sections(names, await asyncio.gather(*loads))
+
+    # The spliced body is cached too (with its compressed variants); any
+    # section's collection invalidates it, see query_cache.depend below.
+    encoded = await query_cache.get_or_load("bootstrap", names, load_bootstrap)
+    return json_response(request, encoded, cached=True)
 
 # Personal Information
 @router.get("/personal", response_model=PersonalInfo)
-async def get_personal_info():
-    collection = await get_collection("personal_info")
-    personal = await collection.find_one()
-    if not personal:
+async def get_personal_info(request: Request, collections: ReadCollections):
+    encoded = await query_cache.get_or_load("personal_info", "one", lambda: load_personal_info(collections["personal_info"]))
+    if not encoded:
         raise HTTPException(status_code=404, detail="Personal information not found")
-    return serialize_doc(personal)
+    return json_response(request, encoded, cached=True)
 
 # Projects
 @router.get("/projects", response_model=List[Project])
-async def get_projects():
-    collection = await get_collection("projects")
-    projects = await collection.find().sort("created_at", -1).to_list(100)
-    return serialize_docs(projects)
+async def get_projects(
+    request: Request,
+    collections: ReadCollections,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    encoded = await query_cache.get_or_load(
+        "projects", page_key(limit, cursor, fields), lambda: load_projects(collections["projects"], limit, cursor, fields)
+    )
+    return json_response(request, encoded, cached=True)
+
+@router.get("/projects/featured", response_model=List[Project])
+async def get_featured_projects(request: Request, collections: ReadCollections):
+    encoded = await query_cache.get_or_load("projects", "featured", lambda: load_featured_projects(collections["projects"]))
+    return json_response(request, encoded, cached=True)
 
 @router.get("/projects/{project_id}", response_model=Project)
-async def get_project_by_id(project_id: str):
-    collection = await get_collection("projects")
+async def get_project_by_id(request: Request, collections: ReadCollections, project_id: str):
     if not ObjectId.is_valid(project_id):
         raise HTTPException(status_code=400, detail="Invalid project ID")
-    
-    project = await collection.find_one({"_id": ObjectId(project_id)})
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return serialize_doc(project)
 
-@router.get("/projects/featured", response_model=List[Project])
-async def get_featured_projects():
-    collection = await get_collection("projects")
-    projects = await collection.find({"status": "completed"}).sort("created_at", -1).limit(6).to_list(6)
-    return serialize_docs(projects)
+    encoded = await query_cache.get_or_load("projects", ("id", project_id), lambda: load_project(collections["projects"], project_id))
+    if not encoded:
+        raise HTTPException(status_code=404, detail="Project not found")
+    view_counter.record("project", project_id, visitor_id(request.scope))
+    return json_response(request, encoded, cached=True)
 
 # Experience
 @router.get("/experience", response_model=List[Experience])
-async def get_experience():
-    collection = await get_collection("experiences")
-    experiences = await collection.find().sort("start_date", -1).to_list(100)
-    return serialize_docs(experiences)
+async def get_experience(
+    request: Request,
+    collections: ReadCollections,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    encoded = await query_cache.get_or_load(
+        "experiences", page_key(limit, cursor, fields), lambda: load_experience(collections["experiences"], limit, cursor, fields)
+    )
+    return json_response(request, encoded, cached=True)
 
 # Skills
-@router.get("/skills")
-async def get_skills():
-    collection = await get_collection("skills")
-    skills = await collection.find().to_list(1000)
-    
-    # Group skills by category
-    technical_skills = {}
-    soft_skills = ["Problem Solving", "Team Collaboration", "Critical Thinking", "Communication", "Leadership", "Agile Development"]
-    
-    for skill in skills:
-        category = skill["category"]
-        if category not in technical_skills:
-            technical_skills[category] = []
-        technical_skills[category].append({
-            "name": skill["name"],
-            "level": skill["level"]
-        })
-    
-    return {
-        "technical": technical_skills,
-        "soft": soft_skills
-    }
+@router.get("/skills", response_model=SkillsGrouped)
+async def get_skills(request: Request, collections: ReadCollections):
+    encoded = await query_cache.get_or_load("skill_categories", "grouped", lambda: load_skills(collections["skill_categories"]))
+    return json_response(request, encoded, cached=True)
 
 # Education
 @router.get("/education", response_model=List[Education])
-async def get_education():
-    collection = await get_collection("education")
-    education = await collection.find().sort("start_date", -1).to_list(100)
-    return serialize_docs(education)
+async def get_education(
+    request: Request,
+    collections: ReadCollections,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    encoded = await query_cache.get_or_load(
+        "education", page_key(limit, cursor, fields), lambda: load_education(collections["education"], limit, cursor, fields)
+    )
+    return json_response(request, encoded, cached=True)
 
 # Certifications
 @router.get("/certifications", response_model=List[Certification])
-async def get_certifications():
-    collection = await get_collection("certifications")
-    certifications = await collection.find().sort("date", -1).to_list(100)
-    return serialize_docs(certifications)
+async def get_certifications(
+    request: Request,
+    collections: ReadCollections,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    encoded = await query_cache.get_or_load(
+        "certifications", page_key(limit, cursor, fields), lambda: load_certifications(collections["certifications"], limit, cursor, fields)
+    )
+    return json_response(request, encoded, cached=True)
 
 # Blog
-@router.get("/blog", response_model=List[BlogPost])
-async def get_blog_posts(limit: Optional[int] = 50):
-    collection = await get_collection("blog_posts")
-    posts = await collection.find({"status": "published"}).sort("published_at", -1).limit(limit).to_list(limit)
-    return serialize_docs(posts)
+@router.get("/blog", response_model=List[BlogPostSummary])
+async def get_blog_posts(
+    request: Request,
+    collections: ReadCollections,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    encoded = await query_cache.get_or_load(
+        "blog_posts", page_key(limit, cursor, fields), lambda: load_blog_posts(collections["blog_posts"], limit, cursor, fields)
+    )
+    return json_response(request, encoded, cached=True)
+
+@router.get("/blog/featured", response_model=List[BlogPostSummary])
+async def get_featured_blog_posts(request: Request, collections: ReadCollections):
+    encoded = await query_cache.get_or_load("blog_posts", "featured", lambda: load_featured_blog_posts(collections["blog_posts"]))
+    return json_response(request, encoded, cached=True)
 
 @router.get("/blog/{slug}", response_model=BlogPost)
-async def get_blog_post_by_slug(slug: str):
-    collection = await get_collection("blog_posts")
-    post = await collection.find_one({"slug": slug, "status": "published"})
-    if not post:
+async def get_blog_post_by_slug(request: Request, collections: ReadCollections, slug: str):
+    encoded = await query_cache.get_or_load("blog_posts", ("slug", slug), lambda: load_blog_post(collections["blog_posts"], slug))
+    if not encoded:
         raise HTTPException(status_code=404, detail="Blog post not found")
-    return serialize_doc(post)
-
-@router.get("/blog/featured", response_model=List[BlogPost])
-async def get_featured_blog_posts():
-    collection = await get_collection("blog_posts")
-    posts = await collection.find({"featured": True, "status": "published"}).sort("published_at", -1).limit(10).to_list(10)
-    return serialize_docs(posts)
+    view_counter.record("post", slug, visitor_id(request.scope))
+    return json_response(request, encoded, cached=True)
 
 # Testimonials
 @router.get("/testimonials", response_model=List[Testimonial])
-async def get_testimonials():
-    collection = await get_collection("testimonials")
-    testimonials = await collection.find().sort("created_at", -1).to_list(100)
-    return serialize_docs(testimonials)
+async def get_testimonials(
+    request: Request,
+    collections: ReadCollections,
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    encoded = await query_cache.get_or_load(
+        "testimonials", page_key(limit, cursor, fields), lambda: load_testimonials(collections["testimonials"], limit, cursor, fields)
+    )
+    return json_response(request, encoded, cached=True)
+
+# Search
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(post|project)$"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Ranked search over published blog posts and projects, served from memory."""
+    return {"query": q, "results": search_index.search(q, limit=limit, kind=type)}
+
+# Views
+@router.post("/views", status_code=204)
+async def record_page_view(request: Request, view: PageView):
+    """Page view beacon from the frontend; counted in memory, flushed in batches."""
+    page = page_route(view.page)
+    if page is None:
+        raise HTTPException(status_code=422, detail="Unknown page")
+    view_counter.record("page", page, visitor_id(request.scope))
+    return Response(status_code=204)
+
+@router.get("/views/most-viewed", response_model=List[ViewCount])
+async def get_most_viewed(
+    kind: str = Query("project", pattern="^(project|post|page)$"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Most viewed projects, posts or pages, served from memory."""
+    return view_counter.most_viewed(kind, limit)
 
 # Contact
-@router.post("/contact")
+@router.post("/contact", status_code=202)
 async def submit_contact_message(message: ContactMessageCreate):
-    collection = await get_collection("contact_messages")
-    
-    message_data = message.dict()
+    message_data = message.model_dump()
+    now = datetime.utcnow()
     message_data["status"] = "new"
-    message_data["created_at"] = datetime.utcnow()
-    message_data["updated_at"] = datetime.utcnow()
-    
-    result = await collection.insert_one(message_data)
-    
+    message_data["created_at"] = now
+    message_data["updated_at"] = now
+
+    # Accepted into the write-behind queue; stored in Mongo by the next flush.
+    try:
+        message_id = contact_queue.submit(message_data)
+    except ContactQueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many messages right now, please try again shortly",
+            headers={"Retry-After": "5"},
+        )
+
     return {
         "message": "Contact message submitted successfully",
-        "id": str(result.inserted_id)
-    }
\ No newline at end of file
+        "id": str(message_id)
+    }
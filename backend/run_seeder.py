@@ -1,11 +1,13 @@
 import asyncio
+import sys
 from services.data_seeder import seed_database
 from database import connect_to_mongo, close_mongo_connection
 
 async def main():
     print("🌱 Starting database seeding...")
     await connect_to_mongo()
-    await seed_database()
+    # --force re-applies the seed even if its version marker is current
+    await seed_database(force="--force" in sys.argv)
     await close_mongo_connection()
     print("✅ Database seeding completed!")
 
@@ -1,11 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database import connect_to_mongo, close_mongo_connection
+from database import connect_to_mongo, close_mongo_connection, database
+from dependencies import init_collection_handles
 from routes.public import router as public_router
 from routes.admin import router as admin_router
-from services.data_seeder import seed_database
+from services.data_seeder import seed_database, seed_in_background
+from services.cache import query_cache
+from services.indexes import ensure_indexes
+from services.contact_queue import contact_queue
+from services.rate_limit import RateLimit, RateLimitMiddleware, RouteLimit
+from services.search import rebuild_search_index
+from services.skills import ensure_skill_categories
+from services.views import view_counter
+from services.invalidation import SearchIndexSubscriber, create_watcher, invalidate_query_cache, invalidation_bus
+from services.responses import ORJSONResponse
+from services.compression import CompressionMiddleware, compressor
+from services.metrics import CONTENT_TYPE, MetricsMiddleware, http_metrics, render_metrics
+import asyncio
 import logging
+import os
 
 # Configure logging
 logging.basicConfig(
@@ -14,18 +28,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def seed_and_reindex(app: FastAPI):
+    # The search index is built before a background seed finishes; refresh it
+    # if the seed changed anything.
+    if await seed_in_background():
+        await rebuild_search_index(app.state.collections)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up...")
     await connect_to_mongo()
-    await seed_database()
+    init_collection_handles(app, database)
+    await ensure_indexes()
+    await ensure_skill_categories(app.state.collections["skills"], app.state.collections["skill_categories"])
+    await contact_queue.start(app.state.collections["contact_messages"])
+    await view_counter.start(app.state.collections["view_counts"])
+
+    # SEED_ON_STARTUP: "background" (default) seeds without delaying startup,
+    # "blocking" waits for the seed before serving, "off" skips it.
+    seed_mode = os.environ.get("SEED_ON_STARTUP", "background").lower()
+    seed_task = None
+    if seed_mode == "blocking":
+        await seed_database()
+    await rebuild_search_index(app.state.collections)
+    if seed_mode not in ("blocking", "off"):
+        seed_task = asyncio.create_task(seed_and_reindex(app))
+
+    # Changes written by any replica invalidate this replica's cache and
+    # search index (CACHE_INVALIDATION_MODE: auto, poll or off).
+    invalidation_bus.subscribe(invalidate_query_cache)
+    invalidation_bus.subscribe(SearchIndexSubscriber(app.state.collections))
+    app.state.change_watcher = create_watcher(database.database)
+    app.state.change_watcher.start()
     logger.info("Application started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    if seed_task and not seed_task.done():
+        seed_task.cancel()
+    await app.state.change_watcher.stop()
+    await contact_queue.stop()
+    await view_counter.stop()
     await close_mongo_connection()
     logger.info("Application shutdown complete")
 
@@ -34,7 +80,24 @@ app = FastAPI(
     title="Aftab Pathan Portfolio API",
     description="Backend API for Aftab Pathan's portfolio website",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Per-route abuse limits, answered before the request reaches a handler.
+# Added before CORS so rejections still carry CORS headers.
+app.add_middleware(
+    RateLimitMiddleware,
+    limits={
+        ("POST", "/api/contact"): RouteLimit(
+            per_ip=RateLimit.parse(os.environ.get("CONTACT_RATE_LIMIT_IP", "5/60")),
+            per_email=RateLimit.parse(os.environ.get("CONTACT_RATE_LIMIT_EMAIL", "3/300")),
+            duplicate_window=float(os.environ.get("CONTACT_DUPLICATE_WINDOW_SECONDS", "600")),
+        ),
+        ("POST", "/api/views"): RouteLimit(
+            per_ip=RateLimit.parse(os.environ.get("VIEW_RATE_LIMIT_IP", "60/60")),
+        ),
+    },
 )
 
 # CORS middleware
@@ -44,8 +107,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# Compresses everything not already served pre-compressed by json_response
+# (whose cached bodies keep their gzip/brotli variants).
+app.add_middleware(CompressionMiddleware, compressor=compressor)
+
+# Outermost, so rate limited and CORS preflight responses are counted too.
+app.add_middleware(MetricsMiddleware, metrics=http_metrics)
+
 # Include routers
 app.include_router(public_router)
 app.include_router(admin_router)
@@ -55,6 +126,51 @@ app.include_router(admin_router)
 async def health_check():
     return {"status": "healthy", "message": "Aftab Pathan Portfolio API is running"}
 
+# Read-through cache counters for monitoring
+@app.get("/health/cache")
+async def cache_stats():
+    return query_cache.stats()
+
+# MongoDB connection pool counters (checkouts, wait times, open connections)
+@app.get("/health/db")
+async def db_pool_stats():
+    return database.pool_metrics.snapshot()
+
+# Contact write-behind queue depth and flush counters
+@app.get("/health/contact-queue")
+async def contact_queue_stats():
+    return contact_queue.stats()
+
+# View counter buffer and flush counters
+@app.get("/health/views")
+async def view_counter_stats():
+    return view_counter.stats()
+
+# Cross-replica invalidation watcher state (change stream or polling)
+@app.get("/health/invalidation")
+async def invalidation_stats():
+    watcher = getattr(app.state, "change_watcher", None)
+    return watcher.stats() if watcher else {"mode": "off", "active": None}
+
+# Response compression counters (bytes in/out, cached variant hits)
+@app.get("/health/compression")
+async def compression_stats():
+    return compressor.stats()
+
+# Prometheus scrape endpoint: per-route latency, per-collection Mongo timing,
+# plus the pool, cache and contact queue counters above.
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body = render_metrics(
+        database.command_metrics,
+        pool=database.pool_metrics.snapshot(),
+        cache=query_cache.stats(),
+        contact_queue=contact_queue.stats(),
+        compression=compressor.stats(),
+        views=view_counter.stats(),
+    )
+    return Response(content=body, media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("server:app", host="0.0.0.0", port=8001, reload=True)
\ No newline at end of file
@@ -0,0 +1,166 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Literal, Optional, Type
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pydantic import BaseModel, Field, ValidationError
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from services.crud import to_mongo
+
+MAX_BATCH_OPERATIONS = 1000
+
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class BatchRequest(BaseModel):
+    ordered: bool = True
+    operations: List[BatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class BatchResult:
+    """Per-item outcome of a batch plus the ids that were written."""
+
+    def __init__(self, ordered: bool, results: List[Dict[str, Any]], written: Optional[Dict[str, int]] = None):
+        self.ordered = ordered
+        self.results = results
+        self.written = written or {"inserted": 0, "matched": 0, "modified": 0, "deleted": 0}
+
+    def ids(self, *statuses: str) -> List[ObjectId]:
+        return [ObjectId(item["id"]) for item in self.results if item["status"] in statuses]
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for item in self.results:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return {"ordered": self.ordered, "counts": counts, "written": self.written, "results": self.results}
+
+
+def _validate(
+    operations: List[BatchOperation],
+    create_model: Optional[Type[BaseModel]],
+    update_model: Optional[Type[BaseModel]],
+) -> List[Dict[str, Any]]:
+    """Validate every operation up front; any invalid item rejects the whole batch (422)."""
+    validated, errors = [], []
+    for index, operation in enumerate(operations):
+        try:
+            if operation.op != "create":
+                if not operation.id or not ObjectId.is_valid(operation.id):
+                    raise ValueError("Invalid ID")
+            if operation.op == "create":
+                if create_model is None:
+                    raise ValueError("create is not supported for this collection")
+                data = create_model(**(operation.data or {})).model_dump()
+            elif operation.op == "update":
+                if update_model is None:
+                    raise ValueError("update is not supported for this collection")
+                data = {k: v for k, v in update_model(**(operation.data or {})).model_dump().items() if v is not None}
+            else:
+                data = None
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.errors(include_url=False, include_context=False)})
+            continue
+        except ValueError as e:
+            errors.append({"index": index, "errors": [{"msg": str(e)}]})
+            continue
+        validated.append({"op": operation.op, "id": operation.id, "data": data})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return validated
+
+
+async def run_batch(
+    collection,
+    request: BatchRequest,
+    create_model: Optional[Type[BaseModel]],
+    update_model: Optional[Type[BaseModel]],
+    prepare_create: Optional[Callable[[Dict[str, Any]], None]] = None,
+    prepare_update: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> BatchResult:
+    """
+    Validate the operations with the resource's Create/Update models and run
+    them as a single bulk_write. Updates and deletes of ids that do not exist
+    are reported as not_found: existence is checked with one query up front
+    and then followed through the batch, so operations after a delete of the
+    same id are not_found too. After the first write error of an ordered
+    batch the remaining items are skipped. `written` holds the counts the
+    server reported; updates it did not match (documents deleted by someone
+    else meanwhile) are re-checked and reported as not_found.
+    """
+    operations = _validate(request.operations, create_model, update_model)
+    now = datetime.utcnow()
+
+    targets = [ObjectId(op["id"]) for op in operations if op["op"] != "create"]
+    existing = set()
+    if targets:
+        existing = {doc["_id"] async for doc in collection.find({"_id": {"$in": targets}}, {"_id": 1})}
+
+    results: List[Dict[str, Any]] = []
+    requests, request_items = [], []
+    for index, op in enumerate(operations):
+        item = {"index": index, "op": op["op"], "id": op["id"]}
+        results.append(item)
+        if op["op"] == "create":
+            data = op["data"]
+            if prepare_create:
+                prepare_create(data)
+            to_mongo(data)
+            data["_id"] = ObjectId()
+            data["created_at"] = now
+            data["updated_at"] = now
+            data["version"] = 1
+            item["id"] = str(data["_id"])
+            requests.append(InsertOne(data))
+        elif ObjectId(op["id"]) not in existing:
+            item["status"] = "not_found"
+            continue
+        elif op["op"] == "update":
+            data = op["data"]
+            if prepare_update:
+                prepare_update(data)
+            to_mongo(data)
+            data["updated_at"] = now
+            requests.append(UpdateOne({"_id": ObjectId(op["id"])}, {"$set": data, "$inc": {"version": 1}}))
+        else:
+            existing.discard(ObjectId(op["id"]))
+            requests.append(DeleteOne({"_id": ObjectId(op["id"])}))
+        item["status"] = {"create": "created", "update": "updated", "delete": "deleted"}[op["op"]]
+        request_items.append(item)
+
+    written = {"inserted": 0, "matched": 0, "modified": 0, "deleted": 0}
+    if requests:
+        try:
+            details = (await collection.bulk_write(requests, ordered=request.ordered)).bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            failed = {error["index"]: error for error in details.get("writeErrors", [])}
+            for position, item in enumerate(request_items):
+                if position in failed:
+                    item["status"] = "error"
+                    item["error"] = failed[position].get("errmsg")
+                elif request.ordered and failed and position > min(failed):
+                    item["status"] = "skipped"
+        written = {
+            "inserted": details.get("nInserted", 0),
+            "matched": details.get("nMatched", 0),
+            "modified": details.get("nModified", 0),
+            "deleted": details.get("nRemoved", 0),
+        }
+        updated = [item for item in request_items if item["status"] == "updated"]
+        if written["matched"] < len(updated):
+            # Ids this batch deleted afterwards are gone for a known reason.
+            deleted = {item["id"] for item in request_items if item["status"] == "deleted"}
+            updated = [item for item in updated if item["id"] not in deleted]
+            ids = [ObjectId(item["id"]) for item in updated]
+            remaining = {doc["_id"] async for doc in collection.find({"_id": {"$in": ids}}, {"_id": 1})}
+            for item in updated:
+                if ObjectId(item["id"]) not in remaining:
+                    item["status"] = "not_found"
+
+    return BatchResult(request.ordered, results, written)
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set, Tuple
+
+_MISSING = object()
+
+
+class QueryCache:
+    """
+    In-process read-through cache for public reads.
+
+    Entries are keyed by (collection, query key), expire after `ttl_seconds`
+    and are evicted least-recently-used once `max_entries` is reached.
+    Writers call `invalidate(collection)`; a per-collection generation number
+    makes sure a load that started before the write never gets stored.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, collection: str, key: Hashable = None):
+        """Return the cached value or `_MISSING`, counting the hit/miss."""
+        entry_key = (collection, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return value
+            del self._entries[entry_key]
+        self.misses += 1
+        return _MISSING
+
+    def set(self, collection: str, key: Hashable, value: Any):
+        entry_key = (collection, key)
+        self._entries[entry_key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, collection: str, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        """
+        Return the cached value for (collection, key), calling `loader` on a miss.
+        Concurrent misses for the same key share a single load. The load runs
+        in its own task, so a caller that is cancelled (client gone) neither
+        cancels the load nor the other callers waiting on it.
+        """
+        value = self.get(collection, key)
+        if value is not _MISSING:
+            return value
+
+        entry_key = (collection, key)
+        pending = self._inflight.get(entry_key)
+        if pending is None:
+            generation = self._generations.get(collection, 0)
+            pending = asyncio.ensure_future(self._load(collection, key, loader, generation))
+            # A failed load nobody is still waiting for must not log "never retrieved".
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._inflight[entry_key] = pending
+        return await asyncio.shield(pending)
+
+    async def _load(self, collection: str, key: Hashable, loader: Callable[[], Awaitable[Any]], generation: int):
+        entry_key = (collection, key)
+        try:
+            value = await loader()
+            if self._generations.get(collection, 0) == generation:
+                self.set(collection, key, value)
+            return value
+        finally:
+            if self._inflight.get(entry_key) is asyncio.current_task():
+                del self._inflight[entry_key]
+
+    def depend(self, namespace: str, *collections: str):
+        """Invalidate `namespace` (e.g. a response built from several collections) with any of `collections`."""
+        for collection in collections:
+            self._dependents.setdefault(collection, set()).add(namespace)
+
+    def invalidate(self, *collections: str):
+        """Drop every entry (and in-flight load) belonging to the given collections and their dependents."""
+        collections = set(collections)
+        collections.update(*(self._dependents.get(collection, ()) for collection in list(collections)))
+        for collection in collections:
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+            for entry_key in [k for k in self._entries if k[0] == collection]:
+                del self._entries[entry_key]
+            for entry_key in [k for k in self._inflight if k[0] == collection]:
+                del self._inflight[entry_key]
+            self.invalidations += 1
+
+    def clear(self):
+        self.invalidate(*{k[0] for k in self._entries})
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+query_cache = QueryCache(
+    max_entries=int(os.environ.get("CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.environ.get("CACHE_TTL_SECONDS", "300")),
+)
@@ -0,0 +1,204 @@
+import asyncio
+import gzip
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding -> {coding: q}."""
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def coded_etag(etag: str, encoding: str) -> str:
+    """A strong ETag must differ per content-coding: "abc" -> "abc-gzip"."""
+    if etag.endswith('"'):
+        return etag[:-1] + "-" + encoding + '"'
+    return etag
+
+
+def strip_coding(etag: str) -> str:
+    for encoding in ("gzip", "br"):
+        suffix = "-" + encoding + '"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+class Compressor:
+    """
+    Compresses response bodies with the best coding the client accepts.
+
+    Bodies under `min_size` are sent as-is (the headers would cost more than
+    the saving). Bodies of `thread_size` or more are compressed on the
+    default thread pool so the event loop keeps serving; zlib and brotli
+    release the GIL while they work. Pre-encoded cacheable responses keep
+    their compressed variants on the EncodedResponse (`variant()`), so each
+    body version is compressed once, at a higher level, not once per request.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1024,
+        thread_size: int = 64 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cached_gzip_level: int = 9,
+        cached_brotli_quality: int = 9,
+    ):
+        self.min_size = min_size
+        self.thread_size = thread_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.cached_levels = {"gzip": cached_gzip_level, "br": cached_brotli_quality}
+        # Preferred first.
+        self.encodings: Tuple[str, ...] = ("br", "gzip") if brotli else ("gzip",)
+        self.compressed = 0
+        self.offloaded = 0
+        self.variant_hits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = accepted.get(encoding, wildcard)
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    @staticmethod
+    def _compress(body: bytes, encoding: str, level: int) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=level)
+        return gzip.compress(body, compresslevel=level, mtime=0)
+
+    async def compress(self, body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+        level = self.levels[encoding] if level is None else level
+        if len(body) >= self.thread_size:
+            self.offloaded += 1
+            loop = asyncio.get_running_loop()
+            compressed = await loop.run_in_executor(None, self._compress, body, encoding, level)
+        else:
+            compressed = self._compress(body, encoding, level)
+        self.compressed += 1
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    async def variant(self, encoded, encoding: str) -> bytes:
+        """`encoded.body` compressed with `encoding`, computed once per EncodedResponse."""
+        compressed = encoded.variants.get(encoding)
+        if compressed is not None:
+            self.variant_hits += 1
+            return compressed
+        compressed = await self.compress(encoded.body, encoding, self.cached_levels[encoding])
+        # Concurrent first requests may both compress; either result is fine.
+        return encoded.variants.setdefault(encoding, compressed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "encodings": list(self.encodings),
+            "min_size": self.min_size,
+            "compressed": self.compressed,
+            "offloaded": self.offloaded,
+            "variant_hits": self.variant_hits,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+
+def vary_on_encoding(headers: MutableHeaders):
+    if "accept-encoding" not in headers.get("vary", "").lower():
+        headers.add_vary_header("Accept-Encoding")
+
+
+def apply_encoding(headers: MutableHeaders, encoding: str, length: int):
+    headers["Content-Encoding"] = encoding
+    headers["Content-Length"] = str(length)
+    vary_on_encoding(headers)
+    if "etag" in headers:
+        headers["ETag"] = coded_etag(headers["etag"], encoding)
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing single-message responses of
+    compressible types. Streamed responses (exports) and responses that are
+    already encoded (pre-compressed EncodedResponse variants) pass through.
+    """
+
+    def __init__(self, app, compressor: Compressor):
+        self.app = app
+        self.compressor = compressor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.compressor.negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message  # held until we know whether the body is compressed
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            held, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(held["headers"]))
+            held["headers"] = headers.raw
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < self.compressor.min_size
+                or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(held)
+                await send(message)
+                return
+            compressed = await self.compressor.compress(body, encoding)
+            apply_encoding(headers, encoding, len(compressed))
+            await send(held)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+compressor = Compressor(
+    min_size=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024")),
+    thread_size=int(os.environ.get("COMPRESSION_THREAD_BYTES", str(64 * 1024))),
+    gzip_level=int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4")),
+)
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId, json_util
+from pymongo.errors import BulkWriteError
+
+try:
+    import fcntl
+except ImportError:  # not on Windows: other processes' spools are left alone there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+class ContactQueueFull(Exception):
+    """Raised by submit() when the queue is at capacity."""
+
+
+class ContactQueue:
+    """
+    Write-behind queue for contact messages.
+
+    submit() assigns the ObjectId, appends the message to a local spool file
+    and returns immediately. A background task writes pending messages with
+    insert_many once `batch_size` accumulate or every `flush_interval`
+    seconds, and rewrites the spool with whatever is still pending.
+
+    Each worker process spools to its own file next to `spool_path`
+    (contact_spool.<host>-<pid>.jsonl) and holds an exclusive lock on a matching
+    .lock file while it runs. On start() every spool whose lock can be taken
+    belongs to a process that is gone: it is replayed and removed. The
+    pre-assigned ids make replays idempotent.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        spool_path: Optional[Path] = None,
+        fsync: bool = False,
+    ):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.fsync = fsync
+        self._pending: List[Dict[str, Any]] = []
+        self._collection = None
+        self._spool = None
+        self._spool_file: Optional[Path] = None
+        self._lock = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.accepted = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    # ---------- Lifecycle ----------
+    async def start(self, collection):
+        self._collection = collection
+        if self.spool_path:
+            await self._claim_orphaned_spools()
+            self._spool_file = self.spool_path.with_name(f"{self.spool_path.stem}.{socket.gethostname()}-{os.getpid()}{self.spool_path.suffix}")
+            self._lock = _try_lock(_lock_path(self._spool_file))
+            if self._lock is None:
+                raise RuntimeError(f"Contact spool {self._spool_file} is locked by another process")
+            self._spool = open(self._spool_file, "a", encoding="utf-8")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and drain everything still pending."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._pending:
+            if not await self._flush():
+                logger.error(f"{len(self._pending)} contact messages left in spool on shutdown")
+                break
+        if self._spool:
+            self._spool.close()
+            self._spool = None
+            if not self._pending:
+                self._spool_file.unlink(missing_ok=True)
+            _unlock(self._lock, _lock_path(self._spool_file))
+            self._lock = None
+
+    # ---------- Producer ----------
+    def submit(self, message: Dict[str, Any]) -> ObjectId:
+        if len(self._pending) >= self.max_size:
+            self.rejected += 1
+            raise ContactQueueFull()
+        message["_id"] = ObjectId()
+        if self._spool:
+            self._spool.write(json_util.dumps(message) + "\n")
+            self._spool.flush()
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+        self._pending.append(message)
+        self.accepted += 1
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return message["_id"]
+
+    # ---------- Consumer ----------
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._pending:
+                if not await self._flush():
+                    break
+
+    async def _flush(self) -> bool:
+        """Insert one batch; returns False (keeping the batch) if the write failed."""
+        batch = self._pending[:self.batch_size]
+        try:
+            await self._insert(batch)
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error(f"Failed to flush {len(batch)} contact messages: {e}")
+            return False
+        del self._pending[:len(batch)]
+        self.flushed += len(batch)
+        self._rewrite_spool()
+        return True
+
+    async def _insert(self, docs: List[Dict[str, Any]]):
+        try:
+            await self._collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Already-written ids (from a replay or a retried batch) are fine.
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                raise
+
+    # ---------- Spool ----------
+    def _rewrite_spool(self):
+        if not self._spool:
+            return
+        self._spool.close()
+        tmp_path = self._spool_file.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            tmp.writelines(json_util.dumps(message) + "\n" for message in self._pending)
+            tmp.flush()
+            if self.fsync:
+                os.fsync(tmp.fileno())
+        # The lock lives on the .lock file, so replacing the spool keeps it.
+        os.replace(tmp_path, self._spool_file)
+        self._spool = open(self._spool_file, "a", encoding="utf-8")
+
+    async def _claim_orphaned_spools(self):
+        """Replay and remove the spools of processes that are gone (the legacy shared spool included)."""
+        if fcntl is None:
+            logger.warning("No file locking on this platform; not replaying other processes' contact spools")
+            return
+        pattern = f"{self.spool_path.stem}.*{self.spool_path.suffix}"
+        for spool_file in [self.spool_path, *sorted(self.spool_path.parent.glob(pattern))]:
+            lock_path = _lock_path(spool_file)
+            lock = _try_lock(lock_path)
+            if lock is None:
+                continue  # a live worker's spool
+            try:
+                await self._replay_spool(spool_file)
+            finally:
+                _unlock(lock, lock_path)
+
+    async def _replay_spool(self, spool_file: Path):
+        try:
+            with open(spool_file, encoding="utf-8") as spool:
+                docs = [json_util.loads(line) for line in spool if line.strip()]
+        except FileNotFoundError:
+            return  # claimed by another worker meanwhile
+        if docs:
+            for start in range(0, len(docs), self.batch_size):
+                await self._insert(docs[start:start + self.batch_size])
+            logger.info(f"Replayed {len(docs)} spooled contact messages from {spool_file.name}")
+        spool_file.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "max_size": self.max_size,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+def _lock_path(spool_file: Path) -> Path:
+    return spool_file.with_name(spool_file.name + ".lock")
+
+
+def _try_lock(lock_path: Path):
+    """An exclusively locked handle on `lock_path`, or None if another process holds it."""
+    while True:
+        handle = open(lock_path, "a")
+        if fcntl is None:
+            return handle
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return None
+        try:
+            current = os.stat(lock_path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and os.path.samestat(current, os.fstat(handle.fileno())):
+            return handle
+        # We locked a file its holder removed on release (see _unlock); the
+        # path now names a new file, or none. Try again on what is there now.
+        handle.close()
+
+
+def _unlock(handle, lock_path: Path):
+    # Removed while still held, so lock files do not pile up. A process that
+    # opened the old file meanwhile may still lock it, but _try_lock then
+    # sees that it is no longer the file at `lock_path` and lets it go.
+    lock_path.unlink(missing_ok=True)
+    handle.close()
+
+
+contact_queue = ContactQueue(
+    max_size=int(os.environ.get("CONTACT_QUEUE_MAX_SIZE", "1000")),
+    batch_size=int(os.environ.get("CONTACT_BATCH_SIZE", "50")),
+    flush_interval=float(os.environ.get("CONTACT_FLUSH_INTERVAL_SECONDS", "1.0")),
+    spool_path=Path(os.environ.get("CONTACT_SPOOL_PATH", Path(__file__).parent.parent / "contact_spool.jsonl")),
+    fsync=os.environ.get("CONTACT_SPOOL_FSYNC", "false").lower() == "true",
+)
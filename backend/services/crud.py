@@ -0,0 +1,113 @@
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+
+from services.compression import strip_coding
+
+
+def to_mongo(data: Dict[str, Any]) -> Dict[str, Any]:
+    """BSON has no date-only type; store `date` values as midnight datetimes."""
+    for key, value in data.items():
+        if isinstance(value, date) and not isinstance(value, datetime):
+            data[key] = datetime(value.year, value.month, value.day)
+    return data
+
+
+def version_etag(doc: Dict[str, Any]) -> str:
+    """The ETag admin item responses carry: the document version, `"3"`."""
+    return f'"{doc.get("version", 0)}"'
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[Tuple[int, ...]]:
+    """
+    The document versions an If-Match header accepts, or None when the
+    write does not depend on the version (no header, or `*`: any current
+    document). Tags are the `"3"` ETags of admin item responses, with any
+    content-coding suffix the compression middleware added. A well-formed
+    tag that names no version, such as a public route's content hash, can
+    never match, so the write fails with 412 rather than 400.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.isdigit():
+            # A bare version, as accepted before responses carried ETags.
+            versions.append(int(tag))
+            continue
+        if len(tag) < 2 or tag[0] != '"' or tag[-1] != '"':
+            raise HTTPException(status_code=400, detail="If-Match must be * or a list of entity tags")
+        value = strip_coding(tag)[1:-1]
+        if value.isdigit():
+            versions.append(int(value))
+    return tuple(versions)
+
+
+def _version_filter(expected_versions: Tuple[int, ...]) -> Dict[str, Any]:
+    # Documents written before versioning have no field; treat them as version 0.
+    accepted = list(expected_versions)
+    if 0 in accepted:
+        accepted.append(None)
+    return {"version": {"$in": accepted}}
+
+
+class CrudService:
+    """
+    Single-round-trip writes for one collection. Creates build the returned
+    document locally from the assigned id; updates use find_one_and_update so
+    the write and the read-back are one atomic operation. Every write bumps
+    `version`, and callers may pass `expected_versions` (from
+    parse_if_match) to reject the write (412) if the document changed since
+    they read it.
+    """
+
+    def __init__(self, collection, label: str):
+        self.collection = collection
+        self.label = label
+
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        doc = to_mongo(dict(data))
+        doc["_id"] = ObjectId()
+        doc["created_at"] = now
+        doc["updated_at"] = now
+        doc["version"] = 1
+        await self.collection.insert_one(doc)
+        return doc
+
+    async def update(self, query: Dict[str, Any], changes: Dict[str, Any], expected_versions: Optional[Tuple[int, ...]] = None, upsert: bool = False) -> Dict[str, Any]:
+        """Apply `$set: changes` to the document matching `query` and return it as updated."""
+        now = datetime.utcnow()
+        filter_ = dict(query)
+        if expected_versions is not None:
+            filter_.update(_version_filter(expected_versions))
+        update = {"$set": {**to_mongo(dict(changes)), "updated_at": now}, "$inc": {"version": 1}}
+        if upsert:
+            update["$setOnInsert"] = {"created_at": now}
+        doc = await self.collection.find_one_and_update(
+            filter_, update, return_document=ReturnDocument.AFTER, upsert=upsert
+        )
+        if doc is None:
+            if expected_versions is not None and await self.collection.count_documents(query, limit=1):
+                raise HTTPException(status_code=412, detail=f"{self.label} was modified by another request")
+            raise HTTPException(status_code=404, detail=f"{self.label} not found")
+        return doc
+
+    async def update_by_id(self, oid: ObjectId, changes: Dict[str, Any], expected_versions: Optional[Tuple[int, ...]] = None) -> Dict[str, Any]:
+        return await self.update({"_id": oid}, changes, expected_versions)
+
+    async def delete_by_id(self, oid: ObjectId, expected_versions: Optional[Tuple[int, ...]] = None):
+        filter_ = {"_id": oid}
+        if expected_versions is not None:
+            filter_.update(_version_filter(expected_versions))
+        result = await self.collection.delete_one(filter_)
+        if result.deleted_count == 0:
+            if expected_versions is not None and await self.collection.count_documents({"_id": oid}, limit=1):
+                raise HTTPException(status_code=412, detail=f"{self.label} was modified by another request")
+            raise HTTPException(status_code=404, detail=f"{self.label} not found")
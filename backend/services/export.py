@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from bson import ObjectId
+
+EXPORT_BATCH_SIZE = 500
+# Bytes buffered before a chunk is handed to the response.
+CHUNK_SIZE = 64 * 1024
+
+
+def _json_default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    if isinstance(value, (ObjectId, datetime, date)):
+        return _json_default(value)
+    return value
+
+
+async def _rows(cursor, fmt: str, columns: List[str]) -> AsyncIterator[str]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        async for doc in cursor:
+            writer.writerow([_csv_value(doc.get(column)) for column in columns])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+    else:
+        async for doc in cursor:
+            yield json.dumps(doc, default=_json_default, ensure_ascii=False) + "\n"
+
+
+async def stream_collection(collection, fmt: str, columns: List[str], compress: bool = False, query: Optional[Dict[str, Any]] = None) -> AsyncIterator[bytes]:
+    """
+    Yield a whole collection as NDJSON or CSV, one Motor batch at a time, in
+    CHUNK_SIZE pieces (gzip-compressed when `compress`). Memory use is bounded
+    by the batch size, not the collection size.
+    """
+    cursor = collection.find(query or {}).sort("_id", 1).batch_size(EXPORT_BATCH_SIZE)
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    pending: List[bytes] = []
+    pending_size = 0
+    async for row in _rows(cursor, fmt, columns):
+        data = row.encode()
+        if compressor:
+            data = compressor.compress(data)
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size >= CHUNK_SIZE:
+            yield b"".join(pending)
+            pending, pending_size = [], 0
+    if compressor:
+        pending.append(compressor.flush())
+    if pending:
+        yield b"".join(pending)
@@ -0,0 +1,147 @@
+from database import get_collection
+from services.invalidation import WATCHED_COLLECTIONS
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Declared indexes per collection. Every hot query in routes/ should be served
+# by one of these; add the index here in the same change that adds the query.
+INDEXES = {
+    "personal_info": [
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "projects": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("updated_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "experiences": [
+        IndexModel([("start_date", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "skills": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("category", ASCENDING), ("level", DESCENDING), ("name", ASCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "skill_categories": [
+        IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("skills._id", ASCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "education": [
+        IndexModel([("start_date", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "certifications": [
+        IndexModel([("date", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "testimonials": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "blog_posts": [
+        IndexModel([("slug", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING), ("published_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("featured", ASCENDING), ("status", ASCENDING), ("published_at", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+    "view_counts": [
+        IndexModel([("kind", ASCENDING), ("views", DESCENDING)]),
+    ],
+    "contact_messages": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "settings": [
+        IndexModel([("updated_at", DESCENDING)]),
+    ],
+}
+
+# The route queries the indexes above exist for: (label, collection, filter, sort).
+# check_query_plans() explains each one and reports any that scan the collection.
+ROUTE_QUERIES = [
+    ("public projects", "projects", {}, [("created_at", -1), ("_id", -1)]),
+    ("public featured projects", "projects", {"status": "completed"}, [("created_at", -1)]),
+    ("public experience", "experiences", {}, [("start_date", -1), ("_id", -1)]),
+    ("public skills", "skill_categories", {}, [("created_at", 1), ("_id", 1)]),
+    ("public education", "education", {}, [("start_date", -1), ("_id", -1)]),
+    ("public certifications", "certifications", {}, [("date", -1), ("_id", -1)]),
+    ("public testimonials", "testimonials", {}, [("created_at", -1), ("_id", -1)]),
+    ("public blog list", "blog_posts", {"status": "published"}, [("published_at", -1), ("_id", -1)]),
+    ("public blog by slug", "blog_posts", {"slug": "", "status": "published"}, None),
+    ("public featured blog", "blog_posts", {"featured": True, "status": "published"}, [("published_at", -1)]),
+    ("admin projects", "projects", {}, [("updated_at", -1), ("_id", -1)]),
+    ("admin experience", "experiences", {}, [("start_date", -1), ("_id", -1)]),
+    ("admin skills", "skills", {}, [("created_at", -1), ("_id", -1)]),
+    ("skill regroup", "skills", {"category": {"$in": [""]}}, [("category", 1), ("level", -1), ("name", 1)]),
+    ("admin posts", "blog_posts", {}, [("created_at", -1), ("_id", -1)]),
+    ("admin education", "education", {}, [("start_date", -1), ("_id", -1)]),
+    ("admin certifications", "certifications", {}, [("date", -1), ("_id", -1)]),
+    ("admin testimonials", "testimonials", {}, [("created_at", -1), ("_id", -1)]),
+    ("admin messages", "contact_messages", {}, [("created_at", -1), ("_id", -1)]),
+]
+# The change-polling probe (services/invalidation.py) runs on every watched collection.
+ROUTE_QUERIES += [(f"change poll {name}", name, {}, [("updated_at", -1)]) for name in WATCHED_COLLECTIONS]
+
+
+async def ensure_indexes(drop_undeclared: bool = False):
+    """
+    Create every declared index (a no-op for ones that already exist) and
+    report indexes present in the database that are no longer declared.
+    Returns {collection: [undeclared index names]}.
+    """
+    undeclared = {}
+    for name, models in INDEXES.items():
+        collection = await get_collection(name)
+        try:
+            await collection.create_indexes(models)
+        except OperationFailure as e:
+            # e.g. duplicate slugs blocking the unique index; keep serving.
+            logger.error(f"Could not create indexes on {name}: {e}")
+
+        declared = {model.document["name"] for model in models} | {"_id_"}
+        existing = [index["name"] async for index in collection.list_indexes()]
+        stale = [index for index in existing if index not in declared]
+        if stale:
+            undeclared[name] = stale
+            if drop_undeclared:
+                for index in stale:
+                    await collection.drop_index(index)
+                logger.info(f"Dropped undeclared indexes on {name}: {', '.join(stale)}")
+            else:
+                logger.warning(f"Undeclared indexes on {name}: {', '.join(stale)}")
+    logger.info("Indexes ensured.")
+    return undeclared
+
+
+def _stages(plan):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+async def check_query_plans():
+    """
+    Explain every entry in ROUTE_QUERIES and return the labels of the ones
+    whose winning plan falls back to a COLLSCAN.
+    """
+    collscans = []
+    for label, name, query, sort in ROUTE_QUERIES:
+        collection = await get_collection(name)
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        planner = explain.get("queryPlanner", {})
+        winning = planner.get("winningPlan", {})
+        if "COLLSCAN" in _stages(winning):
+            collscans.append(label)
+            logger.error(f"{label}: {name} query {query} falls back to COLLSCAN")
+    return collscans
@@ -0,0 +1,356 @@
+import asyncio
+import inspect
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from services.cache import query_cache
+from services.search import index_post, index_project, rebuild_search_index, search_index
+
+logger = logging.getLogger(__name__)
+
+# Collections whose changes must reach every replica's caches.
+WATCHED_COLLECTIONS = (
+    "personal_info",
+    "projects",
+    "experiences",
+    "skills",
+    "skill_categories",
+    "education",
+    "certifications",
+    "blog_posts",
+    "testimonials",
+    "settings",
+)
+
+# Server errors meaning "no change streams here" (standalone server, or a
+# server/stand-in without the $changeStream stage).
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324, 115}
+# The stored resume token is no longer in the oplog: ChangeStreamHistoryLost
+# (286), or ChangeStreamFatalError (280), which servers before 4.4 report
+# for the same condition.
+RESUME_TOKEN_LOST = {280, 286}
+
+MAX_BACKOFF_SECONDS = 30.0
+SEARCH_REBUILD_DELAY_SECONDS = 1.0
+
+
+class ChangeEvent:
+    """
+    One invalidation. `document_id` is None for collection-wide events
+    (polling, drops, a lost resume token): drop everything for `collection`.
+    """
+
+    __slots__ = ("collection", "operation", "document_id", "document")
+
+    def __init__(self, collection: str, operation: str, document_id: Any = None, document: Optional[Dict[str, Any]] = None):
+        self.collection = collection
+        self.operation = operation
+        self.document_id = document_id
+        self.document = document
+
+
+Handler = Callable[[ChangeEvent], Union[None, Awaitable[None]]]
+
+
+class InvalidationBus:
+    """In-process fan-out of ChangeEvents to subscribers (sync or async callables)."""
+
+    def __init__(self):
+        self._handlers: List[Handler] = []
+        self.published = 0
+
+    def subscribe(self, handler: Handler) -> Handler:
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+        return handler
+
+    def unsubscribe(self, handler: Handler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    async def publish(self, event: ChangeEvent):
+        self.published += 1
+        for handler in list(self._handlers):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                # One failing subscriber must not stop the others (or the watcher).
+                logger.error(f"Invalidation handler {handler!r} failed for {event.collection}: {e}")
+
+
+invalidation_bus = InvalidationBus()
+
+
+async def collection_fingerprint(collection) -> Tuple[int, Optional[datetime], Any, int]:
+    """
+    (document count, newest updated_at, that document's _id and version).
+    The count comes from collection metadata and the newest document from
+    the updated_at index, so the probe costs the same at any collection
+    size. Every write path sets updated_at, so inserts, deletes and admin
+    writes all change it.
+    """
+    count = await collection.estimated_document_count()
+    newest = await collection.find({}, {"updated_at": 1, "version": 1}).sort("updated_at", -1).limit(1).to_list(1)
+    if not newest:
+        return (count, None, None, 0)
+    return (count, newest[0].get("updated_at"), newest[0]["_id"], newest[0].get("version", 0))
+
+
+# ---------- Subscribers ----------
+def invalidate_query_cache(event: ChangeEvent):
+    query_cache.invalidate(event.collection)
+
+
+class SearchIndexSubscriber:
+    """
+    Keeps the search index in step with post and project changes from any
+    replica. Document events are applied as they come. Collection-wide
+    events (every change, when polling) rebuild only the changed kind, and
+    a burst of them within `delay` seconds is one rebuild.
+    """
+
+    INDEXERS = {"blog_posts": ("post", index_post), "projects": ("project", index_project)}
+
+    def __init__(self, collections, delay: float = SEARCH_REBUILD_DELAY_SECONDS):
+        self.collections = collections
+        self.delay = delay
+        self.rebuilds = 0
+        self._stale: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __call__(self, event: ChangeEvent):
+        if event.collection not in self.INDEXERS:
+            return
+        kind, indexer = self.INDEXERS[event.collection]
+        if event.document_id is None:
+            self._stale.add(kind)
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._rebuild())
+        elif event.operation == "delete" or event.document is None:
+            search_index.remove(kind, str(event.document_id))
+        else:
+            indexer(event.document)
+
+    async def _rebuild(self):
+        # Kinds marked stale while a rebuild runs are picked up by the next round.
+        while self._stale:
+            await asyncio.sleep(self.delay)
+            kinds, self._stale = self._stale, set()
+            try:
+                await rebuild_search_index(self.collections, kinds)
+                self.rebuilds += 1
+            except Exception:
+                logger.exception(f"Rebuilding the search index for {sorted(kinds)} failed")
+
+
+# ---------- Watcher ----------
+class ChangeWatcher:
+    """
+    Background task publishing changes to WATCHED_COLLECTIONS on the bus.
+
+    Tails a database change stream (with the post-image, so subscribers need
+    no extra read) and keeps the last resume token, so a dropped connection
+    resumes where it left off without missing events. The token is also
+    stored in `state` (one `watch_state` document per replica, written at
+    most every `save_interval` seconds and on stop) and reloaded at start,
+    so a restarted replica resumes too; events since the last save are
+    replayed, which only invalidates again. The token is dropped only when
+    its history is gone from the oplog. Where change streams are unavailable
+    (standalone server) it polls a per-collection fingerprint instead
+    (collection_fingerprint: the metadata count plus the newest document by
+    `updated_at`) every `poll_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        db,
+        bus: InvalidationBus,
+        mode: str = "auto",
+        poll_interval: float = 2.0,
+        collections: Tuple[str, ...] = WATCHED_COLLECTIONS,
+        state=None,
+        replica_id: Optional[str] = None,
+        save_interval: float = 5.0,
+    ):
+        self.db = db
+        self.bus = bus
+        self.mode = mode  # auto (change streams, else polling), poll, off
+        self.poll_interval = poll_interval
+        self.collections = collections
+        self.state = state
+        self.replica_id = replica_id or socket.gethostname()
+        self.save_interval = save_interval
+        self.resume_token = None
+        self._saved_token = None
+        self._saved_at = 0.0
+        self.active = None  # "change_stream" or "poll" once running
+        self.errors = 0
+        self.last_event_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- Lifecycle ----------
+    def start(self):
+        if self.mode != "off" and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self._save_token(force=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "active": self.active,
+            "events": self.bus.published,
+            "errors": self.errors,
+            "replica_id": self.replica_id,
+            "resume_token": self.resume_token is not None,
+            "last_event_at": self.last_event_at.isoformat() if self.last_event_at else None,
+        }
+
+    async def _publish(self, event: ChangeEvent):
+        self.last_event_at = datetime.utcnow()
+        await self.bus.publish(event)
+
+    async def _publish_all(self, operation: str):
+        for name in self.collections:
+            await self._publish(ChangeEvent(name, operation))
+
+    # ---------- Resume token ----------
+    async def _load_token(self):
+        if self.state is None:
+            return
+        try:
+            doc = await self.state.find_one({"_id": self.replica_id})
+        except PyMongoError as e:
+            logger.warning(f"Could not load the stored resume token: {e}; starting from now")
+            return
+        self.resume_token = self._saved_token = (doc or {}).get("resume_token")
+
+    async def _save_token(self, force: bool = False):
+        """Store the token if it changed, at most every save_interval seconds unless forced."""
+        if self.state is None or self.resume_token == self._saved_token:
+            return
+        if not force and time.monotonic() - self._saved_at < self.save_interval:
+            return
+        token = self.resume_token
+        try:
+            await self.state.update_one(
+                {"_id": self.replica_id},
+                {"$set": {"resume_token": token, "updated_at": datetime.utcnow()}},
+                upsert=True,
+            )
+        except PyMongoError as e:
+            logger.warning(f"Could not store the resume token: {e}")
+            return
+        self._saved_token = token
+        self._saved_at = time.monotonic()
+
+    async def _run(self):
+        if self.mode == "poll":
+            await self._poll()
+            return
+        await self._load_token()
+        backoff = 1.0
+        while True:
+            try:
+                await self._watch()
+                backoff = 1.0
+            except NotImplementedError:
+                break
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    break
+                self.errors += 1
+                if e.code in RESUME_TOKEN_LOST:
+                    logger.warning("Change stream resume token expired; invalidating everything")
+                    self.resume_token = None
+                    await self._save_token(force=True)
+                    await self._publish_all("resync")
+                    continue
+                logger.error(f"Change stream failed ({e.code}): {e}; retrying in {backoff:.0f}s")
+            except PyMongoError as e:
+                self.errors += 1
+                logger.warning(f"Change stream interrupted: {e}; resuming in {backoff:.0f}s")
+            except Exception:
+                # Never let the watcher die: replicas would silently go stale.
+                self.errors += 1
+                logger.exception(f"Change watcher crashed; restarting in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+        logger.info("Change streams are not available; polling for changes instead")
+        await self._poll()
+
+    # ---------- Change streams ----------
+    async def _watch(self):
+        pipeline = [{"$match": {"ns.coll": {"$in": list(self.collections)}}}]
+        # start_after (unlike resume_after) also accepts the token of an
+        # invalidate event, so the stream restarts right after one.
+        async with self.db.watch(pipeline, full_document="updateLookup", start_after=self.resume_token) as stream:
+            if self.active != "change_stream":
+                self.active = "change_stream"
+                logger.info("Watching collections for changes")
+            while stream.alive:
+                change = await stream.try_next()
+                if change is not None:
+                    await self._handle(change)
+                # Advances on empty batches too (post-batch token), so a resume
+                # after a quiet period does not replay from long ago.
+                if stream.resume_token is not None:
+                    self.resume_token = stream.resume_token
+                    await self._save_token()
+
+    async def _handle(self, change: Dict[str, Any]):
+        operation = change["operationType"]
+        if operation in ("insert", "update", "replace", "delete"):
+            await self._publish(ChangeEvent(
+                change["ns"]["coll"], operation, change["documentKey"]["_id"], change.get("fullDocument")
+            ))
+        elif operation in ("drop", "rename"):
+            await self._publish(ChangeEvent(change["ns"]["coll"], operation))
+        elif operation in ("dropDatabase", "invalidate"):
+            # The stream closes after an invalidate; _run starts the next one after it.
+            await self._publish_all(operation)
+
+    # ---------- Polling ----------
+    async def _poll(self):
+        self.active = "poll"
+        fingerprints = {}
+        while True:
+            for name in self.collections:
+                try:
+                    fingerprint = await collection_fingerprint(self.db[name])
+                except PyMongoError as e:
+                    self.errors += 1
+                    logger.warning(f"Polling {name} for changes failed: {e}")
+                    continue
+                if name in fingerprints and fingerprints[name] != fingerprint:
+                    await self._publish(ChangeEvent(name, "poll"))
+                fingerprints[name] = fingerprint
+            await asyncio.sleep(self.poll_interval)
+
+
+def create_watcher(db) -> ChangeWatcher:
+    return ChangeWatcher(
+        db,
+        invalidation_bus,
+        mode=os.environ.get("CACHE_INVALIDATION_MODE", "auto").lower(),
+        poll_interval=float(os.environ.get("CACHE_INVALIDATION_POLL_SECONDS", "2")),
+        state=db["watch_state"],
+        # Replicas sharing a hostname (e.g. several workers in one container) need distinct ids.
+        replica_id=os.environ.get("REPLICA_ID") or None,
+    )
@@ -0,0 +1,270 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout (seconds)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def copy(self) -> "Histogram":
+        other = Histogram(self.buckets)
+        other.counts = list(self.counts)
+        other.sum = self.sum
+        other.count = self.count
+        return other
+
+
+# ---------- Exposition ----------
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Writer:
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def header(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, label_names=(), label_values=()):
+        self.lines.append(f"{name}{_labels(label_names, label_values)} {_format(value)}")
+
+    def metric(self, name: str, kind: str, help_text: str, samples: Dict[tuple, float], label_names=()):
+        self.header(name, kind, help_text)
+        for label_values, value in sorted(samples.items()):
+            self.sample(name, value, label_names, label_values)
+
+    def histogram(self, name: str, help_text: str, histograms: Dict[tuple, Histogram], label_names=()):
+        self.header(name, "histogram", help_text)
+        for label_values, hist in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(hist.buckets + (float("inf"),), hist.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format(bound)
+                self.sample(f"{name}_bucket", cumulative, (*label_names, "le"), (*label_values, le))
+            self.sample(f"{name}_sum", hist.sum, label_names, label_values)
+            self.sample(f"{name}_count", hist.count, label_names, label_values)
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+# ---------- HTTP ----------
+class HttpMetrics:
+    """Request counters and latency histograms keyed by route template."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        hist = self.durations.get((method, route))
+        if hist is None:
+            hist = self.durations[(method, route)] = Histogram(HTTP_BUCKETS)
+        hist.observe(seconds)
+
+    def write(self, out: _Writer):
+        out.metric("http_requests_in_flight", "gauge", "Requests currently being served.", {(): self.in_flight})
+        out.metric("http_requests_total", "counter", "Requests served, by route template and status.",
+                   dict(self.requests), ("method", "route", "status"))
+        out.histogram("http_request_duration_seconds", "Time to serve a request, including the body.",
+                      {key: hist.copy() for key, hist in self.durations.items()}, ("method", "route"))
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding HttpMetrics. Requests are labelled with the
+    matched route template (/api/projects/{project_id}), never the raw path,
+    so label cardinality is bounded by the number of routes.
+    """
+
+    def __init__(self, app, metrics: HttpMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+        self.metrics.in_flight += 1
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_flight -= 1
+            self.metrics.observe(scope["method"], _route_template(scope), status, time.perf_counter() - start)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Answered before routing (e.g. rate limited): match the template ourselves.
+    app = scope.get("app")
+    for candidate in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = candidate.matches(scope)
+        if match == Match.FULL:
+            return candidate.path
+    return "unmatched"
+
+
+# ---------- MongoDB commands ----------
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Command listener timing every MongoDB command per collection and command
+    name, and counting failures and slow commands. Motor runs the driver on
+    worker threads, so updates are locked.
+    """
+
+    def __init__(self, slow_command_ms: float = 100.0):
+        self.slow_command_ms = slow_command_ms
+        self._lock = threading.Lock()
+        self._started: Dict[Tuple[int, object], Tuple[str, str]] = {}
+        self.commands: Dict[Tuple[str, str, str], int] = {}
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        self.slow: Dict[Tuple[str, str], int] = {}
+
+    @staticmethod
+    def _collection(event) -> str:
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        return target if isinstance(target, str) else ""
+
+    def started(self, event):
+        key = (event.request_id, event.connection_id)
+        with self._lock:
+            self._started[key] = (self._collection(event), event.command_name)
+
+    def _finished(self, event, outcome: str):
+        with self._lock:
+            labels = self._started.pop((event.request_id, event.connection_id), None)
+            if labels is None:
+                return
+            seconds = event.duration_micros / 1e6
+            key = (*labels, outcome)
+            self.commands[key] = self.commands.get(key, 0) + 1
+            hist = self.durations.get(labels)
+            if hist is None:
+                hist = self.durations[labels] = Histogram(MONGO_BUCKETS)
+            hist.observe(seconds)
+            slow = seconds * 1000 >= self.slow_command_ms
+            if slow:
+                self.slow[labels] = self.slow.get(labels, 0) + 1
+        if slow:
+            logger.warning(f"Slow MongoDB command: {labels[1]} on {labels[0] or '(admin)'} took {seconds * 1000:.1f}ms")
+
+    def succeeded(self, event):
+        self._finished(event, "succeeded")
+
+    def failed(self, event):
+        self._finished(event, "failed")
+
+    def write(self, out: _Writer):
+        with self._lock:
+            commands = dict(self.commands)
+            durations = {key: hist.copy() for key, hist in self.durations.items()}
+            slow = dict(self.slow)
+        out.metric("mongodb_commands_total", "counter", "MongoDB commands, by collection, command and outcome.",
+                   commands, ("collection", "command", "outcome"))
+        out.histogram("mongodb_command_duration_seconds", "MongoDB command round-trip time.",
+                      durations, ("collection", "command"))
+        out.metric("mongodb_slow_commands_total", "counter",
+                   f"MongoDB commands slower than {_format(self.slow_command_ms)}ms.", slow, ("collection", "command"))
+
+
+http_metrics = HttpMetrics()
+
+
+def render_metrics(
+    command_metrics: CommandMetrics,
+    pool: Optional[Dict] = None,
+    cache: Optional[Dict] = None,
+    contact_queue: Optional[Dict] = None,
+    compression: Optional[Dict] = None,
+    views: Optional[Dict] = None,
+) -> str:
+    """Everything in the text exposition format; snapshots come from the /health endpoints' sources."""
+    out = _Writer()
+    http_metrics.write(out)
+    command_metrics.write(out)
+    if pool is not None:
+        out.metric("mongodb_pool_connections_open", "gauge", "Open pooled connections.", {(): pool["connections_open"]})
+        out.metric("mongodb_pool_checked_out", "gauge", "Connections currently checked out.", {(): pool["checked_out"]})
+        out.metric("mongodb_pool_checkouts_total", "counter", "Connection checkouts.", {(): pool["checkouts"]})
+        out.metric("mongodb_pool_slow_checkouts_total", "counter", "Checkouts that waited past the slow threshold.", {(): pool["slow_checkouts"]})
+        out.metric("mongodb_pool_checkout_failures_total", "counter", "Failed checkouts, by reason.",
+                   {(str(reason),): n for reason, n in pool["checkout_failures"].items()}, ("reason",))
+    if cache is not None:
+        out.metric("query_cache_entries", "gauge", "Entries in the query cache.", {(): cache["entries"]})
+        out.metric("query_cache_hits_total", "counter", "Query cache hits.", {(): cache["hits"]})
+        out.metric("query_cache_misses_total", "counter", "Query cache misses.", {(): cache["misses"]})
+        out.metric("query_cache_evictions_total", "counter", "Query cache evictions.", {(): cache["evictions"]})
+        out.metric("query_cache_invalidations_total", "counter", "Query cache invalidations.", {(): cache["invalidations"]})
+    if contact_queue is not None:
+        out.metric("contact_queue_pending", "gauge", "Contact messages waiting to be flushed.", {(): contact_queue["pending"]})
+        out.metric("contact_queue_accepted_total", "counter", "Contact messages accepted.", {(): contact_queue["accepted"]})
+        out.metric("contact_queue_rejected_total", "counter", "Contact messages rejected because the queue was full.", {(): contact_queue["rejected"]})
+        out.metric("contact_queue_flushed_total", "counter", "Contact messages written to MongoDB.", {(): contact_queue["flushed"]})
+        out.metric("contact_queue_failed_flushes_total", "counter", "Flushes that failed and were retried.", {(): contact_queue["failed_flushes"]})
+    if compression is not None:
+        out.metric("http_compressed_responses_total", "counter", "Response bodies compressed.", {(): compression["compressed"]})
+        out.metric("http_compression_offloaded_total", "counter", "Compressions run on the thread pool.", {(): compression["offloaded"]})
+        out.metric("http_compression_variant_hits_total", "counter", "Responses served from a cached compressed variant.", {(): compression["variant_hits"]})
+        out.metric("http_compression_bytes_in_total", "counter", "Bytes before compression.", {(): compression["bytes_in"]})
+        out.metric("http_compression_bytes_out_total", "counter", "Bytes after compression.", {(): compression["bytes_out"]})
+    if views is not None:
+        out.metric("view_counter_pending_views", "gauge", "Views counted in memory, not yet flushed.", {(): views["pending_views"]})
+        out.metric("view_counter_tracked_keys", "gauge", "Projects, posts and pages with view totals in memory.", {(): views["tracked_keys"]})
+        out.metric("view_counter_recorded_total", "counter", "Views recorded.", {(): views["recorded"]})
+        out.metric("view_counter_dropped_total", "counter", "Views dropped because too many keys were tracked.", {(): views["dropped"]})
+        out.metric("view_counter_flushed_total", "counter", "Views written to MongoDB.", {(): views["flushed"]})
+        out.metric("view_counter_failed_flushes_total", "counter", "Flushes that failed and were retried.", {(): views["failed_flushes"]})
+    return out.text()
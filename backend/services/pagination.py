@@ -0,0 +1,120 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from services.responses import EncodedResponse, encode_trusted
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Sort values a cursor may carry: the scalar BSON types our sort keys hold.
+CURSOR_VALUE_TYPES = (str, int, float, bool, datetime, type(None))
+
+
+# ---------- Cursors ----------
+def encode_cursor(doc: Dict[str, Any], sort_key: str) -> str:
+    """Opaque cursor holding the (sort value, _id) of the last document on a page."""
+    raw = json_util.dumps([doc.get(sort_key), doc["_id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """
+    The (sort value, _id) in `cursor`. Cursors come from clients, so anything
+    encode_cursor() cannot have produced (query operators, arrays, a non-ObjectId
+    _id) is rejected rather than spliced into the query.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, last_id = json_util.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(value, CURSOR_VALUE_TYPES) or not isinstance(last_id, ObjectId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, last_id
+
+
+def keyset_filter(sort_key: str, cursor: str) -> Dict[str, Any]:
+    """
+    Match the documents that come after `cursor` in (sort_key desc, _id desc)
+    order. Documents without a sort value sort last, so they always follow a
+    cursor that has one.
+    """
+    value, last_id = decode_cursor(cursor)
+    branches = [{sort_key: value, "_id": {"$lt": last_id}}]
+    if value is not None:
+        branches += [{sort_key: {"$lt": value}}, {sort_key: None}]
+    return {"$or": branches}
+
+
+# ---------- Projection ----------
+def requested_fields(fields: str, model: Type[BaseModel]) -> List[str]:
+    """The output keys named in `?fields=` (by field name or alias); 400 for unknown ones."""
+    allowed = {}
+    for name, info in model.model_fields.items():
+        allowed[name] = allowed[info.alias or name] = info.alias or name
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [allowed[name] for name in requested]
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel], sort_key: str) -> Optional[Dict[str, int]]:
+    """
+    Turn `?fields=title,excerpt` into a Mongo projection, restricted to the
+    model's fields. `_id` and the sort key are always read so cursors work.
+    """
+    if not fields:
+        return None
+    projection = {name: 1 for name in requested_fields(fields, model)}
+    projection[sort_key] = 1
+    return projection
+
+
+def model_projection(model: Type[BaseModel]) -> Dict[str, int]:
+    """A Mongo projection reading only the fields `model` emits."""
+    return {info.alias or name: 1 for name, info in model.model_fields.items()}
+
+
+def fields_key(fields: Optional[str]) -> Optional[str]:
+    """Normalized form of `?fields=` for use in cache keys."""
+    if not fields:
+        return None
+    return ",".join(sorted({name.strip() for name in fields.split(",") if name.strip()}))
+
+
+# ---------- Pages ----------
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    sort_key: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one page sorted by (sort_key desc, _id desc) and the cursor for the next one."""
+    if cursor:
+        after = keyset_filter(sort_key, cursor)
+        query = {"$and": [query, after]} if query else after
+    docs = await collection.find(query, projection).sort([(sort_key, -1), ("_id", -1)]).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], sort_key)
+    return docs, next_cursor
+
+
+def encode_page(docs: List[Dict[str, Any]], next_cursor: Optional[str], model: Type[BaseModel], fields: Optional[str] = None) -> EncodedResponse:
+    """
+    Encode a page of raw documents, shaped to `model` without re-validation.
+    With `?fields=`, only `_id` and the requested fields are emitted.
+    """
+    only = {"_id", *requested_fields(fields, model)} if fields else None
+    encoded = encode_trusted(docs, model, only)
+    if next_cursor:
+        encoded.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return encoded
@@ -0,0 +1,92 @@
+from pymongo import monitoring
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener tracking checkouts, checkout wait time and open
+    connections. Motor runs the driver on worker threads, so updates are locked.
+    """
+
+    def __init__(self, slow_checkout_ms: float = 100.0):
+        self.slow_checkout_ms = slow_checkout_ms
+        self._lock = threading.Lock()
+        self.pools = 0
+        self.connections_open = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = {}
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.slow_checkouts = 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "pools": self.pools,
+                "connections_open": self.connections_open,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "wait_ms_avg": round(self.wait_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "slow_checkouts": self.slow_checkouts,
+            }
+
+    # ---------- Pool lifecycle ----------
+    def pool_created(self, event):
+        with self._lock:
+            self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        logger.warning(f"MongoDB connection pool cleared for {event.address}")
+
+    def pool_closed(self, event):
+        with self._lock:
+            self.pools -= 1
+
+    # ---------- Connections ----------
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_open -= 1
+
+    # ---------- Checkouts ----------
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+        logger.warning(f"MongoDB connection checkout failed ({event.reason}) for {event.address}")
+
+    def connection_checked_out(self, event):
+        # `duration` (seconds) covers the whole wait for a pooled connection.
+        wait_ms = (getattr(event, "duration", None) or 0.0) * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.wait_ms_total += wait_ms
+            if wait_ms > self.wait_ms_max:
+                self.wait_ms_max = wait_ms
+            slow = wait_ms >= self.slow_checkout_ms
+            if slow:
+                self.slow_checkouts += 1
+        if slow:
+            logger.warning(f"MongoDB connection checkout waited {wait_ms:.1f}ms; pool may be saturated")
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+
+class RateLimit:
+    """`capacity` requests per `period` seconds, refilled continuously."""
+
+    __slots__ = ("capacity", "period")
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse "5/60" (5 requests per 60 seconds)."""
+        capacity, period = value.split("/")
+        return cls(int(capacity), float(period))
+
+
+class RouteLimit:
+    """Limits for one route; any of them may be None to disable it."""
+
+    def __init__(
+        self,
+        per_ip: Optional[RateLimit] = None,
+        per_email: Optional[RateLimit] = None,
+        duplicate_window: Optional[float] = None,
+    ):
+        self.per_ip = per_ip
+        self.per_email = per_email
+        self.duplicate_window = duplicate_window
+
+    @property
+    def needs_body(self) -> bool:
+        return self.per_email is not None or self.duplicate_window is not None
+
+
+class TokenBucketStore:
+    """LRU-bounded token buckets keyed by an arbitrary string."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, limit: RateLimit, now: float) -> float:
+        """Consume one token; returns 0 if allowed, else seconds until one is available."""
+        rate = limit.capacity / limit.period
+        tokens, updated = self._buckets.get(key, (float(limit.capacity), now))
+        tokens = min(limit.capacity, tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def refund(self, key: str, limit: RateLimit):
+        """Give back a token taken for a request the app did not accept."""
+        entry = self._buckets.get(key)
+        if entry is not None:
+            tokens, updated = entry
+            self._buckets[key] = (min(limit.capacity, tokens + 1), updated)
+
+
+class SlidingWindowSet:
+    """Remembers content hashes for `window` seconds; oldest entries expire first."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def seen(self, key: str, window: float, now: float) -> float:
+        """Record `key`; returns 0 if it is new, else seconds until it may be sent again."""
+        while self._seen:
+            oldest, expires_at = next(iter(self._seen.items()))
+            if expires_at > now and len(self._seen) <= self.max_keys:
+                break
+            del self._seen[oldest]
+        expires_at = self._seen.get(key)
+        if expires_at is not None:
+            return expires_at - now
+        self._seen[key] = now + window
+        return 0.0
+
+    def forget(self, key: str):
+        self._seen.pop(key, None)
+
+
+# X-Forwarded-For is only believed when we know who adds it: the number of
+# proxies in front of the app (TRUSTED_PROXY_HOPS) or their addresses
+# (TRUSTED_PROXIES, comma separated). Neither set: the socket peer is used.
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "0"))
+TRUSTED_PROXIES = frozenset(ip.strip() for ip in os.environ.get("TRUSTED_PROXIES", "").split(",") if ip.strip())
+
+
+def client_ip(scope, trusted_hops: Optional[int] = None, trusted_proxies: Optional[FrozenSet[str]] = None) -> str:
+    """
+    The caller's address. Behind trusted proxies it is the address the
+    outermost trusted proxy appended to X-Forwarded-For; entries to its left
+    come from the client and are ignored, so changing the header does not
+    change the address.
+    """
+    trusted_hops = TRUSTED_PROXY_HOPS if trusted_hops is None else trusted_hops
+    trusted_proxies = TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    if not trusted_hops and not trusted_proxies:
+        return peer
+
+    forwarded = []
+    for name, value in scope["headers"]:
+        if name == b"x-forwarded-for":
+            forwarded.extend(hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip())
+
+    if trusted_proxies:
+        if peer not in trusted_proxies:
+            return peer
+        # Walk back from the nearest proxy to the first address no trusted proxy owns.
+        for hop in reversed(forwarded):
+            if hop not in trusted_proxies:
+                return hop
+        return forwarded[0] if forwarded else peer
+
+    # Each of the `trusted_hops` proxies appends the address it received from.
+    if len(forwarded) >= trusted_hops:
+        return forwarded[-trusted_hops]
+    return peer
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying per-IP and per-email token buckets plus
+    exact-duplicate suppression to the routes in `limits`, keyed by
+    (method, path). Rejections are answered here without reaching the app.
+    """
+
+    def __init__(
+        self,
+        app,
+        limits: Dict[Tuple[str, str], RouteLimit],
+        max_body: int = 64 * 1024,
+        trusted_hops: Optional[int] = None,
+        trusted_proxies: Optional[FrozenSet[str]] = None,
+    ):
+        self.app = app
+        self.limits = limits
+        self.max_body = max_body
+        self.trusted_hops = trusted_hops
+        self.trusted_proxies = trusted_proxies
+        self.buckets = TokenBucketStore()
+        self.duplicates = SlidingWindowSet()
+        self.rejections: Dict[str, int] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        limit = self.limits.get((scope["method"], scope["path"]))
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        now = time.monotonic()
+        route = f"{scope['method']} {scope['path']}"
+        if limit.per_ip:
+            retry_after = self.buckets.take(f"ip:{route}:{self._client_ip(scope)}", limit.per_ip, now)
+            if retry_after:
+                return await self._reject(send, "ip", "Too many requests, please slow down", retry_after)
+
+        # Taken before the app runs (so concurrent copies are caught) and given
+        # back unless the app accepts the request: a 422 or a full-queue 429
+        # must not turn the corrected resend or the retry into a "duplicate".
+        email_key = digest_key = None
+        if limit.needs_body:
+            body = await self._read_body(receive)
+            if body is None:
+                return await self._reject(send, "body", "Request body too large", 0, status=413)
+            receive = self._replay(body, receive)
+            try:
+                payload = json.loads(body) if body else None
+            except ValueError:
+                payload = None
+            if isinstance(payload, dict):
+                email = str(payload.get("email", "")).strip().lower()
+                if limit.per_email and email:
+                    retry_after = self.buckets.take(f"email:{route}:{email}", limit.per_email, now)
+                    if retry_after:
+                        return await self._reject(send, "email", "Too many messages from this address", retry_after)
+                    email_key = f"email:{route}:{email}"
+                if limit.duplicate_window:
+                    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+                    retry_after = self.duplicates.seen(f"{route}:{digest}", limit.duplicate_window, now)
+                    if retry_after:
+                        if email_key:
+                            self.buckets.refund(email_key, limit.per_email)
+                        return await self._reject(send, "duplicate", "Duplicate message", retry_after, status=409)
+                    digest_key = f"{route}:{digest}"
+
+        if email_key is None and digest_key is None:
+            return await self.app(scope, receive, send)
+
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status is None or not 200 <= status < 300:
+                if email_key:
+                    self.buckets.refund(email_key, limit.per_email)
+                if digest_key:
+                    self.duplicates.forget(digest_key)
+
+    def _client_ip(self, scope) -> str:
+        return client_ip(scope, self.trusted_hops, self.trusted_proxies)
+
+    async def _read_body(self, receive) -> Optional[bytes]:
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                return None
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, receive):
+        """Hand the buffered body to the app, then fall back to the real channel."""
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    async def _reject(self, send, reason: str, detail: str, retry_after: float, status: int = 429):
+        self.rejections[reason] = self.rejections.get(reason, 0) + 1
+        body = json.dumps({"detail": detail}).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if retry_after:
+            headers.append((b"retry-after", str(math.ceil(retry_after)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
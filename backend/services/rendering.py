@@ -0,0 +1,63 @@
+import hashlib
+import math
+import re
+from typing import Any, Dict, List
+
+from markdown_it import MarkdownIt
+
+# Bump when the rendering rules change so stored artifacts get re-rendered.
+RENDERER_VERSION = "1"
+WORDS_PER_MINUTE = 200
+
+# Raw HTML in posts is escaped rather than passed through, and markdown-it
+# already refuses javascript:/vbscript:/file: links, so the output is safe to
+# inject as-is on the client.
+_md = MarkdownIt("commonmark", {"html": False}).enable("table").enable("strikethrough")
+
+_WORD_RE = re.compile(r"\w+(?:['’-]\w+)*")
+_ANCHOR_STRIP_RE = re.compile(r"[^\w\s-]")
+_ANCHOR_SPACE_RE = re.compile(r"[\s_-]+")
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(f"{RENDERER_VERSION}:{content}".encode()).hexdigest()
+
+
+def _anchor(text: str, used: Dict[str, int]) -> str:
+    base = _ANCHOR_SPACE_RE.sub("-", _ANCHOR_STRIP_RE.sub("", text.lower())).strip("-") or "section"
+    count = used.get(base, 0)
+    used[base] = count + 1
+    return base if count == 0 else f"{base}-{count}"
+
+
+def render_post(content: str) -> Dict[str, Any]:
+    """
+    Render Markdown post content once. Returns the fields stored alongside
+    `content`: sanitized HTML with heading anchors, the table of contents,
+    word count, read time and the hash of the content that was rendered.
+    """
+    tokens = _md.parse(content or "")
+    toc: List[Dict[str, Any]] = []
+    used: Dict[str, int] = {}
+    for index, token in enumerate(tokens):
+        if token.type != "heading_open":
+            continue
+        inline = tokens[index + 1]
+        text = "".join(child.content for child in inline.children or [] if child.type in ("text", "code_inline"))
+        anchor = _anchor(text, used)
+        token.attrSet("id", anchor)
+        toc.append({"level": int(token.tag[1]), "text": text, "id": anchor})
+
+    word_count = len(_WORD_RE.findall(content or ""))
+    return {
+        "content_html": _md.renderer.render(tokens, _md.options, {}),
+        "toc": toc,
+        "word_count": word_count,
+        "read_time": f"{max(1, math.ceil(word_count / WORDS_PER_MINUTE))} min read",
+        "content_hash": content_hash(content or ""),
+    }
+
+
+def needs_render(post: Dict[str, Any]) -> bool:
+    """True when the stored artifact is missing or was rendered from other content."""
+    return post.get("content_hash") != content_hash(post.get("content") or "")
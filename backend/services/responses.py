@@ -0,0 +1,161 @@
+import hashlib
+import typing
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Collection, Dict, List, Optional, Tuple, Type
+
+import orjson
+from bson import ObjectId
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from starlette.datastructures import Headers
+
+from services.compression import apply_encoding, coded_etag, compressor, strip_coding, vary_on_encoding
+
+
+class EncodedResponse:
+    """
+    A fully encoded JSON body plus its strong ETag, any extra headers and its
+    compressed variants (coding -> bytes, filled in on first request).
+    """
+
+    __slots__ = ("body", "etag", "headers", "variants")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.headers = {}
+        self.variants = {}
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def encode_json(data: Any, model: Any = Any) -> EncodedResponse:
+    """
+    Validate `data` against `model` once and encode it to JSON bytes, producing
+    the same body FastAPI would emit for `response_model=model`.
+    """
+    adapter = _adapter(model)
+    return EncodedResponse(adapter.dump_json(adapter.validate_python(data), by_alias=True))
+
+
+# ---------- orjson ----------
+def _orjson_default(value: Any):
+    # orjson handles datetime/date natively; ObjectId is the only BSON type we emit.
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """Default response class: orjson with ObjectId support."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _is_date(annotation: Any) -> bool:
+    if annotation is date:
+        return True
+    return typing.get_origin(annotation) is typing.Union and date in typing.get_args(annotation)
+
+
+@lru_cache(maxsize=None)
+def _trusted_fields(model: Type[BaseModel]) -> Tuple[Tuple[str, Any, Any, bool], ...]:
+    """(output key, default, default factory, is a date field) for each model field."""
+    fields = []
+    for name, info in model.model_fields.items():
+        fields.append((info.alias or name, info.default, info.default_factory, _is_date(info.annotation)))
+    return tuple(fields)
+
+
+def _shape(doc: Dict[str, Any], fields) -> Dict[str, Any]:
+    out = {}
+    for key, default, factory, is_date in fields:
+        if key in doc:
+            value = doc[key]
+            # Mongo has no date type; date fields come back as midnight datetimes.
+            if is_date and isinstance(value, datetime):
+                value = value.date()
+        else:
+            value = factory() if factory else default
+        out[key] = value
+    return out
+
+
+def encode_trusted(docs: List[Dict[str, Any]], model: Type[BaseModel], only: Optional[Collection[str]] = None) -> EncodedResponse:
+    """
+    Encode raw documents read from our own collections as `List[model]`
+    without validating them again: only the model's fields are emitted (by
+    alias, defaults filled in) and orjson does the encoding. Produces the
+    same JSON as encode_json(docs, List[model]) for documents the admin
+    routes or the seeder wrote. `only` restricts the output to those keys.
+    """
+    fields = _trusted_fields(model)
+    if only is not None:
+        fields = tuple(field for field in fields if field[0] in only)
+    return EncodedResponse(dumps([_shape(doc, fields) for doc in docs]))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    # A client holding a compressed variant sends its coded tag ("abc-gzip").
+    return etag in (strip_coding(tag[2:] if tag.startswith("W/") else tag) for tag in candidates)
+
+
+class EncodedJSONResponse(Response):
+    """
+    Serves an EncodedResponse, compressed when the client accepts it. For a
+    `cached` body (one held in query_cache) the compressed bytes are kept on
+    the EncodedResponse at the higher cached level, so it is compressed once
+    per version; any other body is compressed for this response only, at
+    the cheaper per-request level.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, encoded: EncodedResponse, headers: Dict[str, str], cached: bool = False):
+        super().__init__(content=encoded.body, headers=headers)
+        self.encoded = encoded
+        self.cached = cached
+
+    async def __call__(self, scope, receive, send):
+        if len(self.body) >= compressor.min_size:
+            vary_on_encoding(self.headers)
+            encoding = compressor.negotiate(Headers(scope=scope).get("accept-encoding"))
+            if encoding:
+                if self.cached:
+                    self.body = await compressor.variant(self.encoded, encoding)
+                else:
+                    self.body = await compressor.compress(self.body, encoding)
+                apply_encoding(self.headers, encoding, len(self.body))
+        await super().__call__(scope, receive, send)
+
+
+def json_response(request: Request, encoded: EncodedResponse, cached: bool = False) -> Response:
+    """
+    Serve pre-encoded bytes, or a bare 304 when the client already has them.
+    Pass `cached=True` when `encoded` is reused across requests (query_cache).
+    """
+    headers = {"ETag": encoded.etag, "Cache-Control": "public, no-cache", **encoded.headers}
+    if etag_matches(request.headers.get("if-none-match"), encoded.etag):
+        # Same validator the 200 would carry for this client's coding.
+        if len(encoded.body) >= compressor.min_size:
+            encoding = compressor.negotiate(request.headers.get("accept-encoding"))
+            if encoding:
+                headers["ETag"] = coded_etag(encoded.etag, encoding)
+            headers["Vary"] = "Accept-Encoding"
+        return Response(status_code=304, headers=headers)
+    return EncodedJSONResponse(encoded, headers, cached)
@@ -0,0 +1,197 @@
+import bisect
+import html
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Searchable fields per document type and how much a match in each one counts.
+FIELD_WEIGHTS = {
+    "post": {"title": 3.0, "tags": 2.0, "excerpt": 1.5, "content": 1.0},
+    "project": {"title": 3.0, "technologies": 2.0, "features": 1.0, "description": 1.0},
+}
+# Field whose text is used for the result snippet.
+SNIPPET_FIELD = {"post": "content", "project": "description"}
+
+MAX_PREFIX_EXPANSIONS = 50
+SNIPPET_CHARS = 160
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value or "")
+
+
+class SearchIndex:
+    """
+    In-process inverted index over blog posts and projects, ranked with BM25
+    over field-weighted term frequencies. The last query term also matches as
+    a prefix so the endpoint can back a type-ahead box.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Tuple[str, str], float]] = {}
+        self._terms: List[str] = []  # sorted, for prefix lookups
+        self._docs: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ---------- Writes ----------
+    def add(self, kind: str, doc_id: str, doc: Dict[str, Any], meta: Dict[str, Any]):
+        """Index (or re-index) one document."""
+        key = (kind, doc_id)
+        self.remove(kind, doc_id)
+
+        weighted = Counter()
+        for field, weight in FIELD_WEIGHTS[kind].items():
+            for term in tokenize(_field_text(doc.get(field))):
+                weighted[term] += weight
+        length = sum(weighted.values())
+
+        for term, tf in weighted.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            postings[key] = tf
+        self._docs[key] = {
+            "length": length,
+            "terms": list(weighted),
+            "snippet_text": _field_text(doc.get(SNIPPET_FIELD[kind])),
+            "meta": meta,
+        }
+        self._total_length += length
+
+    def remove(self, kind: str, doc_id: str):
+        key = (kind, doc_id)
+        entry = self._docs.pop(key, None)
+        if entry is None:
+            return
+        self._total_length -= entry["length"]
+        for term in entry["terms"]:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def clear(self, kind: Optional[str] = None):
+        """Drop every document, or only those of `kind`."""
+        if kind is not None:
+            for doc_kind, doc_id in [key for key in self._docs if key[0] == kind]:
+                self.remove(doc_kind, doc_id)
+            return
+        self._postings.clear()
+        self._terms.clear()
+        self._docs.clear()
+        self._total_length = 0.0
+
+    # ---------- Reads ----------
+    def _prefix_terms(self, prefix: str) -> Iterable[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            yield term
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        terms = tokenize(query)
+        if not terms or not self._docs:
+            return []
+
+        # Each query term maps to the index terms it matches; the last one
+        # also matches by prefix, discounted so exact hits rank first.
+        expansions = [{term: 1.0} for term in terms]
+        for term in self._prefix_terms(terms[-1]):
+            expansions[-1].setdefault(term, 0.8)
+
+        n_docs = len(self._docs)
+        avg_length = self._total_length / n_docs or 1.0
+        scores: Dict[Tuple[str, str], float] = {}
+        matched: Dict[Tuple[str, str], set] = {}
+        for expansion in expansions:
+            for term, boost in expansion.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    if kind and key[0] != kind:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._docs[key]["length"] / avg_length)
+                    scores[key] = scores.get(key, 0.0) + boost * idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched.setdefault(key, set()).add(term)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {
+                "type": key[0],
+                "id": key[1],
+                "score": round(score, 4),
+                "snippet": self._snippet(self._docs[key]["snippet_text"], matched[key]),
+                **self._docs[key]["meta"],
+            }
+            for key, score in ranked
+        ]
+
+    @staticmethod
+    def _snippet(text: str, terms: set) -> str:
+        """A window of `text` around the first match, HTML-escaped with matches in <mark>."""
+        pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")", re.IGNORECASE)
+        first = pattern.search(text)
+        start = max(0, first.start() - SNIPPET_CHARS // 4) if first else 0
+        window = text[start:start + SNIPPET_CHARS]
+        parts, last = [], 0
+        for match in pattern.finditer(window):
+            parts.append(html.escape(window[last:match.start()]))
+            parts.append("<mark>" + html.escape(match.group(0)) + "</mark>")
+            last = match.end()
+        parts.append(html.escape(window[last:]))
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if start + SNIPPET_CHARS < len(text) else ""
+        return prefix + "".join(parts) + suffix
+
+
+search_index = SearchIndex()
+
+
+# ---------- Document helpers ----------
+def index_post(doc: Dict[str, Any]):
+    """Index a blog post document; unpublished posts are removed from the index."""
+    doc_id = str(doc["_id"])
+    if doc.get("status") != "published":
+        search_index.remove("post", doc_id)
+        return
+    search_index.add("post", doc_id, doc, {"title": doc.get("title"), "slug": doc.get("slug")})
+
+
+def index_project(doc: Dict[str, Any]):
+    search_index.add("project", str(doc["_id"]), doc, {"title": doc.get("title")})
+
+
+async def rebuild_search_index(collections, kinds: Iterable[str] = ("post", "project")):
+    """Rebuild the index, or only the given kinds, from Mongo (startup, or after a bulk change)."""
+    kinds = set(kinds)
+    posts = await collections["blog_posts"].find({"status": "published"}).to_list(None) if "post" in kinds else []
+    projects = await collections["projects"].find().to_list(None) if "project" in kinds else []
+    for kind in kinds:
+        search_index.clear(kind)
+    for post in posts:
+        index_post(post)
+    for project in projects:
+        index_project(project)
+    logger.info(f"Search index built: {len(posts)} posts, {len(projects)} projects.")
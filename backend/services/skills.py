@@ -0,0 +1,143 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models.skill import SkillsGrouped
+from services.responses import EncodedResponse, encode_json
+
+logger = logging.getLogger(__name__)
+
+# One document per category: {_id: category, skills: [...], created_at,
+# updated_at, version}, skills strongest first. Reads are O(categories).
+SOFT_SKILLS_CATEGORY = "Soft Skills"
+SKILL_ORDER = {"level": -1, "name": 1}
+REGROUP_ATTEMPTS = 5
+DUPLICATE_KEY = 11000
+
+
+def _group_pipeline(match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"$match": match},
+        {"$sort": {"category": 1, **SKILL_ORDER}},
+        {"$group": {
+            "_id": "$category",
+            "skills": {"$push": {
+                "_id": "$_id",
+                "name": "$name",
+                "level": "$level",
+                "years_experience": {"$ifNull": ["$years_experience", None]},
+            }},
+            "created_at": {"$min": "$created_at"},
+        }},
+    ]
+
+
+async def load_skill_groups(categories) -> EncodedResponse:
+    """The grouped view from the materialized categories, in category creation order."""
+    technical, soft = {}, []
+    async for category in categories.find().sort([("created_at", 1), ("_id", 1)]):
+        if category["_id"] == SOFT_SKILLS_CATEGORY:
+            soft = [skill["name"] for skill in category["skills"]]
+        else:
+            technical[category["_id"]] = category["skills"]
+    return encode_json({"technical": technical, "soft": soft}, SkillsGrouped)
+
+
+async def apply_skill_changes(skills, categories, written: List[Dict[str, Any]], deleted: List[ObjectId]):
+    """
+    Regroup the categories touched by written and deleted skills: the
+    categories the skills are written to plus the ones holding them now
+    (a changed category moves them). Each category is recomputed from
+    `skills` itself rather than patched with the handler's copies, so
+    concurrent writes cannot leave a skill in two places or a stale entry.
+    """
+    ids = [skill["_id"] for skill in written] + list(deleted)
+    if not ids:
+        return
+    names = {skill["category"] for skill in written}
+    names.update([doc["_id"] async for doc in categories.find({"skills._id": {"$in": ids}}, {"_id": 1})])
+    for _ in range(REGROUP_ATTEMPTS):
+        names = await _regroup(skills, categories, names)
+        if not names:
+            return
+    logger.error(f"Gave up regrouping skill categories {sorted(names)} after {REGROUP_ATTEMPTS} attempts")
+
+
+async def _regroup(skills, categories, names: Set[str]) -> Set[str]:
+    """
+    Recompute `names` with one unordered bulk_write; returns the categories
+    not written. The category versions are read before the skills, and each
+    write is conditional on the version read: a regroup that read the
+    skills before a concurrent one wrote them loses the race (no match, so
+    the upsert fails with a duplicate key error, or the delete removes
+    nothing) and is recomputed from fresh skills.
+    """
+    names = list(names)
+    versions = {doc["_id"]: doc.get("version") async for doc in categories.find({"_id": {"$in": names}}, {"version": 1})}
+    groups = {group["_id"]: group for group in await skills.aggregate(_group_pipeline({"category": {"$in": names}})).to_list(None)}
+    now = datetime.utcnow()
+    requests, targets, deletes = [], [], []
+    for name in names:
+        version = versions.get(name)
+        current = {"version": {"$exists": False} if version is None else version}
+        group = groups.get(name)
+        if group:
+            requests.append(UpdateOne(
+                {"_id": name, **current},
+                {
+                    "$set": {"skills": group["skills"], "created_at": group["created_at"] or now, "updated_at": now},
+                    "$inc": {"version": 1},
+                },
+                upsert=True,
+            ))
+            targets.append(name)
+        elif name in versions:
+            requests.append(DeleteOne({"_id": name, **current}))
+            targets.append(name)
+            deletes.append(name)
+    if not requests:
+        return set()
+    unwritten = set()
+    try:
+        result = await categories.bulk_write(requests, ordered=False)
+        deleted_count = result.deleted_count
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            if error.get("code") != DUPLICATE_KEY:
+                raise
+            unwritten.add(targets[error["index"]])
+        deleted_count = e.details.get("nRemoved", 0)
+    if deleted_count < len(deletes):
+        # Deletes do not say which one missed; regrouping twice is harmless.
+        unwritten.update(deletes)
+    return unwritten
+
+
+async def rebuild_skill_categories(skills, categories) -> int:
+    """Regroup every skill with one $group aggregation; for seeding and backfills."""
+    groups = await skills.aggregate(_group_pipeline({})).to_list(None)
+    now = datetime.utcnow()
+    requests = [
+        UpdateOne(
+            {"_id": group["_id"]},
+            {
+                "$set": {"skills": group["skills"], "created_at": group["created_at"] or now, "updated_at": now},
+                "$inc": {"version": 1},
+            },
+            upsert=True,
+        )
+        for group in groups
+    ]
+    requests.append(DeleteMany({"_id": {"$nin": [group["_id"] for group in groups]}}))
+    await categories.bulk_write(requests, ordered=False)
+    return len(groups)
+
+
+async def ensure_skill_categories(skills, categories):
+    """Backfill the materialized view for databases seeded before it existed."""
+    if await categories.count_documents({}, limit=1) == 0 and await skills.count_documents({}, limit=1):
+        await rebuild_skill_categories(skills, categories)
@@ -0,0 +1,242 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from routes.public import (
+    BOOTSTRAP_SECTIONS,
+    load_blog_post,
+    load_blog_posts,
+    load_certifications,
+    load_education,
+    load_experience,
+    load_featured_blog_posts,
+    load_featured_projects,
+    load_personal_info,
+    load_project,
+    load_projects,
+    load_skills,
+    load_testimonials,
+    splice_sections,
+)
+from services.compression import coded_etag
+from services.invalidation import collection_fingerprint
+from services.responses import EncodedResponse
+
+try:
+    import brotli
+except ImportError:  # optional: .br variants are skipped without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+# Public list routes: URL path -> (collection, loader). Each is exported as
+# its default first page, exactly as the API serves it without parameters.
+LIST_RESOURCES = {
+    "/api/personal": ("personal_info", load_personal_info),
+    "/api/projects": ("projects", load_projects),
+    "/api/projects/featured": ("projects", load_featured_projects),
+    "/api/experience": ("experiences", load_experience),
+    "/api/skills": ("skill_categories", load_skills),
+    "/api/education": ("education", load_education),
+    "/api/certifications": ("certifications", load_certifications),
+    "/api/blog": ("blog_posts", load_blog_posts),
+    "/api/blog/featured": ("blog_posts", load_featured_blog_posts),
+    "/api/testimonials": ("testimonials", load_testimonials),
+}
+
+
+class SnapshotConflict(Exception):
+    """Raised by run() when two resources map to the same URL path (and file)."""
+
+
+def _stamp(*parts: Any) -> str:
+    """Source version of a resource; it is re-exported when this changes."""
+    return ":".join(part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+
+
+def _safe_segment(value: str) -> bool:
+    return bool(value) and "/" not in value and "\\" not in value and not value.startswith(".")
+
+
+class Resource:
+    __slots__ = ("path", "stamp", "load")
+
+    def __init__(self, path: str, stamp: str, load: Callable[[], Awaitable[Optional[EncodedResponse]]]):
+        self.path = path
+        self.stamp = stamp
+        self.load = load
+
+
+class SnapshotExporter:
+    """
+    Pre-renders every public GET response to `out_dir` for a CDN or nginx to
+    serve without the API process.
+
+    Each resource is written as <path>.json (the exact bytes the API returns)
+    plus .json.gz and, when brotli is installed, .json.br. `manifest.json`
+    maps each URL path to its files, ETag, SHA-256, sizes, response headers
+    and the source stamp it was built from. On the next run only resources
+    whose stamp changed are loaded and written again: list routes are stamped
+    with their collection fingerprint (count and newest updated_at), single
+    projects and posts with their own updated_at and version. Files of projects and posts that no longer exist are removed.
+
+    A post or project whose path is also another resource's (a post with
+    the slug `featured` and /api/blog/featured) would silently overwrite
+    it, so run() raises SnapshotConflict before writing anything.
+    """
+
+    def __init__(self, collections, out_dir: Path, force: bool = False):
+        self.collections = collections
+        self.out_dir = Path(out_dir)
+        self.force = force
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+
+    # ---------- Manifest ----------
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        path = self.out_dir / MANIFEST_NAME
+        if self.force or not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text()).get("resources", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot manifest: {e}")
+            return {}
+
+    def _write_manifest(self, resources: Dict[str, Dict[str, Any]]):
+        manifest = {
+            "generated_at": datetime.utcnow().isoformat(),
+            "encodings": ["gzip", "br"] if brotli else ["gzip"],
+            "resources": dict(sorted(resources.items())),
+        }
+        self._write(MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+
+    # ---------- Files ----------
+    def _write(self, name: str, data: bytes):
+        target = self.out_dir / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    def _remove(self, entry: Dict[str, Any]):
+        for name in [entry["file"], *(variant["file"] for variant in entry["encodings"].values())]:
+            try:
+                (self.out_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _files_exist(self, entry: Dict[str, Any]) -> bool:
+        names = [entry["file"], *(variant["file"] for variant in entry["encodings"].values())]
+        return all((self.out_dir / name).exists() for name in names)
+
+    def _export(self, resource: Resource, encoded: EncodedResponse) -> Dict[str, Any]:
+        body = encoded.body
+        name = resource.path.lstrip("/") + ".json"
+        variants = {"gzip": (name + ".gz", gzip.compress(body, compresslevel=9, mtime=0))}
+        if brotli:
+            variants["br"] = (name + ".br", brotli.compress(body, quality=11))
+        self._write(name, body)
+        for file_name, data in variants.values():
+            self._write(file_name, data)
+        return {
+            "file": name,
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "etag": encoded.etag,
+            "bytes": len(body),
+            "headers": dict(encoded.headers),
+            "encodings": {
+                encoding: {"file": file_name, "bytes": len(data), "etag": coded_etag(encoded.etag, encoding)}
+                for encoding, (file_name, data) in variants.items()
+            },
+            "stamp": resource.stamp,
+        }
+
+    # ---------- Resources ----------
+    async def _resources(self) -> List[Resource]:
+        c = self.collections
+        names = {collection for collection, _ in LIST_RESOURCES.values()}
+        names.update(collection for collection, _, _ in BOOTSTRAP_SECTIONS.values())
+        fingerprints = {name: _stamp(*await collection_fingerprint(c[name])) for name in sorted(names)}
+
+        resources = [
+            Resource(path, fingerprints[collection], lambda load=load, collection=collection: load(c[collection]))
+            for path, (collection, load) in LIST_RESOURCES.items()
+        ]
+
+        sections = list(BOOTSTRAP_SECTIONS)
+
+        async def load_bootstrap():
+            encoded = []
+            for name in sections:
+                collection, _, load = BOOTSTRAP_SECTIONS[name]
+                encoded.append(await load(c[collection]))
+            return splice_sections(sections, encoded)
+
+        bootstrap_stamp = "|".join(fingerprints[BOOTSTRAP_SECTIONS[name][0]] for name in sections)
+        resources.append(Resource("/api/bootstrap", bootstrap_stamp, load_bootstrap))
+
+        async for project in c["projects"].find({}, {"updated_at": 1, "version": 1}):
+            project_id = str(project["_id"])
+            resources.append(Resource(
+                f"/api/projects/{project_id}",
+                _stamp(project.get("updated_at"), project.get("version", 0)),
+                lambda project_id=project_id: load_project(c["projects"], project_id),
+            ))
+
+        async for post in c["blog_posts"].find({"status": "published"}, {"slug": 1, "updated_at": 1, "version": 1}):
+            slug = post.get("slug")
+            if not _safe_segment(slug or ""):
+                logger.warning(f"Skipping blog post {post['_id']}: slug {slug!r} is not a safe file name")
+                continue
+            resources.append(Resource(
+                f"/api/blog/{slug}",
+                _stamp(post.get("updated_at"), post.get("version", 0)),
+                lambda slug=slug: load_blog_post(c["blog_posts"], slug),
+            ))
+        return resources
+
+    # ---------- Run ----------
+    async def run(self) -> Dict[str, int]:
+        previous = self._read_manifest()
+        resources: Dict[str, Dict[str, Any]] = {}
+
+        all_resources = await self._resources()
+        clashes = sorted(path for path, count in Counter(r.path for r in all_resources).items() if count > 1)
+        if clashes:
+            raise SnapshotConflict(f"Several resources export to {', '.join(clashes)}; rename the colliding slugs or ids")
+
+        for resource in all_resources:
+            entry = previous.get(resource.path)
+            if entry and entry["stamp"] == resource.stamp and self._files_exist(entry):
+                resources[resource.path] = entry
+                self.unchanged.append(resource.path)
+                continue
+            encoded = await resource.load()
+            if encoded is None:
+                # e.g. no personal info yet: nothing to serve, the API 404s too.
+                continue
+            if entry and entry["sha256"] == hashlib.sha256(encoded.body).hexdigest() and self._files_exist(entry):
+                # Touched but byte-identical: keep the files, record the new stamp.
+                resources[resource.path] = {**entry, "stamp": resource.stamp}
+                self.unchanged.append(resource.path)
+                continue
+            resources[resource.path] = self._export(resource, encoded)
+            self.written.append(resource.path)
+
+        for path, entry in previous.items():
+            if path not in resources:
+                self._remove(entry)
+                self.removed.append(path)
+
+        self._write_manifest(resources)
+        return {"written": len(self.written), "unchanged": len(self.unchanged), "removed": len(self.removed)}
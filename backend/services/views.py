@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import heapq
+import logging
+import math
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import Binary
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from services.rate_limit import client_ip
+
+logger = logging.getLogger(__name__)
+
+VIEW_KINDS = ("project", "post", "page")
+TOP_SIZE = 50  # most-viewed entries kept ready per kind
+FLUSH_ATTEMPTS = 5  # rounds of writes per flush before keys are requeued
+DUPLICATE_KEY = 11000
+
+# Frontend routes (see frontend/src/App.js) counted as pages. Detail pages
+# are counted per route template; the item itself is a project/post view.
+PAGE_ROUTES = ("/", "/about", "/projects", "/projects/:id", "/experience", "/skills", "/blog", "/blog/:slug", "/contact")
+DETAIL_ROUTES = {"projects": "/projects/:id", "blog": "/blog/:slug"}
+
+
+def page_route(path: str) -> Optional[str]:
+    """The PAGE_ROUTES entry for a frontend path, or None for anything else."""
+    path = path.rstrip("/") or "/"
+    if path in PAGE_ROUTES:
+        return path
+    section, _, item = path[1:].partition("/")
+    if section in DETAIL_ROUTES and item and "/" not in item:
+        return DETAIL_ROUTES[section]
+    return None
+
+
+class HyperLogLog:
+    """
+    Cardinality sketch: 2**p one-byte registers, standard error about
+    1.04 / sqrt(2**p) (3.2% at p=10, 1 KiB). Sketches merge by taking the
+    register-wise maximum, so merging is idempotent.
+    """
+
+    __slots__ = ("p", "registers")
+
+    def __init__(self, p: int = 10, registers: Optional[bytes] = None):
+        self.p = p
+        self.registers = bytearray(registers) if registers is not None else bytearray(1 << p)
+
+    def add(self, value: str):
+        x = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting is more accurate.
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+
+def visitor_id(scope) -> str:
+    """Who is viewing, for the uniques sketch only; never stored as such."""
+    user_agent = ""
+    for name, value in scope["headers"]:
+        if name == b"user-agent":
+            user_agent = value.decode("latin-1")
+            break
+    return f"{client_ip(scope)}|{user_agent}"
+
+
+class ViewCounter:
+    """
+    Write-behind view counters for projects, blog posts and pages.
+
+    record() only touches memory: it bumps the pending count for the key and
+    adds the visitor to the key's HyperLogLog sketch. A background task
+    flushes pending keys every `flush_interval` seconds or once
+    `flush_events` views accumulate, as one bulk_write of `$inc` upserts
+    (one document per key in `view_counts`). Before writing, the stored
+    sketches of those keys are read with one query and merged in, so
+    replicas' unique counts combine. Each write is conditional on the
+    `sketch_version` that was read, so a replica can never overwrite a sketch
+    it has not merged; keys that lose the race are re-read and retried. The
+    sketch is then dropped from memory and only the totals are kept for
+    most_viewed(). Totals of keys this
+    replica has not seen since start-up reflect the last load.
+
+    Each kind has its own key budget (`max_keys`), so a flood of one kind
+    cannot crowd out the others.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, flush_events: int = 1000, max_keys: Optional[Dict[str, int]] = None, precision: int = 10):
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+        self.max_keys = {"project": 50_000, "post": 50_000, "page": len(PAGE_ROUTES), **(max_keys or {})}
+        self.precision = precision
+        self._keys = {kind: 0 for kind in VIEW_KINDS}  # distinct keys tracked per kind
+        self._collection = None
+        self._pending: Dict[Tuple[str, str], List[Any]] = {}  # key -> [views, sketch]
+        self._pending_events = 0
+        self._totals: Dict[Tuple[str, str], Tuple[int, int]] = {}  # key -> (views, uniques)
+        self._top: Dict[str, List[Dict[str, Any]]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    # ---------- Lifecycle ----------
+    async def start(self, collection):
+        self._collection = collection
+        projection = {"kind": 1, "key": 1, "views": 1, "uniques": 1}
+        for kind in VIEW_KINDS:
+            query = {"kind": kind}
+            if kind == "page":
+                # Ignore page keys stored before paths were restricted to PAGE_ROUTES.
+                query["key"] = {"$in": list(PAGE_ROUTES)}
+            # The most viewed keys, up to this kind's budget.
+            cursor = collection.find(query, projection).sort([("kind", 1), ("views", -1)]).limit(self.max_keys[kind])
+            async for doc in cursor:
+                if (kind, doc["key"]) not in self._totals:
+                    self._keys[kind] += 1
+                self._totals[(kind, doc["key"])] = (doc.get("views", 0), doc.get("uniques", 0))
+        self._top.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write whatever is still pending."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending and not await self._flush():
+            logger.error(f"Lost view counts for {len(self._pending)} keys on shutdown")
+
+    # ---------- Producer ----------
+    def record(self, kind: str, key: str, visitor: str):
+        entry = self._pending.get((kind, key))
+        if entry is None:
+            if (kind, key) not in self._totals:
+                if self._keys.get(kind, 0) >= self.max_keys.get(kind, 0):
+                    # Bounded memory: this kind's budget is used up (or the kind is unknown).
+                    self.dropped += 1
+                    return
+                self._keys[kind] += 1
+            entry = self._pending[(kind, key)] = [0, HyperLogLog(self.precision)]
+        entry[0] += 1
+        entry[1].add(visitor)
+        self.recorded += 1
+        self._pending_events += 1
+        if self._pending_events >= self.flush_events:
+            self._wakeup.set()
+
+    # ---------- Consumer ----------
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._pending:
+                await self._flush()
+
+    async def _flush(self) -> bool:
+        """Write every pending key; keys still unwritten after FLUSH_ATTEMPTS go back to pending."""
+        batch, self._pending, self._pending_events = self._pending, {}, 0
+        for _ in range(FLUSH_ATTEMPTS):
+            try:
+                batch = await self._write(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush view counts for {len(batch)} keys: {e}")
+                break
+            if not batch:
+                return True
+        else:
+            logger.error(f"Gave up flushing view counts for {len(batch)} keys after {FLUSH_ATTEMPTS} attempts")
+        self.failed_flushes += 1
+        self._requeue(batch)
+        return False
+
+    async def _write(self, batch: Dict[Tuple[str, str], List[Any]]) -> Dict[Tuple[str, str], List[Any]]:
+        """
+        One bulk_write of version-checked upserts; returns the keys not
+        written. A key whose stored sketch_version changed since it was read
+        (another replica flushed it) matches nothing and its upsert fails
+        with a duplicate key error, so nothing of it is applied and it is
+        simply read, merged and written again.
+        """
+        keys = list(batch)
+        ids = [f"{kind}:{key}" for kind, key in keys]
+        projection = {"views": 1, "sketch": 1, "sketch_version": 1}
+        stored = {doc["_id"]: doc async for doc in self._collection.find({"_id": {"$in": ids}}, projection)}
+        now = datetime.utcnow()
+        requests, totals = [], []
+        for doc_id, (kind, key) in zip(ids, keys):
+            views, sketch = batch[(kind, key)]
+            doc = stored.get(doc_id) or {}
+            if doc.get("sketch"):
+                sketch.merge(HyperLogLog(self.precision, doc["sketch"]))
+            uniques = sketch.estimate()
+            version = doc.get("sketch_version")
+            requests.append(UpdateOne(
+                {"_id": doc_id, "sketch_version": {"$exists": False} if version is None else version},
+                {
+                    "$inc": {"views": views, "sketch_version": 1},
+                    "$set": {"kind": kind, "key": key, "uniques": uniques, "sketch": Binary(sketch.to_bytes()), "updated_at": now},
+                },
+                upsert=True,
+            ))
+            totals.append((doc.get("views", 0) + views, uniques))
+        unwritten = set()
+        try:
+            await self._collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every request without a write error was applied.
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") != DUPLICATE_KEY:
+                    logger.warning(f"View count write for {ids[error['index']]} failed: {error.get('errmsg')}")
+                unwritten.add(error["index"])
+        for index, key in enumerate(keys):
+            if index not in unwritten:
+                self._totals[key] = totals[index]
+                self.flushed += batch[key][0]
+        self._top.clear()
+        return {keys[index]: batch[keys[index]] for index in unwritten}
+
+    def _requeue(self, batch: Dict[Tuple[str, str], List[Any]]):
+        for key, (views, sketch) in batch.items():
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [views, sketch]
+            else:
+                entry[0] += views
+                entry[1].merge(sketch)
+            self._pending_events += views
+
+    # ---------- Reads ----------
+    def most_viewed(self, kind: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Top keys of `kind` by views as of the last flush; recomputed only after a flush."""
+        top = self._top.get(kind)
+        if top is None:
+            ranked = heapq.nlargest(
+                TOP_SIZE,
+                ((views, uniques, key) for (k, key), (views, uniques) in self._totals.items() if k == kind),
+            )
+            top = self._top[kind] = [{"key": key, "views": views, "uniques": uniques} for views, uniques, key in ranked]
+        return top[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked_keys": len(self._totals),
+            "keys": dict(self._keys),
+            "pending_keys": len(self._pending),
+            "pending_views": sum(views for views, _ in self._pending.values()),
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+view_counter = ViewCounter(
+    flush_interval=float(os.environ.get("VIEW_FLUSH_INTERVAL_SECONDS", "5")),
+    flush_events=int(os.environ.get("VIEW_FLUSH_EVENTS", "1000")),
+    max_keys={
+        "project": int(os.environ.get("VIEW_MAX_PROJECTS", "50000")),
+        "post": int(os.environ.get("VIEW_MAX_POSTS", "50000")),
+    },
+)
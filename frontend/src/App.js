@@ -4,6 +4,7 @@ import { BrowserRouter, Routes, Route } from "react-router-dom";
 import { Toaster } from "./components/ui/toaster";
 import Header from "./components/common/Header";
 import Footer from "./components/common/Footer";
+import PageViewTracker from "./components/common/PageViewTracker";
 import Home from "./pages/Home";
 import About from "./pages/About";
 import Projects from "./pages/Projects";
@@ -19,6 +20,7 @@ function App() {
   return (
     <div className="App min-h-screen bg-white dark:bg-gray-900 transition-colors duration-300">
       <BrowserRouter>
+        <PageViewTracker />
         <Header />
         <main className="pt-20">
           <Routes>
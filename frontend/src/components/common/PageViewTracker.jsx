@@ -0,0 +1,17 @@
+import { useEffect } from 'react';
+import { useLocation } from 'react-router-dom';
+import { api } from '../../services/api';
+
+// Reports each route change to the view counter; failures are ignored.
+const PageViewTracker = () => {
+  const location = useLocation();
+
+  useEffect(() => {
+    if (location.pathname.startsWith('/admin')) return;
+    api.recordPageView(location.pathname).catch(() => {});
+  }, [location.pathname]);
+
+  return null;
+};
+
+export default PageViewTracker;
@@ -29,6 +29,10 @@ export const useApi = (apiCall, dependencies = []) => {
 };
 
 // Specific hooks for different data types
+export const useBootstrap = (sections) => {
+  return useApi(() => api.getBootstrap(sections), [sections?.join(',')]);
+};
+
 export const usePersonalInfo = () => {
   return useApi(() => api.getPersonalInfo());
 };
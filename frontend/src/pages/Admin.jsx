@@ -21,7 +21,7 @@ import {
 // FIX: Hardcoded to Render Backend to guarantee connection and stop "Could not reach" errors
 const API_BASE = "https://portfolio-k4cd.onrender.com";
 
-async function fetchJSON(path, options = {}) {
+async function fetchResponse(path, options = {}) {
   // Handle paths that might already have /api or leading slashes
   const cleanPath = path.startsWith('/') ? path.slice(1) : path;
   
@@ -41,10 +41,30 @@ async function fetchJSON(path, options = {}) {
     err.status = res.status;
     throw err;
   }
+  return res;
+}
+
+async function fetchJSON(path, options = {}) {
+  const res = await fetchResponse(path, options);
   if (res.status === 204) return null;
   return res.json();
 }
 
+// Admin lists are paged (at most 500 per request); follow X-Next-Cursor to the last page.
+async function fetchAllPages(path) {
+  const items = [];
+  let cursor = null;
+  do {
+    const query = `limit=500${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ""}`;
+    const res = await fetchResponse(`${path}${path.includes("?") ? "&" : "?"}${query}`);
+    const page = await res.json();
+    if (!Array.isArray(page)) return page;
+    items.push(...page);
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
+
 /* ---- Normalizers to ensure IDs exist ---- */
 function normalizeItem(it) {
   if (!it) return it;
@@ -132,7 +152,9 @@ function useAdminList(key, { mockMode, defaultValue }) {
       try {
         if (!mockMode) {
           // Live API fetch
-          const data = await fetchJSON(`admin/${key}`);
+          const data = Array.isArray(defaultValue)
+            ? await fetchAllPages(`admin/${key}`)
+            : await fetchJSON(`admin/${key}`);
           if (mounted) {
             const normed = Array.isArray(defaultValue)
               ? normalizeList(Array.isArray(data) ? data : [])
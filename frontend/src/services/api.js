@@ -25,9 +25,25 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Admin lists are paged (at most 500 per request): follow X-Next-Cursor and
+// resolve to the first response with `data` holding every page's items.
+const getAllPages = async (path) => {
+  const first = await apiClient.get(path, { params: { limit: 500 } });
+  const data = [...first.data];
+  let cursor = first.headers['x-next-cursor'];
+  while (cursor) {
+    const page = await apiClient.get(path, { params: { limit: 500, cursor } });
+    data.push(...page.data);
+    cursor = page.headers['x-next-cursor'];
+  }
+  return { ...first, data };
+};
+
 // FIX: Export 'api' as a named constant AND default to fix Vercel build errors
 export const api = {
   // Public Routes
+  // Home page data in one request; `sections` is an optional array such as ['personal', 'projects']
+  getBootstrap: (sections) => apiClient.get(`/bootstrap${sections?.length ? `?sections=${sections.join(',')}` : ''}`),
   getPersonalInfo: () => apiClient.get('/personal'),
   getProjects: () => apiClient.get('/projects'),
   getProjectById: (id) => apiClient.get(`/projects/${id}`),
@@ -41,12 +57,15 @@ export const api = {
   getFeaturedBlogPosts: () => apiClient.get('/blog/featured'),
   getTestimonials: () => apiClient.get('/testimonials'),
   submitContactMessage: (data) => apiClient.post('/contact', data),
+  recordPageView: (page) => apiClient.post('/views', { page }),
+  // kind: 'project', 'post' or 'page'
+  getMostViewed: (kind = 'project', limit = 10) => apiClient.get(`/views/most-viewed?kind=${kind}&limit=${limit}`),
   
   // Admin Routes
   admin: {
     updatePersonalInfo: (data) => apiClient.put('/admin/personal', data),
     
-    getProjects: () => apiClient.get('/admin/projects'),
+    getProjects: () => getAllPages('/admin/projects'),
     createProject: (data) => apiClient.post('/admin/projects', data),
     updateProject: (id, data) => apiClient.put(`/admin/projects/${id}`, data),
     deleteProject: (id) => apiClient.delete(`/admin/projects/${id}`),
@@ -55,12 +74,12 @@ export const api = {
     updateExperience: (id, data) => apiClient.put(`/admin/experience/${id}`, data),
     deleteExperience: (id) => apiClient.delete(`/admin/experience/${id}`),
 
-    getSkills: () => apiClient.get('/admin/skills'),
+    getSkills: () => getAllPages('/admin/skills'),
     createSkill: (data) => apiClient.post('/admin/skills', data),
     updateSkill: (id, data) => apiClient.put(`/admin/skills/${id}`, data),
     deleteSkill: (id) => apiClient.delete(`/admin/skills/${id}`),
 
-    getContactMessages: () => apiClient.get('/admin/messages'),
+    getContactMessages: () => getAllPages('/admin/messages'),
     updateMessageStatus: (id, status) => apiClient.put(`/admin/messages/${id}`, { status }),
   },
 };
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# The backend is run from backend/ (flat imports such as `from services...`).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from dependencies import CollectionHandles, get_collections, get_read_collections  # noqa: E402
+from server import app  # noqa: E402
+from services.cache import query_cache  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def database():
+    """A fresh in-memory database."""
+    return AsyncMongoMockClient()["portfolio_test"]
+
+
+@pytest.fixture
+def collections(database):
+    """Collection handles over `database`."""
+    return CollectionHandles(database)
+
+
+@pytest.fixture
+async def client(collections):
+    """An HTTP client for the app, with every route using `collections`."""
+    app.dependency_overrides[get_collections] = lambda: collections
+    app.dependency_overrides[get_read_collections] = lambda: collections
+    query_cache.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+    app.dependency_overrides.clear()
+    query_cache.clear()
+
+
+def project_payload(title: str = "Project", **overrides):
+    payload = {
+        "title": title,
+        "description": "A project",
+        "short_description": "Short",
+        "image": "https://example.com/image.png",
+        "live_url": "https://example.com",
+        "github_url": "https://github.com/example/project",
+        "category": "Web",
+        "start_date": "2024-01-01",
+        "end_date": "2024-06-01",
+    }
+    payload.update(overrides)
+    return payload
@@ -0,0 +1,82 @@
+import pytest
+from bson import ObjectId
+
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_project(client, title: str = "Project") -> str:
+    response = await client.post("/api/admin/projects", json=project_payload(title))
+    assert response.status_code == 200
+    return response.json()["_id"]
+
+
+async def run_batch(client, operations, ordered: bool = True):
+    response = await client.post("/api/admin/projects/batch", json={"ordered": ordered, "operations": operations})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_results_follow_request_order(client):
+    keep, drop = await create_project(client, "Keep"), await create_project(client, "Drop")
+    result = await run_batch(client, [
+        {"op": "update", "id": keep, "data": {"title": "Kept"}},
+        {"op": "delete", "id": drop},
+        {"op": "delete", "id": str(ObjectId())},
+        {"op": "create", "data": project_payload("New")},
+    ])
+    assert [item["status"] for item in result["results"]] == ["updated", "deleted", "not_found", "created"]
+    assert result["counts"] == {"updated": 1, "deleted": 1, "not_found": 1, "created": 1}
+    assert result["written"] == {"inserted": 1, "matched": 1, "modified": 1, "deleted": 1}
+    titles = sorted(project["title"] for project in (await client.get("/api/admin/projects")).json())
+    assert titles == ["Kept", "New"]
+
+
+async def test_operations_after_a_delete_of_the_same_id_are_not_found(client):
+    project_id = await create_project(client)
+    result = await run_batch(client, [
+        {"op": "delete", "id": project_id},
+        {"op": "update", "id": project_id, "data": {"title": "Gone"}},
+        {"op": "delete", "id": project_id},
+    ])
+    assert [item["status"] for item in result["results"]] == ["deleted", "not_found", "not_found"]
+    assert result["written"]["deleted"] == 1
+
+
+async def test_repeated_updates_of_one_id_all_apply(client):
+    project_id = await create_project(client)
+    result = await run_batch(client, [
+        {"op": "update", "id": project_id, "data": {"title": "One"}},
+        {"op": "update", "id": project_id, "data": {"title": "Two"}},
+    ])
+    assert [item["status"] for item in result["results"]] == ["updated", "updated"]
+    project = (await client.get(f"/api/admin/projects/{project_id}")).json()
+    assert project["title"] == "Two"
+    assert project["version"] == 3
+
+
+async def test_update_of_concurrently_deleted_document_is_not_found(collections, client, monkeypatch):
+    project_id = await create_project(client)
+    bulk_write = type(collections["projects"]).bulk_write
+
+    async def delete_first(self, requests, **kwargs):
+        # Another writer removes the document between the existence check and the write.
+        await self.delete_one({"_id": ObjectId(project_id)})
+        return await bulk_write(self, requests, **kwargs)
+
+    monkeypatch.setattr(type(collections["projects"]), "bulk_write", delete_first)
+    result = await run_batch(client, [{"op": "update", "id": project_id, "data": {"title": "Late"}}])
+    assert [item["status"] for item in result["results"]] == ["not_found"]
+    assert result["written"]["matched"] == 0
+
+
+async def test_invalid_operation_rejects_the_whole_batch(client):
+    project_id = await create_project(client)
+    response = await client.post("/api/admin/projects/batch", json={"operations": [
+        {"op": "delete", "id": project_id},
+        {"op": "update", "id": "not-an-id", "data": {}},
+    ]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["index"] == 1
+    assert (await client.get(f"/api/admin/projects/{project_id}")).status_code == 200
@@ -0,0 +1,34 @@
+import pytest
+
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bootstrap_matches_the_section_endpoints(client):
+    await client.post("/api/admin/projects", json=project_payload())
+    await client.post("/api/admin/skills", json={"name": "Python", "category": "Languages", "level": 90})
+    body = (await client.get("/api/bootstrap")).json()
+    assert list(body) == ["personal", "projects", "skills", "experience", "testimonials", "blog"]
+    assert body["personal"] is None
+    assert body["projects"] == (await client.get("/api/projects/featured")).json()
+    assert body["skills"] == (await client.get("/api/skills")).json()
+    assert body["experience"] == []
+
+
+async def test_sections_are_returned_in_canonical_order(client):
+    body = (await client.get("/api/bootstrap", params={"sections": "skills, projects"})).json()
+    assert list(body) == ["projects", "skills"]
+
+
+async def test_unknown_section_is_400(client):
+    response = await client.get("/api/bootstrap", params={"sections": "projects,nope"})
+    assert response.status_code == 400
+    assert "nope" in response.json()["detail"]
+
+
+async def test_cached_bootstrap_is_invalidated_by_a_write(client):
+    assert (await client.get("/api/bootstrap")).json()["projects"] == []
+    await client.post("/api/admin/projects", json=project_payload("Fresh"))
+    projects = (await client.get("/api/bootstrap")).json()["projects"]
+    assert [project["title"] for project in projects] == ["Fresh"]
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from services.cache import _MISSING, QueryCache
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_get_or_load_caches_until_invalidated():
+    cache = QueryCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert await cache.get_or_load("projects", "all", loader) == 1
+    assert await cache.get_or_load("projects", "all", loader) == 1
+    cache.invalidate("projects")
+    assert await cache.get_or_load("projects", "all", loader) == 2
+
+
+async def test_invalidate_only_drops_the_given_collection():
+    cache = QueryCache()
+    cache.set("projects", "all", "projects")
+    cache.set("skills", "all", "skills")
+    cache.invalidate("projects")
+    assert cache.get("projects", "all") is _MISSING
+    assert cache.get("skills", "all") == "skills"
+
+
+async def test_invalidate_reaches_dependent_namespaces():
+    cache = QueryCache()
+    cache.depend("bootstrap", "projects", "skills")
+    cache.set("bootstrap", ("projects",), "body")
+    cache.invalidate("skills")
+    assert cache.get("bootstrap", ("projects",)) is _MISSING
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = QueryCache()
+    calls = []
+    release = asyncio.Event()
+
+    async def loader():
+        calls.append(1)
+        await release.wait()
+        return "value"
+
+    waiters = [asyncio.create_task(cache.get_or_load("projects", "all", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["value"] * 5
+    assert len(calls) == 1
+
+
+async def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    cache = QueryCache()
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(cache.get_or_load("projects", "all", loader))
+    second = asyncio.create_task(cache.get_or_load("projects", "all", loader))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "value"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert cache.get("projects", "all") == "value"
+
+
+async def test_load_started_before_invalidation_is_not_cached():
+    cache = QueryCache()
+    release = asyncio.Event()
+
+    async def stale_loader():
+        await release.wait()
+        return "stale"
+
+    pending = asyncio.create_task(cache.get_or_load("projects", "all", stale_loader))
+    await asyncio.sleep(0)
+    cache.invalidate("projects")
+    release.set()
+    assert await pending == "stale"
+    assert cache.get("projects", "all") is _MISSING
+
+
+async def test_admin_write_invalidates_public_list(client):
+    assert (await client.get("/api/projects")).json() == []
+    created = await client.post("/api/admin/projects", json=project_payload("First"))
+    assert created.status_code == 200
+    titles = [project["title"] for project in (await client.get("/api/projects")).json()]
+    assert titles == ["First"]
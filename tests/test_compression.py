@@ -0,0 +1,61 @@
+import gzip
+
+import pytest
+
+from services.compression import Compressor, compressor, parse_accept_encoding
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+
+def test_accept_encoding_q_values():
+    assert parse_accept_encoding("gzip;q=0.5, br, *;q=0") == {"gzip": 0.5, "br": 1.0, "*": 0.0}
+
+
+def test_negotiation_prefers_the_best_accepted_coding():
+    gzip_only = Compressor()
+    gzip_only.encodings = ("gzip",)
+    assert gzip_only.negotiate("br, gzip;q=0.5") == "gzip"
+    assert gzip_only.negotiate("gzip;q=0") is None
+    assert gzip_only.negotiate("*") == "gzip"
+    assert gzip_only.negotiate(None) is None
+
+
+async def test_cached_bodies_are_compressed_once_per_version(client):
+    for index in range(6):
+        await client.post("/api/admin/projects", json=project_payload(f"Project {index}"))
+    headers = {"Accept-Encoding": "gzip"}
+    first = await client.get("/api/projects", headers=headers)
+    hits = compressor.variant_hits
+    second = await client.get("/api/projects", headers=headers)
+    assert compressor.variant_hits == hits + 1
+    assert first.content == second.content
+    assert first.headers["content-encoding"] == "gzip"
+
+
+async def test_small_bodies_are_sent_as_is(client):
+    response = await client.get("/api/projects", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "accept-encoding" not in response.headers.get("vary", "").lower()
+
+
+async def test_middleware_compresses_other_json_and_codes_its_etag(client):
+    created = (await client.post("/api/admin/projects", json=project_payload(description="long " * 400))).json()
+    response = await client.get(f"/api/admin/projects/{created['_id']}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"1-gzip"'
+    assert response.json()["description"].startswith("long ")
+
+
+async def test_streamed_exports_pass_through(client):
+    for index in range(10):
+        await client.post("/api/admin/projects", json=project_payload(f"Project {index}", description="long " * 100))
+    response = await client.get("/api/admin/export/projects", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert len(response.text.splitlines()) == 10
+
+
+def test_gzip_output_is_deterministic():
+    body = b'{"a":1}' * 200
+    assert Compressor._compress(body, "gzip", 6) == Compressor._compress(body, "gzip", 6)
+    assert gzip.decompress(Compressor._compress(body, "gzip", 6)) == body
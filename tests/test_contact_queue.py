@@ -0,0 +1,86 @@
+import os
+
+import pytest
+from bson import ObjectId, json_util
+
+from services import contact_queue as contact_queue_module
+from services.contact_queue import ContactQueue, ContactQueueFull, _lock_path, _try_lock, _unlock
+
+pytestmark = pytest.mark.anyio
+
+
+def message(name: str = "Ada") -> dict:
+    return {"name": name, "email": "ada@example.com", "subject": "Hi", "message": "Hello"}
+
+
+def write_spool(path, docs):
+    path.write_text("".join(json_util.dumps(doc) + "\n" for doc in docs), encoding="utf-8")
+
+
+async def test_messages_are_flushed_and_the_spool_removed_on_stop(collections, tmp_path):
+    queue = ContactQueue(batch_size=2, flush_interval=60, spool_path=tmp_path / "contact_spool.jsonl")
+    await queue.start(collections["contact_messages"])
+    ids = [queue.submit(message(name)) for name in ("a", "b", "c")]
+    await queue.stop()
+    stored = await collections["contact_messages"].find().to_list(None)
+    assert sorted(doc["_id"] for doc in stored) == sorted(ids)
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_full_queue_rejects(collections):
+    queue = ContactQueue(max_size=1, flush_interval=60)
+    queue.submit(message())
+    with pytest.raises(ContactQueueFull):
+        queue.submit(message())
+    assert (queue.accepted, queue.rejected) == (1, 1)
+
+
+async def test_orphaned_and_legacy_spools_are_replayed_once(collections, tmp_path):
+    spool_path = tmp_path / "contact_spool.jsonl"
+    orphan = {**message("orphan"), "_id": ObjectId()}
+    legacy = {**message("legacy"), "_id": ObjectId()}
+    write_spool(tmp_path / "contact_spool.gone-1.jsonl", [orphan])
+    write_spool(spool_path, [legacy])
+    await collections["contact_messages"].insert_one(dict(legacy))  # flushed before the crash
+
+    queue = ContactQueue(flush_interval=60, spool_path=spool_path)
+    await queue.start(collections["contact_messages"])
+    await queue.stop()
+    names = sorted(doc["name"] for doc in await collections["contact_messages"].find().to_list(None))
+    assert names == ["legacy", "orphan"]
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_a_live_workers_spool_is_left_alone(collections, tmp_path):
+    live = tmp_path / "contact_spool.live-2.jsonl"
+    write_spool(live, [{**message("live"), "_id": ObjectId()}])
+    held = _try_lock(_lock_path(live))
+    try:
+        queue = ContactQueue(flush_interval=60, spool_path=tmp_path / "contact_spool.jsonl")
+        await queue.start(collections["contact_messages"])
+        await queue.stop()
+    finally:
+        _unlock(held, _lock_path(live))
+    assert await collections["contact_messages"].count_documents({}) == 0
+    assert live.exists()
+
+
+def test_lock_on_a_released_and_replaced_file_is_not_kept(tmp_path, monkeypatch):
+    lock_path = tmp_path / "spool.jsonl.lock"
+    holder = _try_lock(lock_path)
+    flock = contact_queue_module.fcntl.flock
+    replaced = []
+
+    def racing_flock(handle, flags):
+        # The holder releases (removing the file) and a third process locks a
+        # new file at the same path, between our open() and flock().
+        if not replaced:
+            replaced.append(None)
+            _unlock(holder, lock_path)
+            replaced[0] = _try_lock(lock_path)
+        flock(handle, flags)
+
+    monkeypatch.setattr(contact_queue_module.fcntl, "flock", racing_flock)
+    assert _try_lock(lock_path) is None
+    assert os.path.samestat(os.fstat(replaced[0].fileno()), os.stat(lock_path))
+    replaced[0].close()
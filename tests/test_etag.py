@@ -0,0 +1,47 @@
+import pytest
+
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+async def test_matching_if_none_match_is_a_bare_304(client):
+    await client.post("/api/admin/projects", json=project_payload())
+    first = await client.get("/api/projects", headers=IDENTITY)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    again = await client.get("/api/projects", headers={**IDENTITY, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+
+async def test_weak_and_listed_tags_match(client):
+    etag = (await client.get("/api/projects", headers=IDENTITY)).headers["etag"]
+    response = await client.get("/api/projects", headers={**IDENTITY, "If-None-Match": f'"other", W/{etag}'})
+    assert response.status_code == 304
+
+
+async def test_etag_changes_after_a_write(client):
+    etag = (await client.get("/api/projects", headers=IDENTITY)).headers["etag"]
+    await client.post("/api/admin/projects", json=project_payload())
+    response = await client.get("/api/projects", headers={**IDENTITY, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_compressed_variant_has_its_own_etag_and_revalidates(client):
+    for index in range(6):
+        await client.post("/api/admin/projects", json=project_payload(f"Project {index}"))
+    plain = await client.get("/api/projects", headers=IDENTITY)
+    coded = await client.get("/api/projects", headers={"Accept-Encoding": "gzip"})
+    assert coded.headers["content-encoding"] == "gzip"
+    assert coded.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert coded.content == plain.content  # decoded by the client
+
+    response = await client.get("/api/projects", headers={"Accept-Encoding": "gzip", "If-None-Match": coded.headers["etag"]})
+    assert response.status_code == 304
+    assert response.headers["etag"] == coded.headers["etag"]
+    assert "accept-encoding" in response.headers["vary"].lower()
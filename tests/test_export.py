@@ -0,0 +1,56 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from services import export
+from services.export import stream_collection
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_projects(client, count):
+    for index in range(count):
+        response = await client.post("/api/admin/projects", json=project_payload(f"Project {index}"))
+        assert response.status_code == 200
+
+
+async def test_ndjson_export_has_one_document_per_line(client):
+    await create_projects(client, 3)
+    response = await client.get("/api/admin/export/projects")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="projects.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Project 0", "Project 1", "Project 2"]
+    assert rows[0]["start_date"] == "2024-01-01T00:00:00"
+
+
+async def test_csv_export_uses_model_columns(client):
+    await create_projects(client, 2)
+    response = await client.get("/api/admin/export/projects", params={"format": "csv"})
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0][:3] == ["_id", "title", "description"]
+    assert len(rows) == 3
+    assert json.loads(rows[1][rows[0].index("technologies")]) == []
+
+
+async def test_gzip_export(client):
+    await create_projects(client, 2)
+    response = await client.get("/api/admin/export/projects", params={"gzip": "true"}, headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == "application/gzip"
+    assert len(gzip.decompress(response.content).splitlines()) == 2
+
+
+async def test_unknown_collection_is_404(client):
+    assert (await client.get("/api/admin/export/users")).status_code == 404
+
+
+async def test_large_exports_stream_in_chunks(collections, monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_SIZE", 256)
+    await collections["projects"].insert_many([{"title": f"P{index}", "description": "x" * 100} for index in range(20)])
+    chunks = [chunk async for chunk in stream_collection(collections["projects"], "ndjson", ["_id", "title"])]
+    assert len(chunks) > 1
+    assert len(b"".join(chunks).splitlines()) == 20
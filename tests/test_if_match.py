@@ -0,0 +1,92 @@
+import pytest
+
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_project(client) -> dict:
+    response = await client.post("/api/admin/projects", json=project_payload())
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_update_with_current_version_succeeds(client):
+    project = await create_project(client)
+    response = await client.put(f"/api/admin/projects/{project['_id']}", json={"title": "Renamed"}, headers={"If-Match": '"1"'})
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+
+
+async def test_update_with_stale_version_is_412(client):
+    project = await create_project(client)
+    path = f"/api/admin/projects/{project['_id']}"
+    assert (await client.put(path, json={"title": "First"}, headers={"If-Match": '"1"'})).status_code == 200
+    response = await client.put(path, json={"title": "Second"}, headers={"If-Match": '"1"'})
+    assert response.status_code == 412
+    assert (await client.get(path)).json()["title"] == "First"
+
+
+async def test_delete_with_stale_version_is_412(client):
+    project = await create_project(client)
+    path = f"/api/admin/projects/{project['_id']}"
+    await client.put(path, json={"title": "Changed"})
+    assert (await client.delete(path, headers={"If-Match": '"1"'})).status_code == 412
+    assert (await client.delete(path, headers={"If-Match": '"2"'})).status_code == 200
+
+
+async def test_missing_document_is_404_not_412(client):
+    response = await client.put("/api/admin/projects/000000000000000000000000", json={"title": "x"}, headers={"If-Match": '"1"'})
+    assert response.status_code == 404
+
+
+async def test_etag_from_get_makes_the_next_put_conditional(client):
+    project = await create_project(client)
+    path = f"/api/admin/projects/{project['_id']}"
+    etag = (await client.get(path)).headers["etag"]
+    assert etag == '"1"'
+    first = await client.put(path, json={"title": "First"}, headers={"If-Match": etag})
+    assert first.status_code == 200
+    assert first.headers["etag"] == '"2"'
+    assert (await client.put(path, json={"title": "Second"}, headers={"If-Match": etag})).status_code == 412
+    assert (await client.put(path, json={"title": "Second"}, headers={"If-Match": first.headers["etag"]})).status_code == 200
+
+
+async def test_create_returns_an_etag(client):
+    response = await client.post("/api/admin/projects", json=project_payload())
+    assert response.headers["etag"] == '"1"'
+
+
+async def test_if_match_star_only_requires_the_item_to_exist(client):
+    project = await create_project(client)
+    path = f"/api/admin/projects/{project['_id']}"
+    await client.put(path, json={"title": "Changed"})
+    assert (await client.put(path, json={"title": "Again"}, headers={"If-Match": "*"})).status_code == 200
+    missing = "/api/admin/projects/000000000000000000000000"
+    assert (await client.put(missing, json={"title": "x"}, headers={"If-Match": "*"})).status_code == 404
+
+
+async def test_content_hash_etag_is_412_not_400(client):
+    project = await create_project(client)
+    public_etag = (await client.get(f"/api/projects/{project['_id']}")).headers["etag"]
+    response = await client.put(f"/api/admin/projects/{project['_id']}", json={"title": "x"}, headers={"If-Match": public_etag})
+    assert response.status_code == 412
+
+
+async def test_if_match_list_and_coded_tags(client):
+    project = await create_project(client)
+    path = f"/api/admin/projects/{project['_id']}"
+    assert (await client.put(path, json={"title": "x"}, headers={"If-Match": '"7", "1-gzip"'})).status_code == 200
+
+
+async def test_malformed_if_match_is_400(client):
+    project = await create_project(client)
+    response = await client.put(f"/api/admin/projects/{project['_id']}", json={"title": "x"}, headers={"If-Match": "abc"})
+    assert response.status_code == 400
+
+
+async def test_write_without_if_match_is_unconditional(client):
+    project = await create_project(client)
+    path = f"/api/admin/projects/{project['_id']}"
+    await client.put(path, json={"title": "One"})
+    assert (await client.put(path, json={"title": "Two"})).status_code == 200
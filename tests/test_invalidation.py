@@ -0,0 +1,163 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from services import invalidation
+from services.invalidation import ChangeEvent, ChangeWatcher, InvalidationBus, SearchIndexSubscriber
+from services.search import index_post, index_project, search_index
+
+pytestmark = pytest.mark.anyio
+
+real_sleep = asyncio.sleep
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(invalidation.asyncio, "sleep", lambda seconds: real_sleep(0))
+
+
+async def test_bus_reaches_sync_and_async_handlers_past_a_failing_one():
+    bus, seen = InvalidationBus(), []
+
+    def failing(event):
+        raise RuntimeError("boom")
+
+    async def record(event):
+        seen.append(event.collection)
+
+    bus.subscribe(failing)
+    bus.subscribe(record)
+    bus.subscribe(record)
+    await bus.publish(ChangeEvent("projects", "update"))
+    assert seen == ["projects"]
+
+
+async def test_poll_publishes_changed_collections_only(database):
+    bus, events = InvalidationBus(), []
+    bus.subscribe(lambda event: events.append((event.collection, event.operation)))
+    watcher = ChangeWatcher(database, bus, mode="poll", poll_interval=0.01, collections=("projects", "skills"))
+    watcher.start()
+    await asyncio.sleep(0.05)
+    await database["projects"].insert_one({"title": "New", "updated_at": datetime.utcnow()})
+    await asyncio.sleep(0.05)
+    await watcher.stop()
+    assert watcher.active == "poll"
+    assert events == [("projects", "poll")]
+
+
+class FakeStream:
+    def __init__(self, changes, token):
+        self.changes = list(changes)
+        self.resume_token = token
+        self.alive = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def try_next(self):
+        if not self.changes:
+            self.alive = False
+            return None
+        return self.changes.pop(0)
+
+
+class FakeDatabase:
+    """Serves one scripted stream per watch() call, then reports no change streams."""
+
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.started_after = []
+
+    def watch(self, pipeline, full_document=None, start_after=None):
+        self.started_after.append(start_after)
+        if not self.streams:
+            raise NotImplementedError
+        stream = self.streams.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        return stream
+
+    def __getitem__(self, name):
+        raise NotImplementedError
+
+
+def change(collection, token):
+    return {"operationType": "delete", "ns": {"coll": collection}, "documentKey": {"_id": token}}
+
+
+async def run_until_polling(watcher):
+    async def no_poll():
+        watcher.active = "poll"
+
+    watcher._poll = no_poll
+    await watcher._run()
+
+
+async def test_resume_token_survives_a_restart(collections, no_backoff):
+    state = collections["watch_state"]
+    first = ChangeWatcher(FakeDatabase([FakeStream([change("projects", 1)], {"_data": "t1"})]), InvalidationBus(), state=state, replica_id="a")
+    await run_until_polling(first)
+    await first._save_token(force=True)
+
+    db = FakeDatabase([FakeStream([], {"_data": "t2"})])
+    second = ChangeWatcher(db, InvalidationBus(), state=state, replica_id="a")
+    await run_until_polling(second)
+    assert db.started_after[0] == {"_data": "t1"}
+    other = FakeDatabase([])
+    await run_until_polling(ChangeWatcher(other, InvalidationBus(), state=state, replica_id="b"))
+    assert other.started_after == [None]
+
+
+async def test_token_is_dropped_only_when_its_history_is_lost(collections, no_backoff):
+    state = collections["watch_state"]
+    await state.insert_one({"_id": "a", "resume_token": {"_data": "old"}})
+    db = FakeDatabase([
+        OperationFailure("interrupted", code=6),
+        OperationFailure("history lost", code=286),
+        FakeStream([], None),
+    ])
+    bus, events = InvalidationBus(), []
+    bus.subscribe(lambda event: events.append(event.operation))
+    watcher = ChangeWatcher(db, bus, collections=("projects",), state=state, replica_id="a")
+    await run_until_polling(watcher)
+    assert db.started_after[:3] == [{"_data": "old"}, {"_data": "old"}, None]
+    assert events == ["resync"]
+    assert (await state.find_one({"_id": "a"}))["resume_token"] is None
+
+
+async def test_invalidate_keeps_the_token_to_start_after_it(no_backoff):
+    invalidate = {"operationType": "invalidate", "ns": {"coll": "projects"}}
+    db = FakeDatabase([FakeStream([invalidate], {"_data": "inv"}), FakeStream([], {"_data": "next"})])
+    watcher = ChangeWatcher(db, InvalidationBus(), collections=("projects",))
+    await run_until_polling(watcher)
+    assert db.started_after[:2] == [None, {"_data": "inv"}]
+
+
+async def test_collection_wide_events_rebuild_only_that_kind_once(collections):
+    search_index.clear()
+    await collections["projects"].insert_one({"title": "Alpha", "description": "alpha project"})
+    index_post({"_id": "p1", "title": "Stale post", "status": "published"})
+    subscriber = SearchIndexSubscriber(collections, delay=0.01)
+    for _ in range(5):
+        await subscriber(ChangeEvent("projects", "poll"))
+    await subscriber._task
+    assert subscriber.rebuilds == 1
+    assert [hit["type"] for hit in search_index.search("stale")] == ["post"]
+    assert [hit["type"] for hit in search_index.search("alpha")] == ["project"]
+    search_index.clear()
+
+
+async def test_document_events_update_the_index_directly(collections):
+    search_index.clear()
+    subscriber = SearchIndexSubscriber(collections)
+    index_project({"_id": "x", "title": "Gamma"})
+    await subscriber(ChangeEvent("projects", "delete", "x"))
+    assert search_index.search("gamma") == []
+    await subscriber(ChangeEvent("projects", "update", "y", {"_id": "y", "title": "Delta"}))
+    assert len(search_index.search("delta")) == 1
+    search_index.clear()
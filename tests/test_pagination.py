@@ -0,0 +1,72 @@
+import base64
+
+import pytest
+from bson import ObjectId, json_util
+
+from tests.conftest import project_payload
+
+pytestmark = pytest.mark.anyio
+
+
+def raw_cursor(value, last_id) -> str:
+    return base64.urlsafe_b64encode(json_util.dumps([value, last_id]).encode()).decode()
+
+
+async def create_projects(client, count: int):
+    for index in range(count):
+        response = await client.post("/api/admin/projects", json=project_payload(f"Project {index}"))
+        assert response.status_code == 200
+
+
+async def test_cursor_pages_cover_every_document_once(client):
+    await create_projects(client, 5)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/projects", params=params)
+        assert response.status_code == 200
+        seen += [project["_id"] for project in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+
+async def test_pages_are_newest_first(client):
+    await create_projects(client, 3)
+    titles = [project["title"] for project in (await client.get("/api/projects")).json()]
+    assert titles == ["Project 2", "Project 1", "Project 0"]
+
+
+async def test_documents_without_sort_value_follow_a_cursor(collections, client):
+    await create_projects(client, 2)
+    await collections["projects"].insert_one({**project_payload("Undated"), "created_at": None})
+    first = await client.get("/api/projects", params={"limit": 2})
+    rest = await client.get("/api/projects", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [project["title"] for project in rest.json()] == ["Undated"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 at all!",
+    raw_cursor({"$exists": True}, ObjectId()),
+    raw_cursor([1, 2], ObjectId()),
+    raw_cursor("2024-01-01", {"$gt": ""}),
+    raw_cursor("2024-01-01", "not-an-object-id"),
+])
+async def test_malformed_cursor_is_rejected(client, cursor):
+    response = await client.get("/api/projects", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+async def test_fields_projection_returns_only_requested_fields(client):
+    await create_projects(client, 1)
+    response = await client.get("/api/projects", params={"fields": "title,start_date"})
+    assert response.status_code == 200
+    [project] = response.json()
+    assert set(project) == {"_id", "title", "start_date"}
+    assert project["start_date"] == "2024-01-01"
+
+
+async def test_unknown_field_is_rejected(client):
+    response = await client.get("/api/projects", params={"fields": "title,password"})
+    assert response.status_code == 400
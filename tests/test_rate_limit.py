@@ -0,0 +1,102 @@
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from services.rate_limit import RateLimit, RateLimitMiddleware, RouteLimit, client_ip
+
+pytestmark = pytest.mark.anyio
+
+ROUTE = ("POST", "/api/contact")
+
+
+class Message(BaseModel):
+    email: str
+    message: str
+
+
+def make_app(route_limit: RouteLimit, **middleware_options) -> FastAPI:
+    app = FastAPI()
+    app.state.queue_full = False
+
+    @app.post("/api/contact", status_code=202)
+    async def contact(message: Message):
+        if app.state.queue_full:
+            raise HTTPException(status_code=429, detail="Queue full")
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, limits={ROUTE: route_limit}, **middleware_options)
+    return app
+
+
+def make_client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+
+
+def scope(peer: str, forwarded: str = None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"client": (peer, 1234), "headers": headers}
+
+
+async def test_per_ip_limit_rejects_with_retry_after():
+    app = make_app(RouteLimit(per_ip=RateLimit.parse("2/60")))
+    async with make_client(app) as client:
+        statuses = [(await client.post("/api/contact", json={"email": f"{i}@x.io", "message": "hi"})).status_code for i in range(3)]
+        rejected = await client.post("/api/contact", json={"email": "z@x.io", "message": "hi"})
+    assert statuses == [202, 202, 429]
+    assert rejected.status_code == 429
+    assert int(rejected.headers["Retry-After"]) > 0
+
+
+async def test_untrusted_forwarded_for_does_not_bypass_the_ip_limit():
+    app = make_app(RouteLimit(per_ip=RateLimit.parse("1/60")))
+    async with make_client(app) as client:
+        first = await client.post("/api/contact", json={"email": "a@x.io", "message": "1"}, headers={"X-Forwarded-For": "10.0.0.1"})
+        second = await client.post("/api/contact", json={"email": "b@x.io", "message": "2"}, headers={"X-Forwarded-For": "10.0.0.2"})
+    assert (first.status_code, second.status_code) == (202, 429)
+
+
+async def test_exact_duplicate_is_409_only_after_acceptance():
+    app = make_app(RouteLimit(duplicate_window=600))
+    payload = {"email": "a@x.io", "message": "hello"}
+    async with make_client(app) as client:
+        assert (await client.post("/api/contact", json=payload)).status_code == 202
+        assert (await client.post("/api/contact", json=payload)).status_code == 409
+
+
+async def test_rejected_message_is_not_remembered_as_duplicate():
+    app = make_app(RouteLimit(per_email=RateLimit.parse("2/300"), duplicate_window=600))
+    payload = {"email": "a@x.io", "message": "hello"}
+    async with make_client(app) as client:
+        app.state.queue_full = True
+        assert (await client.post("/api/contact", json=payload)).status_code == 429
+        app.state.queue_full = False
+        # Neither the duplicate window nor the per-email token was used up.
+        assert (await client.post("/api/contact", json=payload)).status_code == 202
+        assert (await client.post("/api/contact", json=payload)).status_code == 409
+        # The duplicate gave its email token back.
+        assert (await client.post("/api/contact", json={**payload, "message": "new"})).status_code == 202
+
+
+async def test_invalid_message_does_not_use_the_email_budget():
+    app = make_app(RouteLimit(per_email=RateLimit.parse("1/300")))
+    async with make_client(app) as client:
+        assert (await client.post("/api/contact", json={"email": "a@x.io"})).status_code == 422
+        assert (await client.post("/api/contact", json={"email": "a@x.io", "message": "fixed"})).status_code == 202
+        assert (await client.post("/api/contact", json={"email": "a@x.io", "message": "again"})).status_code == 429
+
+
+def test_client_ip_ignores_forwarded_for_by_default():
+    assert client_ip(scope("203.0.113.9", "1.2.3.4"), 0, frozenset()) == "203.0.113.9"
+
+
+def test_client_ip_takes_the_address_added_by_trusted_hops():
+    # The client forged "1.2.3.4"; the one trusted proxy appended the real address.
+    assert client_ip(scope("10.0.0.5", "1.2.3.4, 198.51.100.7"), 1, frozenset()) == "198.51.100.7"
+
+
+def test_client_ip_walks_back_through_trusted_proxies():
+    proxies = frozenset({"10.0.0.5", "10.0.0.6"})
+    assert client_ip(scope("10.0.0.5", "1.2.3.4, 198.51.100.7, 10.0.0.6"), 0, proxies) == "198.51.100.7"
+    # A peer that is not a trusted proxy is the client, whatever the header says.
+    assert client_ip(scope("203.0.113.9", "1.2.3.4"), 0, proxies) == "203.0.113.9"
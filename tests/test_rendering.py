@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from services.rendering import needs_render, render_post
+
+pytestmark = pytest.mark.anyio
+
+
+def test_raw_html_is_escaped():
+    html = render_post("Hello <script>alert(1)</script> <img src=x onerror=alert(1)>")["content_html"]
+    assert "<script>" not in html and "<img" not in html
+    assert "&lt;script&gt;" in html
+
+
+def test_unsafe_link_schemes_are_not_linked():
+    html = render_post("[click](javascript:alert(1)) [ok](https://example.com)")["content_html"]
+    assert 'href="javascript:' not in html
+    assert 'href="https://example.com"' in html
+
+
+def test_headings_get_unique_anchors_and_a_toc():
+    artifact = render_post("# Intro\n\ntext\n\n## Intro\n\n## Set-up & `run`")
+    assert artifact["toc"] == [
+        {"level": 1, "text": "Intro", "id": "intro"},
+        {"level": 2, "text": "Intro", "id": "intro-1"},
+        {"level": 2, "text": "Set-up & run", "id": "set-up-run"},
+    ]
+    assert '<h2 id="intro-1">' in artifact["content_html"]
+
+
+def test_read_time_follows_word_count():
+    artifact = render_post("word " * 401)
+    assert artifact["word_count"] == 401
+    assert artifact["read_time"] == "3 min read"
+
+
+def test_needs_render_tracks_the_content():
+    post = {"content": "# Title", **render_post("# Title")}
+    assert not needs_render(post)
+    assert needs_render({**post, "content": "# Changed"})
+    assert needs_render({"content": "# Title"})
+
+
+async def test_legacy_post_is_rendered_without_writing(client, collections):
+    now = datetime(2024, 1, 1)
+    await collections["blog_posts"].insert_one({
+        "title": "Old", "slug": "old", "excerpt": "", "content": "# Old post\n\n<b>hi</b>", "image": "",
+        "read_time": "1 min read", "status": "published", "published_at": now,
+        "created_at": now, "updated_at": now, "version": 3,
+    })
+    response = await client.get("/api/blog/old")
+    assert response.status_code == 200
+    assert response.json()["content_html"] == '<h1 id="old-post">Old post</h1>\n<p>&lt;b&gt;hi&lt;/b&gt;</p>\n'
+    stored = await collections["blog_posts"].find_one({"slug": "old"})
+    assert (stored["version"], stored["updated_at"]) == (3, now)
+    assert "content_html" not in stored
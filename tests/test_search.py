@@ -0,0 +1,68 @@
+import pytest
+
+from services.search import SNIPPET_CHARS, SearchIndex, index_post, search_index
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.add("post", "1", {"title": "Python tips", "content": "Short notes on python."}, {"title": "Python tips"})
+    index.add("post", "2", {"title": "Rust", "content": "Python is mentioned once here among many other words."}, {"title": "Rust"})
+    index.add("project", "3", {"title": "Dashboard", "technologies": ["python", "react"], "description": "A dashboard."}, {"title": "Dashboard"})
+    return index
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_title_matches_rank_above_body_matches(index):
+    results = index.search("python")
+    assert ids(results)[0] == "1"
+    assert set(ids(results)) == {"1", "2", "3"}
+    assert results[0]["score"] > results[-1]["score"]
+
+
+def test_last_term_matches_as_a_prefix(index):
+    assert ids(index.search("dash")) == ["3"]
+    assert ids(index.search("dash rust")) == ["2"]  # only the last term is a prefix
+
+
+def test_kind_filter(index):
+    assert ids(index.search("python", kind="project")) == ["3"]
+
+
+def test_removed_and_replaced_documents(index):
+    index.remove("post", "1")
+    assert "1" not in ids(index.search("python"))
+    index.add("post", "2", {"title": "Go", "content": "Nothing relevant."}, {"title": "Go"})
+    assert "2" not in ids(index.search("python"))
+    assert len(index) == 2
+
+
+def test_snippet_is_escaped_and_marks_matches():
+    index = SearchIndex()
+    text = "x " * SNIPPET_CHARS + "<b>Python</b> & more"
+    index.add("post", "1", {"title": "T", "content": text}, {})
+    snippet = index.search("python")[0]["snippet"]
+    assert snippet.startswith("…")
+    assert "&lt;b&gt;<mark>Python</mark>&lt;/b&gt; &amp; more" in snippet
+
+
+def test_unpublished_posts_leave_the_index():
+    search_index.clear()
+    index_post({"_id": "p", "title": "Draftable", "status": "published"})
+    index_post({"_id": "p", "title": "Draftable", "status": "draft"})
+    assert search_index.search("draftable") == []
+
+
+async def test_search_endpoint(client):
+    search_index.clear()
+    index_post({"_id": "p", "title": "Async Python", "slug": "async-python", "status": "published", "content": "await"})
+    body = (await client.get("/api/search", params={"q": "async", "type": "post"})).json()
+    assert body["query"] == "async"
+    assert [(hit["type"], hit["slug"]) for hit in body["results"]] == [("post", "async-python")]
+    assert (await client.get("/api/search", params={"q": "x", "type": "skill"})).status_code == 422
+    search_index.clear()
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from services import skills as skills_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_skill(client, name: str, category: str, level: int = 50) -> dict:
+    response = await client.post("/api/admin/skills", json={"name": name, "category": category, "level": level})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def grouped(client) -> dict:
+    response = await client.get("/api/skills")
+    assert response.status_code == 200
+    return response.json()
+
+
+def names(group):
+    return [skill["name"] for skill in group]
+
+
+async def test_skills_are_grouped_strongest_first(client):
+    await create_skill(client, "Go", "Languages", 60)
+    await create_skill(client, "Python", "Languages", 90)
+    await create_skill(client, "Teamwork", "Soft Skills", 80)
+    body = await grouped(client)
+    assert names(body["technical"]["Languages"]) == ["Python", "Go"]
+    assert body["soft"] == ["Teamwork"]
+
+
+async def test_moving_a_skill_leaves_its_old_category(client):
+    await create_skill(client, "Python", "Languages")
+    docker = await create_skill(client, "Docker", "Languages")
+    response = await client.put(f"/api/admin/skills/{docker['_id']}", json={"category": "Tools", "level": 70})
+    assert response.status_code == 200
+    body = await grouped(client)
+    assert names(body["technical"]["Languages"]) == ["Python"]
+    assert body["technical"]["Tools"] == [{"name": "Docker", "level": 70, "years_experience": None}]
+
+
+async def test_emptied_category_is_removed(client):
+    skill = await create_skill(client, "Docker", "Tools")
+    assert (await client.delete(f"/api/admin/skills/{skill['_id']}")).status_code == 200
+    assert (await grouped(client))["technical"] == {}
+
+
+async def test_concurrent_updates_leave_one_entry_with_the_stored_values(client, collections):
+    skill = await create_skill(client, "Docker", "Languages")
+    path = f"/api/admin/skills/{skill['_id']}"
+    categories = ["Tools", "Ops", "Cloud", "Languages"]
+    responses = await asyncio.gather(*(
+        client.put(path, json={"category": category, "level": 10 * (index + 1)})
+        for index, category in enumerate(categories)
+    ))
+    assert all(response.status_code == 200 for response in responses)
+    stored = await collections["skills"].find_one({})
+    entries = [
+        (category["_id"], entry)
+        async for category in collections["skill_categories"].find()
+        for entry in category["skills"]
+    ]
+    assert len(entries) == 1
+    category, entry = entries[0]
+    assert (category, entry["level"]) == (stored["category"], stored["level"])
+
+
+async def test_regroup_that_read_stale_skills_is_retried(collections, monkeypatch):
+    skills, categories = collections["skills"], collections["skill_categories"]
+    result = await skills.insert_one({"name": "Docker", "category": "Tools", "level": 50})
+    await skills_service.rebuild_skill_categories(skills, categories)
+    aggregate = skills.aggregate
+
+    class RacingCursor:
+        """Reads the skills, then lets another writer raise the level and regroup."""
+
+        def __init__(self, pipeline):
+            self.cursor = aggregate(pipeline)
+
+        async def to_list(self, length):
+            groups = await self.cursor.to_list(length)
+            monkeypatch.setattr(skills, "aggregate", aggregate)
+            await skills.update_one({"_id": result.inserted_id}, {"$set": {"level": 90}})
+            await categories.update_one({"_id": "Tools"}, {"$inc": {"version": 1}})
+            return groups
+
+    monkeypatch.setattr(skills, "aggregate", RacingCursor)
+    await skills_service.apply_skill_changes(skills, categories, [await skills.find_one({})], [])
+    assert (await categories.find_one({"_id": "Tools"}))["skills"][0]["level"] == 90
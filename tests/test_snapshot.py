@@ -0,0 +1,85 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from services.snapshot import MANIFEST_NAME, SnapshotConflict, SnapshotExporter
+
+pytestmark = pytest.mark.anyio
+
+
+def post(slug: str, **overrides) -> dict:
+    now = datetime(2024, 1, 1)
+    doc = {
+        "title": slug.title(), "slug": slug, "excerpt": "", "content": "# Hi", "image": "",
+        "read_time": "1 min read", "status": "published", "published_at": now,
+        "created_at": now, "updated_at": now, "version": 1,
+    }
+    doc.update(overrides)
+    return doc
+
+
+def project(title: str) -> dict:
+    now = datetime(2024, 1, 1)
+    return {
+        "title": title, "description": "", "short_description": "", "image": "", "live_url": "",
+        "github_url": "", "category": "Web", "start_date": now, "end_date": now,
+        "created_at": now, "updated_at": now, "version": 1,
+    }
+
+
+def manifest(out) -> dict:
+    return json.loads((out / MANIFEST_NAME).read_text())["resources"]
+
+
+async def test_second_run_rewrites_only_changed_resources(collections, tmp_path):
+    first = await collections["projects"].insert_one(project("One"))
+    await collections["projects"].insert_one(project("Two"))
+    await collections["blog_posts"].insert_one(post("hello"))
+    exporter = SnapshotExporter(collections, tmp_path)
+    await exporter.run()
+    entry = manifest(tmp_path)["/api/blog/hello"]
+    assert (tmp_path / entry["file"]).read_bytes().startswith(b"{")
+    assert (tmp_path / entry["encodings"]["gzip"]["file"]).exists()
+
+    changed_path = f"/api/projects/{first.inserted_id}"
+    await collections["projects"].update_one(
+        {"_id": first.inserted_id}, {"$set": {"title": "Renamed", "updated_at": datetime(2024, 2, 1)}, "$inc": {"version": 1}}
+    )
+    again = SnapshotExporter(collections, tmp_path)
+    await again.run()
+    assert changed_path in again.written
+    assert "/api/blog/hello" in again.unchanged
+    assert all(not path.startswith("/api/projects/") or path == changed_path for path in again.written)
+
+
+async def test_files_of_removed_items_are_deleted(collections, tmp_path):
+    result = await collections["projects"].insert_one(project("Gone"))
+    await SnapshotExporter(collections, tmp_path).run()
+    path = f"/api/projects/{result.inserted_id}"
+    file = tmp_path / manifest(tmp_path)[path]["file"]
+    assert file.exists()
+
+    await collections["projects"].delete_one({"_id": result.inserted_id})
+    exporter = SnapshotExporter(collections, tmp_path)
+    await exporter.run()
+    assert path in exporter.removed
+    assert not file.exists()
+    assert path not in manifest(tmp_path)
+
+
+async def test_slug_colliding_with_a_list_route_fails_the_export(collections, tmp_path):
+    await collections["blog_posts"].insert_one(post("featured", featured=True))
+    with pytest.raises(SnapshotConflict, match="/api/blog/featured"):
+        await SnapshotExporter(collections, tmp_path).run()
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_admin_rejects_reserved_slugs(client):
+    payload = {"title": "Featured", "excerpt": "", "content": "x", "image": "", "slug": "featured"}
+    response = await client.post("/api/admin/posts", json=payload)
+    assert response.status_code == 422
+    payload["slug"] = "fine"
+    created = (await client.post("/api/admin/posts", json=payload)).json()
+    response = await client.put(f"/api/admin/posts/{created['_id']}", json={"title": "Featured"})
+    assert response.status_code == 422
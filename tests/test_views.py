@@ -0,0 +1,104 @@
+import pytest
+
+from services.views import HyperLogLog, ViewCounter, page_route
+
+pytestmark = pytest.mark.anyio
+
+
+def test_hyperloglog_estimate_is_within_a_few_percent():
+    sketch = HyperLogLog()
+    for index in range(20000):
+        sketch.add(f"visitor-{index}")
+    assert abs(sketch.estimate() - 20000) / 20000 < 0.1
+
+
+def test_hyperloglog_merge_is_idempotent():
+    a, b = HyperLogLog(), HyperLogLog()
+    for index in range(300):
+        a.add(f"v{index}")
+        b.add(f"v{index + 150}")
+    a.merge(b)
+    merged = a.estimate()
+    a.merge(b)
+    assert a.estimate() == merged
+    assert abs(merged - 450) < 30
+
+
+def test_small_counts_are_exact_enough():
+    sketch = HyperLogLog()
+    for visitor in ["a", "b", "a", "c"]:
+        sketch.add(visitor)
+    assert sketch.estimate() == 3
+
+
+@pytest.mark.parametrize("path, route", [
+    ("/", "/"),
+    ("/about/", "/about"),
+    ("/projects/abc", "/projects/:id"),
+    ("/blog/my-post", "/blog/:slug"),
+    ("/blog/a/b", None),
+    ("/wp-admin", None),
+])
+def test_page_route(path, route):
+    assert page_route(path) == route
+
+
+async def test_flush_writes_counts_and_uniques(collections):
+    counter = ViewCounter(flush_interval=60)
+    await counter.start(collections["view_counts"])
+    for visitor in ["a", "b", "a"]:
+        counter.record("project", "p1", visitor)
+    await counter.stop()
+    doc = await collections["view_counts"].find_one({"_id": "project:p1"})
+    assert (doc["views"], doc["uniques"]) == (3, 2)
+    assert counter.most_viewed("project") == [{"key": "p1", "views": 3, "uniques": 2}]
+
+
+async def test_each_kind_has_its_own_budget(collections):
+    counter = ViewCounter(flush_interval=60, max_keys={"project": 1})
+    for key in ("p1", "p2"):
+        counter.record("project", key, "v")
+    counter.record("post", "s1", "v")
+    counter.record("unknown", "x", "v")
+    assert counter.stats()["keys"] == {"project": 1, "post": 1, "page": 0}
+    assert counter.dropped == 2
+
+
+async def test_replicas_flushing_the_same_key_both_count(collections):
+    a, b = ViewCounter(flush_interval=60), ViewCounter(flush_interval=60)
+    await a.start(collections["view_counts"])
+    await b.start(collections["view_counts"])
+    a.record("post", "s", "alice")
+    b.record("post", "s", "bob")
+    find = collections["view_counts"].find
+
+    def racing_find(*args, **kwargs):
+        # b reads the stored sketch, then a flushes before b writes.
+        cursor = find(*args, **kwargs)
+        collections["view_counts"].find = find
+        return RacingCursor(cursor)
+
+    class RacingCursor:
+        def __init__(self, cursor):
+            self.cursor = cursor
+
+        def __aiter__(self):
+            return self._iterate()
+
+        async def _iterate(self):
+            docs = [doc async for doc in self.cursor]
+            await a._flush()
+            for doc in docs:
+                yield doc
+
+    collections["view_counts"].find = racing_find
+    assert await b._flush()
+    await a.stop()
+    await b.stop()
+    doc = await collections["view_counts"].find_one({"_id": "post:s"})
+    assert (doc["views"], doc["uniques"], doc["sketch_version"]) == (2, 2, 2)
+
+
+async def test_unknown_page_is_422(client):
+    assert (await client.post("/api/views", json={"page": "/wp-login.php"})).status_code == 422
+    assert (await client.post("/api/views", json={"page": "/projects/123"})).status_code == 204